@@ -1,9 +1,13 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 import os
 import glob
 from werkzeug.utils import secure_filename
+import io
+import gzip
 import json
+import uuid
+import hashlib
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -14,11 +18,24 @@ from extractors.mvr_extractor import extract_mvr_data
 from extractors.dash_extractor import extract_dash_data
 from extractors.quote_extractor import extract_quote_data
 from validator.compare_engine import validate_quote, ValidationEngine
+from validator.batch_engine import validate_portfolio, parse_as_of
 from quote_comparison_service import compare_quote_with_pdf
+from revalidation_service import revalidate_submission
+from result_store import ResultStore
+from driver_registry import DriverRecordRegistry, mark_reused_records
+from submission_tracker import SubmissionTracker, submission_fingerprint
+from progress_events import ProgressHub
+from result_views import (load_entry, result_summary, driver_detail, driver_matches, documents_page,
+                          DOCUMENT_KINDS, DOCUMENT_PAGE_LIMIT)
+from blob_store import BlobStore
+from extraction_service import ExtractionService
+from extractors import pattern_packs
 from extractors.gemini_application_extractor import extract_and_validate_application_qc
 
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
+# Result responses at least this large are gzipped for clients that accept it
+GZIP_MIN_BYTES = 1024
 
 app = Flask(__name__)
 CORS(app)
@@ -26,6 +43,25 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Past extractions, validation reports and QC results, kept so they can be searched, served
+# and revalidated by result ID
+result_store = ResultStore()
+
+# Still-valid MVR and DASH records of earlier submissions, reused by licence number
+driver_registry = DriverRecordRegistry(result_store)
+
+# Identical submissions (double clicks, client retries) are extracted and validated once
+submissions = SubmissionTracker(result_store)
+
+# Per-stage progress of running submissions, streamed to the browser (see /api/progress)
+progress = ProgressHub()
+
+# Worker pool extracting a submission's documents in parallel
+extraction_service = ExtractionService()
+
+# Uploaded documents and generated files, stored once per content
+blob_store = BlobStore()
+
 def cleanup_upload_folder():
     """Clean up all PDF files and debug files in the uploads folder and backend directory after processing"""
     try:
@@ -79,6 +115,13 @@ cleanup_upload_folder()
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def parse_validation_categories(form):
+    """Read the optional comma-separated 'categories' form field (e.g. 'report_age'); None runs every rule"""
+    raw = form.get('categories', '').strip()
+    if not raw:
+        return None
+    return [category.strip() for category in raw.split(',') if category.strip()]
+
 def detect_file_type(file):
     """Automatically detect file type based on filename and content analysis"""
     filename = file.filename.lower()
@@ -95,41 +138,134 @@ def detect_file_type(file):
     # For now, we'll return 'auto' and let the backend handle it
     return 'auto'
 
-def analyze_file_content(file_path):
-    """Analyze file content to determine its type"""
+def store_upload(file, job_id):
+    """Put an uploaded file in the blob store for job_id; returns it as a PdfUpload"""
+    filename = secure_filename(file.filename)
+    digest = blob_store.put_stream(file.stream, job_id)
+    return blob_store.upload(digest, filename)
+
+def read_uploaded_documents(files, job_id, report=None):
+    """
+    Put every uploaded PDF in the blob store for job_id (in memory unless large) and label it
+    with its form field: MVR and DASH fields first, then quotes, then any other field (type
+    detected from content). report(stage, **data), if given, is told of each upload.
+    Returns a list of (doc_type, PdfUpload)
+    """
+    documents = []
+    field_order = [['mvr', 'dash'], ['quote'], None]
+    for fields in field_order:
+        for field_name in files.keys():
+            if fields is None:
+                if field_name in ['quote', 'mvr', 'dash']:
+                    continue
+            elif field_name not in fields:
+                continue
+
+            for file in files.getlist(field_name):
+                if file and file.filename and allowed_file(file.filename):
+                    doc_type = field_name if fields else 'auto'
+                    print(f"Processing {doc_type} file: {secure_filename(file.filename)}")
+                    upload = store_upload(file, job_id)
+                    documents.append((doc_type, upload))
+                    if report:
+                        report("uploaded", document=upload.name, field=field_name, size=upload.size)
+                        if doc_type != 'auto':
+                            report("classified", document=upload.name, doc_type=doc_type, detected=False)
+    return documents
+
+def extraction_progress(report):
+    """An extraction service on_document callback reporting each document's type and driver count"""
+    def on_document(source, document):
+        requested_type, upload = source
+        doc_type, data = document
+        if requested_type == 'auto' and doc_type:
+            report("classified", document=str(upload), doc_type=doc_type, detected=True)
+        if data is None:
+            report("extracted", document=str(upload), doc_type=doc_type, ok=False, drivers=0)
+            return
+        drivers = len(data.get("drivers", [])) if doc_type == "quote" else 1
+        report("extracted", document=str(upload), doc_type=doc_type, ok=True, drivers=drivers,
+               timed_out=bool(data.get("timed_out")))
+    return on_document
+
+def driver_progress(report):
+    """A validation on_driver callback sending each driver's report as soon as it is validated"""
+    return lambda driver_report: report(
+        "validated",
+        driver=driver_report.get("driver_name"),
+        status=driver_report.get("validation_status"),
+        driver_report=driver_report
+    )
+
+def extract_for_validation(documents, plan, no_dash_report, reuse_records, report):
+    """
+    Extract a submission's documents (in parallel; MVR convictions are merged into the quotes
+    afterwards), fill in stored driver records and check the documents the plan requires are there.
+    Returns (results, None), or (None, (error body, status))
+    """
+    results = extraction_service.extract_submission(documents, on_document=extraction_progress(report))
+    
+    # Validate that we have all required documents
+    if not results["quotes"]:
+        return None, ({"error": "No valid quote document found"}, 400)
+    if reuse_records:
+        driver_registry.fill_missing_records(results, no_dash_report=no_dash_report)
+    if plan.requires_mvr and not results["mvrs"]:
+        return None, ({"error": "No valid MVR document found"}, 400)
+    
+    # Only require DASH if noDashReport is not set and a requested rule needs it
+    if plan.requires_dash and not results["dashes"]:
+        return None, ({"error": "No valid DASH document found"}, 400)
+    return results, None
+
+def run_submission(endpoint, options, work, replay, report, present=None):
+    """
+    Store the uploaded files and run work(documents, job_id, fingerprint) once per distinct
+    submission (see SubmissionTracker); replay(result_id, entry) rebuilds a stored result's response.
+    report(stage, **data) gets the progress, ending with "done" or "error".
+    present(body), if given, turns a successful response into the one returned (e.g. its summary)
+    """
+    job_id = uuid.uuid4().hex
     try:
-        # Try to extract data from each extractor and see which one works
-        # This is a simple heuristic approach
-        
-        # Try MVR extraction
-        try:
-            mvr_data = extract_mvr_data(file_path)
-            if mvr_data and mvr_data.get('licence_number'):
-                return 'mvr'
-        except:
-            pass
-        
-        # Try DASH extraction
-        try:
-            dash_data = extract_dash_data(file_path)
-            if dash_data and (dash_data.get('claims') or dash_data.get('policies')):
-                return 'dash'
-        except:
-            pass
-        
-        # Try Quote extraction
-        try:
-            quote_data = extract_quote_data(file_path)
-            if quote_data and (quote_data.get('drivers') or quote_data.get('vehicles')):
-                return 'quote'
-        except:
-            pass
-        
-        # If none work, return None
-        return None
+        documents = read_uploaded_documents(request.files, job_id, report)
+        fingerprint = submission_fingerprint(endpoint, documents, **options)
+        body, status = submissions.run(fingerprint, lambda: work(documents, job_id, fingerprint), replay)
     except Exception as e:
-        print(f"Error analyzing file content: {e}")
-        return None
+        report("error", error=str(e))
+        raise
+    finally:
+        blob_store.release_job(job_id)
+    
+    if status == 200:
+        report("done", result_id=body.get("result_id"), duplicate_submission=bool(body.get("duplicate_submission")))
+        if present:
+            body = present(body)
+    else:
+        report("error", error=body.get("error"), status=status)
+    return jsonify(body), status
+
+def cacheable_json(payload):
+    """
+    JSON response for result data that doesn't change: with an ETag (a client sending it back in
+    If-None-Match gets 304 Not Modified) and gzipped when the client accepts it
+    """
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    gzipped = len(body) >= GZIP_MIN_BYTES and 'gzip' in request.headers.get('Accept-Encoding', '')
+    if gzipped:
+        # Each encoding of the same data is its own representation
+        etag += '-gz'
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(gzip.compress(body, compresslevel=6) if gzipped else body, mimetype='application/json')
+        if gzipped:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
 
 @app.route('/api/validate', methods=['POST'])
 def validate_documents():
@@ -140,134 +276,167 @@ def validate_documents():
     # Check if noDashReport flag is set
     no_dash_report = request.form.get('noDashReport', 'false').lower() == 'true'
     
-    files = request.files
-    results = {
-        "mvrs": [],
-        "dashes": [],
-        "quotes": []
-    }
+    # Optional subset of validation rules to run
+    categories = parse_validation_categories(request.form)
+    
+    # Fleet mode matches drivers to MVR/DASH records one-to-one (large commercial quotes)
+    fleet = request.form.get('fleetMode', 'false').lower() == 'true'
+    
+    # Drivers without an uploaded MVR/DASH get a still-valid one from an earlier submission
+    reuse_records = request.form.get('reuseRecords', 'true').lower() == 'true'
+    
+    # Progress events go to the stream the client opened for this ID (see /api/progress)
+    report = progress.reporter(request.form.get('progressId'))
+    
+    # view=summary answers with the result summary only; details are fetched by result ID (see /api/results)
+    summary_only = request.form.get('view', 'full') == 'summary'
+    try:
+        plan = ValidationEngine().compile_plan(categories, no_dash_report)
+    except ValueError as e:
+        report("error", error=str(e), status=400)
+        return jsonify({"error": str(e)}), 400
     
     print(f"Processing files for validation... (noDashReport: {no_dash_report})")
     
-    # First pass: Extract MVR and DASH data (these don't depend on other data)
-    print("=== FIRST PASS: Processing MVR and DASH files ===")
-    for field_name in request.files.keys():
-        if field_name in ['mvr', 'dash']:
-            files_for_field = request.files.getlist(field_name)
-            
-            for file in files_for_field:
-                if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    file.save(path)
-                    
-                    print(f"Processing {field_name} file: {filename}")
-                    
-                    try:
-                        if field_name == 'mvr':
-                            mvr_data = extract_mvr_data(path)
-                            print(f"MVR extracted: {mvr_data.get('licence_number', 'No license')} - {mvr_data.get('name', 'No name')}")
-                            results["mvrs"].append(mvr_data)
-                        elif field_name == 'dash':
-                            dash_data = extract_dash_data(path)
-                            print(f"DASH extracted: {len(dash_data.get('claims', []))} claims")
-                            results["dashes"].append(dash_data)
-                    except Exception as e:
-                        print(f"Error processing {filename}: {e}")
-                        import traceback
-                        traceback.print_exc()
-    
-    print(f"=== FIRST PASS COMPLETE: {len(results['mvrs'])} MVRs and {len(results['dashes'])} DASH reports extracted ===")
-    
-    # Second pass: Extract quote data with complete MVR data available
-    print("=== SECOND PASS: Processing Quote files with MVR data available ===")
-    for field_name in request.files.keys():
-        if field_name == 'quote':
-            files_for_field = request.files.getlist(field_name)
-            
-            for file in files_for_field:
-                if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    file.save(path)
-                    
-                    print(f"Processing quote file: {filename} with {len(results['mvrs'])} MVRs available")
-                    
-                    try:
-                        quote_data = extract_quote_data(path, results["mvrs"])
-                        print(f"Quote extracted: {len(quote_data.get('drivers', []))} drivers")
-                        results["quotes"].append(quote_data)
-                    except Exception as e:
-                        print(f"Error processing {filename}: {e}")
-                        import traceback
-                        traceback.print_exc()
-    
-    # Handle auto-detection for any remaining files
-    for field_name in request.files.keys():
-        if field_name not in ['quote', 'mvr', 'dash']:
-            files_for_field = request.files.getlist(field_name)
+    def validate_submission(documents, job_id, fingerprint):
+        results, error = extract_for_validation(documents, plan, no_dash_report, reuse_records, report)
+        if error:
+            return error
+        
+        try:
+            # Pass the noDashReport flag to the validation engine
+            validation_report = validate_quote(results, no_dash_report=no_dash_report, categories=categories, fleet=fleet,
+                                               on_driver=driver_progress(report))
+            mark_reused_records(validation_report, results.get("reused_records"))
+            print("Validation completed successfully")
             
-            for file in files_for_field:
-                if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    file.save(path)
-                    
-                    print(f"Auto-detecting file type for: {filename}")
-                    
-                    try:
-                        detected_type = analyze_file_content(path)
-                        if detected_type == 'quote':
-                            quote_data = extract_quote_data(path, results["mvrs"])
-                            results["quotes"].append(quote_data)
-                        elif detected_type == 'mvr':
-                            mvr_data = extract_mvr_data(path)
-                            print(f"MVR extracted (auto-detected): {mvr_data.get('licence_number', 'No license')} - {mvr_data.get('name', 'No name')}")
-                            results["mvrs"].append(mvr_data)
-                        elif detected_type == 'dash':
-                            dash_data = extract_dash_data(path)
-                            results["dashes"].append(dash_data)
-                        else:
-                            print(f"Could not determine type for {filename}")
-                    except Exception as e:
-                        print(f"Error processing {filename}: {e}")
-                        import traceback
-                        traceback.print_exc()
-    
-    print(f"Extraction complete. MVRs: {len(results['mvrs'])}, DASHes: {len(results['dashes'])}, Quotes: {len(results['quotes'])}")
+        except Exception as e:
+            print(f"Validation error: {e}")
+            import traceback
+            traceback.print_exc()
+            # Clean up files even if validation fails
+            cleanup_upload_folder()
+            return {"error": str(e)}, 500
+        
+        # Clean up uploaded PDF files after successful processing
+        cleanup_upload_folder()
+        
+        # Keep the result so a corrected document can be revalidated without re-uploading everything
+        entry = {
+            "extracted": results,
+            "validation_report": validation_report,
+            "no_dash_report": no_dash_report,
+            "categories": categories,
+            "fleet": fleet
+        }
+        return validation_response(result_store.save(entry, job_id=job_id, fingerprint=fingerprint), entry)
+    
+    options = {"no_dash_report": no_dash_report, "categories": categories, "fleet": fleet, "reuse_records": reuse_records}
+    present = None
+    if summary_only:
+        present = lambda body: {**result_summary(body["result_id"], body),
+                                "duplicate_submission": body.get("duplicate_submission", False)}
+    return run_submission('validate', options, validate_submission, validation_response, report, present)
+
+def validation_response(result_id, entry):
+    return {
+        "result_id": result_id,
+        "extracted": entry["extracted"],
+        "validation_report": entry["validation_report"],
+        "no_dash_report": entry["no_dash_report"],
+        "categories": entry["categories"]
+    }, 200
+
+@app.route('/api/revalidate/<result_id>', methods=['POST'])
+def revalidate_documents(result_id):
+    """Revalidate a previous result after re-uploading one MVR, DASH or Quote document"""
+    previous = result_store.get(result_id)
+    if previous is None:
+        return jsonify({"error": "Result not found or expired"}), 404
+    
+    doc_types = [field_name for field_name in ('mvr', 'dash', 'quote') if field_name in request.files]
+    if len(doc_types) != 1 or len(request.files.getlist(doc_types[0])) != 1:
+        return jsonify({"error": "Upload exactly one 'mvr', 'dash' or 'quote' file"}), 400
+    
+    doc_type = doc_types[0]
+    file = request.files[doc_type]
+    if not file or not file.filename or not allowed_file(file.filename):
+        return jsonify({"error": "Invalid file"}), 400
+    
+    replace_index = request.form.get('replaceIndex')
+    if replace_index is not None:
+        try:
+            replace_index = int(replace_index)
+        except ValueError:
+            return jsonify({"error": "replaceIndex must be an integer"}), 400
     
-    # Validate that we have all required documents
-    if not results["quotes"]:
-        return jsonify({"error": "No valid quote document found"}), 400
-    if not results["mvrs"]:
-        return jsonify({"error": "No valid MVR document found"}), 400
+    filename = secure_filename(file.filename)
+    job_id = uuid.uuid4().hex
+    upload = store_upload(file, job_id)
     
-    # Only require DASH if noDashReport is not set
-    if not no_dash_report and not results["dashes"]:
-        return jsonify({"error": "No valid DASH document found"}), 400
+    print(f"Revalidating result {result_id} with new {doc_type} file: {filename}")
     
     try:
-        # Pass the noDashReport flag to the validation engine
-        validation_report = validate_quote(results, no_dash_report=no_dash_report)
-        print("Validation completed successfully")
-        
+        revalidation = revalidate_submission(previous, doc_type, upload, replace_index)
+    except ValueError as e:
+        cleanup_upload_folder()
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        print(f"Validation error: {e}")
+        print(f"Revalidation error: {e}")
         import traceback
         traceback.print_exc()
-        # Clean up files even if validation fails
         cleanup_upload_folder()
         return jsonify({"error": str(e)}), 500
+    finally:
+        blob_store.release_job(job_id)
     
-    # Clean up uploaded PDF files after successful processing
     cleanup_upload_folder()
     
+    new_result_id = result_store.save({
+        "extracted": revalidation["extracted"],
+        "validation_report": revalidation["validation_report"],
+        "no_dash_report": revalidation["no_dash_report"],
+        "categories": revalidation["categories"],
+        "fleet": previous.get("fleet", False)
+    }, job_id=job_id)
+    
     return jsonify({
-        "extracted": results,
-        "validation_report": validation_report,
-        "no_dash_report": no_dash_report
+        "result_id": new_result_id,
+        "previous_result_id": result_id,
+        **revalidation
     })
 
+@app.route('/api/portfolio-validate', methods=['POST'])
+def portfolio_validate():
+    """Batch re-check of report age, the 9-year claim window and G1/G2/G timing across many submissions"""
+    payload = request.get_json(silent=True) or {}
+    portfolio = list(payload.get("submissions", []))
+    
+    try:
+        as_of = parse_as_of(payload.get("as_of"))
+    except ValueError:
+        return jsonify({"error": f"Invalid as_of date: {payload.get('as_of')} (expected YYYY-MM-DD)"}), 400
+    
+    # Stored results can be referenced by ID instead of re-sending their extracted data
+    for result_id in payload.get("result_ids", []):
+        stored = result_store.get(result_id)
+        if stored is None:
+            return jsonify({"error": f"Result not found or expired: {result_id}"}), 404
+        portfolio.append(stored["extracted"])
+    
+    if not portfolio:
+        return jsonify({"error": "No submissions provided"}), 400
+    
+    try:
+        portfolio_report = validate_portfolio(portfolio, as_of=as_of)
+    except Exception as e:
+        print(f"Portfolio validation error: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+    
+    return jsonify(portfolio_report)
+
 @app.route('/api/validate-compact', methods=['POST'])
 def validate_documents_compact():
     """Compact validation endpoint that returns a one-page professional report with charts"""
@@ -277,132 +446,210 @@ def validate_documents_compact():
     # Check if noDashReport flag is set
     no_dash_report = request.form.get('noDashReport', 'false').lower() == 'true'
     
-    files = request.files
-    results = {
-        "mvrs": [],
-        "dashes": [],
-        "quotes": []
-    }
+    # Optional subset of validation rules to run
+    categories = parse_validation_categories(request.form)
+    
+    # Fleet mode matches drivers to MVR/DASH records one-to-one (large commercial quotes)
+    fleet = request.form.get('fleetMode', 'false').lower() == 'true'
+    
+    # Drivers without an uploaded MVR/DASH get a still-valid one from an earlier submission
+    reuse_records = request.form.get('reuseRecords', 'true').lower() == 'true'
+    
+    # Progress events go to the stream the client opened for this ID (see /api/progress)
+    report = progress.reporter(request.form.get('progressId'))
+    try:
+        plan = ValidationEngine().compile_plan(categories, no_dash_report)
+    except ValueError as e:
+        report("error", error=str(e), status=400)
+        return jsonify({"error": str(e)}), 400
     
     print(f"Processing files for compact validation... (noDashReport: {no_dash_report})")
     
-    # First pass: Extract MVR and DASH data (these don't depend on other data)
-    print("=== FIRST PASS: Processing MVR and DASH files ===")
-    for field_name in request.files.keys():
-        if field_name in ['mvr', 'dash']:
-            files_for_field = request.files.getlist(field_name)
-            
-            for file in files_for_field:
-                if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    file.save(path)
-                    
-                    print(f"Processing {field_name} file: {filename}")
-                    
-                    try:
-                        if field_name == 'mvr':
-                            mvr_data = extract_mvr_data(path)
-                            print(f"MVR extracted: {mvr_data.get('licence_number', 'No license')} - {mvr_data.get('name', 'No name')}")
-                            results["mvrs"].append(mvr_data)
-                        elif field_name == 'dash':
-                            dash_data = extract_dash_data(path)
-                            print(f"DASH extracted: {len(dash_data.get('claims', []))} claims")
-                            results["dashes"].append(dash_data)
-                    except Exception as e:
-                        print(f"Error processing {filename}: {e}")
-                        import traceback
-                        traceback.print_exc()
-    
-    print(f"=== FIRST PASS COMPLETE: {len(results['mvrs'])} MVRs and {len(results['dashes'])} DASH reports extracted ===")
-    
-    # Second pass: Extract quote data with complete MVR data available
-    print("=== SECOND PASS: Processing Quote files with MVR data available ===")
-    for field_name in request.files.keys():
-        if field_name == 'quote':
-            files_for_field = request.files.getlist(field_name)
-            
-            for file in files_for_field:
-                if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    file.save(path)
-                    
-                    print(f"Processing quote file: {filename} with {len(results['mvrs'])} MVRs available")
-                    
-                    try:
-                        quote_data = extract_quote_data(path, results["mvrs"])
-                        print(f"Quote extracted: {len(quote_data.get('drivers', []))} drivers")
-                        results["quotes"].append(quote_data)
-                    except Exception as e:
-                        print(f"Error processing {filename}: {e}")
-                        import traceback
-                        traceback.print_exc()
-    
-    # Handle auto-detection for any remaining files
-    for field_name in request.files.keys():
-        if field_name not in ['quote', 'mvr', 'dash']:
-            files_for_field = request.files.getlist(field_name)
+    def validate_submission_compact(documents, job_id, fingerprint):
+        results, error = extract_for_validation(documents, plan, no_dash_report, reuse_records, report)
+        if error:
+            return error
+        
+        try:
+            # Generate compact report with noDashReport flag
+            engine = ValidationEngine()
+            compact_report = engine.generate_compact_report(results, no_dash_report=no_dash_report, categories=categories,
+                                                            fleet=fleet, on_driver=driver_progress(report))
+            mark_reused_records(compact_report, results.get("reused_records"))
+            print("Compact validation report generated successfully")
             
-            for file in files_for_field:
-                if file and file.filename and allowed_file(file.filename):
-                    filename = secure_filename(file.filename)
-                    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                    file.save(path)
-                    
-                    print(f"Auto-detecting file type for: {filename}")
-                    
-                    try:
-                        detected_type = analyze_file_content(path)
-                        if detected_type == 'quote':
-                            quote_data = extract_quote_data(path, results["mvrs"])
-                            results["quotes"].append(quote_data)
-                        elif detected_type == 'mvr':
-                            mvr_data = extract_mvr_data(path)
-                            print(f"MVR extracted (auto-detected): {mvr_data.get('licence_number', 'No license')} - {mvr_data.get('name', 'No name')}")
-                            results["mvrs"].append(mvr_data)
-                        elif detected_type == 'dash':
-                            dash_data = extract_dash_data(path)
-                            results["dashes"].append(dash_data)
-                        else:
-                            print(f"Could not determine type for {filename}")
-                    except Exception as e:
-                        print(f"Error processing {filename}: {e}")
-                        import traceback
-                        traceback.print_exc()
-    
-    print(f"Extraction complete. MVRs: {len(results['mvrs'])}, DASHes: {len(results['dashes'])}, Quotes: {len(results['quotes'])}")
-    
-    # Validate that we have all required documents
-    if not results["quotes"]:
-        return jsonify({"error": "No valid quote document found"}), 400
-    if not results["mvrs"]:
-        return jsonify({"error": "No valid MVR document found"}), 400
+        except Exception as e:
+            print(f"Compact validation error: {e}")
+            import traceback
+            traceback.print_exc()
+            # Clean up files even if validation fails
+            cleanup_upload_folder()
+            return {"error": str(e)}, 500
+        
+        # Clean up uploaded PDF files after successful processing
+        cleanup_upload_folder()
+        
+        entry = {
+            "extracted": results,
+            "compact_report": compact_report,
+            "no_dash_report": no_dash_report,
+            "categories": categories,
+            "fleet": fleet
+        }
+        result_id = result_store.save(entry, kind="compact", job_id=job_id, fingerprint=fingerprint)
+        return compact_validation_response(result_id, entry)
     
-    # Only require DASH if noDashReport is not set
-    if not no_dash_report and not results["dashes"]:
-        return jsonify({"error": "No valid DASH document found"}), 400
+    options = {"no_dash_report": no_dash_report, "categories": categories, "fleet": fleet, "reuse_records": reuse_records}
+    return run_submission('validate-compact', options, validate_submission_compact, compact_validation_response,
+                          report)
+
+def compact_validation_response(result_id, entry):
+    return {
+        "result_id": result_id,
+        "compact_report": entry["compact_report"],
+        "no_dash_report": entry["no_dash_report"],
+        "categories": entry["categories"]
+    }, 200
+
+@app.route('/api/progress/<progress_id>', methods=['GET'])
+def progress_stream(progress_id):
+    """
+    Server-Sent Events of a submission sent with progressId=<progress_id>: one event per stage
+    and document (uploaded, classified, extracted, validated per driver, gemini_sent,
+    gemini_received), then done or error. Open it before posting the upload.
+    """
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+    return Response(
+        progress.stream(progress_id, last_event_id),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # Don't let a reverse proxy buffer the stream
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@app.route('/api/results', methods=['GET'])
+def search_results():
+    """Search stored results by licence number, client name, quote effective date range, job ID or kind"""
+    try:
+        limit = min(int(request.args.get('limit', 50)), 500)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
     
     try:
-        # Generate compact report with noDashReport flag
-        engine = ValidationEngine()
-        compact_report = engine.generate_compact_report(results, no_dash_report=no_dash_report)
-        print("Compact validation report generated successfully")
-        
+        results = result_store.search(
+            licence_number=request.args.get('licence'),
+            client_name=request.args.get('client'),
+            effective_from=request.args.get('effectiveFrom'),
+            effective_to=request.args.get('effectiveTo'),
+            job_id=request.args.get('jobId'),
+            kind=request.args.get('kind'),
+            limit=limit
+        )
+    except ValueError as e:
+        return jsonify({"error": f"effectiveFrom/effectiveTo: {e}"}), 400
+    return jsonify({"results": results, "count": len(results)})
+
+@app.route('/api/results/<result_id>', methods=['GET'])
+def get_result(result_id):
+    """A stored result as it was returned, with its indexed fields"""
+    summary = result_store.summary(result_id)
+    entry = load_entry(result_store, result_id)
+    if summary is None or entry is None:
+        return jsonify({"error": "Result not found or expired"}), 404
+    return cacheable_json({**summary, **entry})
+
+@app.route('/api/results/<result_id>/summary', methods=['GET'])
+def get_result_summary(result_id):
+    """
+    A stored result's summary: report summary, per-driver status and section counts and document
+    counts. Driver details, match lists and extracted documents are fetched on demand below
+    """
+    entry = load_entry(result_store, result_id)
+    if entry is None:
+        return jsonify({"error": "Result not found or expired"}), 404
+    return cacheable_json(result_summary(result_id, entry))
+
+@app.route('/api/results/<result_id>/drivers/<int:index>', methods=['GET'])
+def get_result_driver(result_id, index):
+    """One driver's report (errors and warnings of every section), without the match lists"""
+    entry = load_entry(result_store, result_id)
+    if entry is None:
+        return jsonify({"error": "Result not found or expired"}), 404
+    detail = driver_detail(entry, index)
+    if detail is None:
+        return jsonify({"error": f"No driver {index} in result {result_id}"}), 404
+    return cacheable_json(detail)
+
+@app.route('/api/results/<result_id>/drivers/<int:index>/matches', methods=['GET'])
+def get_result_driver_matches(result_id, index):
+    """One driver's match lists, per section (or only ?section=mvr_validation and the like)"""
+    entry = load_entry(result_store, result_id)
+    if entry is None:
+        return jsonify({"error": "Result not found or expired"}), 404
+    matches = driver_matches(entry, index, request.args.get('section'))
+    if matches is None:
+        return jsonify({"error": f"No such driver or section in result {result_id}"}), 404
+    return cacheable_json({"index": index, "matches": matches})
+
+@app.route('/api/results/<result_id>/documents/<kind>', methods=['GET'])
+def get_result_documents(result_id, kind):
+    """A page of a stored result's extracted quotes, mvrs or dashes (?offset=0&limit=...)"""
+    if kind not in DOCUMENT_KINDS:
+        return jsonify({"error": f"kind must be one of {', '.join(DOCUMENT_KINDS)}"}), 400
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', DOCUMENT_PAGE_LIMIT))
+    except ValueError:
+        return jsonify({"error": "offset and limit must be integers"}), 400
+    
+    entry = load_entry(result_store, result_id)
+    if entry is None:
+        return jsonify({"error": "Result not found or expired"}), 404
+    return cacheable_json(documents_page(entry, kind, offset, limit))
+
+@app.route('/api/results/<result_id>/render', methods=['GET'])
+def render_result(result_id):
+    """
+    Validate a stored submission's extracted documents again, without re-extracting the PDFs:
+    format=full (default) gives the validation report, format=compact the one-page report
+    """
+    entry = result_store.get(result_id)
+    if entry is None:
+        return jsonify({"error": "Result not found or expired"}), 404
+    if "extracted" not in entry:
+        return jsonify({"error": "Result has no extracted documents to validate"}), 400
+    
+    report_format = request.args.get('format', 'full')
+    if report_format not in ('full', 'compact'):
+        return jsonify({"error": "format must be 'full' or 'compact'"}), 400
+    
+    no_dash_report = entry.get("no_dash_report", False)
+    categories = entry.get("categories")
+    fleet = entry.get("fleet", False)
+    try:
+        if report_format == 'compact':
+            report = {"compact_report": ValidationEngine().generate_compact_report(
+                entry["extracted"], no_dash_report=no_dash_report, categories=categories, fleet=fleet)}
+        else:
+            report = {"validation_report": validate_quote(
+                entry["extracted"], no_dash_report=no_dash_report, categories=categories, fleet=fleet)}
     except Exception as e:
-        print(f"Compact validation error: {e}")
+        print(f"Render error for result {result_id}: {e}")
         import traceback
         traceback.print_exc()
-        # Clean up files even if validation fails
-        cleanup_upload_folder()
         return jsonify({"error": str(e)}), 500
     
-    # Clean up uploaded PDF files after successful processing
-    cleanup_upload_folder()
-    
     return jsonify({
-        "compact_report": compact_report,
-        "no_dash_report": no_dash_report
+        "result_id": result_id,
+        "extracted": entry["extracted"],
+        "no_dash_report": no_dash_report,
+        "categories": categories,
+        **report
     })
 
 
@@ -420,23 +667,29 @@ def compare_quote():
     if not allowed_file(file.filename):
         return jsonify({"error": "Only PDF files are allowed"}), 400
     
+    # Fleet mode pairs drivers and vehicles one-to-one (large commercial quotes)
+    fleet = request.form.get('fleetMode', 'false').lower() == 'true'
+    
+    job_id = uuid.uuid4().hex
     try:
-        result = compare_quote_with_pdf(file)
+        result = compare_quote_with_pdf(store_upload(file, job_id), fleet=fleet)
         return jsonify(result), 200
     except Exception as e:
         return jsonify({"error": f"Comparison failed: {str(e)}"}), 500
+    finally:
+        blob_store.release_job(job_id)
 
 @app.route('/debug', methods=['POST'])
 def debug_extraction():
     """Debug endpoint to see what's being extracted from each file"""
     files = request.files.getlist('files')
     debug_results = {}
+    job_id = uuid.uuid4().hex
     
     for file in files:
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
-            path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(path)
+            upload = store_upload(file, job_id)
             
             debug_results[filename] = {
                 "file_type": "Unknown",
@@ -445,13 +698,15 @@ def debug_extraction():
             
             if "MVR" in filename.upper():
                 debug_results[filename]["file_type"] = "MVR"
-                debug_results[filename]["extracted_data"] = extract_mvr_data(path)
+                debug_results[filename]["extracted_data"] = extract_mvr_data(upload)
             elif "DASH" in filename.upper():
                 debug_results[filename]["file_type"] = "DASH"
-                debug_results[filename]["extracted_data"] = extract_dash_data(path)
+                debug_results[filename]["extracted_data"] = extract_dash_data(upload)
             elif "QUOTE" in filename.upper():
                 debug_results[filename]["file_type"] = "QUOTE"
-                debug_results[filename]["extracted_data"] = extract_quote_data(path)
+                debug_results[filename]["extracted_data"] = extract_quote_data(upload)
+    
+    blob_store.release_job(job_id)
     
     # Clean up uploaded PDF files after processing
     cleanup_upload_folder()
@@ -473,16 +728,22 @@ def application_qc():
     if not allowed_file(application_file.filename):
         return jsonify({"error": "Only PDF files are allowed"}), 400
     
+    # Progress events go to the stream the client opened for this ID (see /api/progress)
+    report = progress.reporter(request.form.get('progressId'))
+    
+    job_id = uuid.uuid4().hex
     try:
-        # Save application file
+        # Store the application file; Gemini needs it on disk
         app_filename = secure_filename(application_file.filename)
-        app_path = os.path.join(app.config['UPLOAD_FOLDER'], app_filename)
-        application_file.save(app_path)
+        app_digest = blob_store.put_stream(application_file.stream, job_id)
+        app_path = blob_store.path(app_digest)
+        report("uploaded", document=app_filename, field='application', size=os.path.getsize(app_path))
+        report("classified", document=app_filename, doc_type='application', detected=False)
         
         print(f"Processing Application QC with Gemini AI: {app_filename}")
         
         # Run new Gemini-based Application QC
-        qc_results = extract_and_validate_application_qc(app_path)
+        qc_results = extract_and_validate_application_qc(app_path, app_filename, progress=report)
         
         # Process results for UI compatibility
         failed_checks = []
@@ -598,21 +859,30 @@ def application_qc():
         app_json_filename = f"application_qc_data_{timestamp}.json"
         qc_json_filename = f"qc_results_{timestamp}.json"
         
-        app_json_path = os.path.join(app.config['UPLOAD_FOLDER'], app_json_filename)
-        qc_json_path = os.path.join(app.config['UPLOAD_FOLDER'], qc_json_filename)
-        
-        with open(app_json_path, 'w', encoding='utf-8') as f:
-            json.dump(qc_results, f, indent=2, ensure_ascii=False)
-        
-        with open(qc_json_path, 'w', encoding='utf-8') as f:
-            json.dump(qc_validation_results, f, indent=2, ensure_ascii=False)
+        blob_store.put(json.dumps(qc_results, indent=2, ensure_ascii=False).encode('utf-8'), name=app_json_filename)
+        blob_store.put(json.dumps(qc_validation_results, indent=2, ensure_ascii=False).encode('utf-8'), name=qc_json_filename)
         
         print(f"Gemini Application QC completed: {summary}")
         
+        result_id = result_store.save({
+            "application_file": app_filename,
+            "application_digest": app_digest,
+            "summary": summary,
+            "qc_results": qc_results,
+            "qc_validation_results": qc_validation_results,
+            "files": {
+                "application_data": app_json_filename,
+                "qc_results": qc_json_filename
+            }
+        }, kind="qc", job_id=job_id)
+        
         # Clean up uploaded files
         cleanup_upload_folder()
         
+        report("extracted", document=app_filename, doc_type='application', ok=True)
+        report("done", result_id=result_id)
         return jsonify({
+            "result_id": result_id,
             "message": "Application QC completed successfully with Gemini AI",
             "summary": summary,
             "qc_results": {
@@ -635,7 +905,10 @@ def application_qc():
         import traceback
         traceback.print_exc()
         cleanup_upload_folder()
+        report("error", error=f"Application QC failed: {str(e)}", status=500)
         return jsonify({"error": f"Application QC failed: {str(e)}"}), 500
+    finally:
+        blob_store.release_job(job_id)
 
 
 
@@ -648,14 +921,51 @@ def manual_cleanup():
     except Exception as e:
         return jsonify({"error": f"Cleanup failed: {str(e)}"}), 500
 
+@app.route('/api/pattern-stats', methods=['GET'])
+def get_pattern_stats():
+    """Hit and miss counts and time of every extractor fallback pattern, with the learned orders"""
+    return jsonify({
+        "profiling": pattern_packs.PATTERN_PROFILING,
+        "packs": pattern_packs.pattern_stats(),
+        "learned_orders": pattern_packs.learned_orders()
+    })
+
+@app.route('/api/pattern-stats/reset', methods=['POST'])
+def reset_pattern_stats():
+    """Start the pattern statistics afresh"""
+    pattern_packs.reset_pattern_stats()
+    return jsonify({"message": "Pattern statistics reset"}), 200
+
+@app.route('/api/pattern-order', methods=['POST'])
+def apply_pattern_order():
+    """
+    Reorder the extractor patterns: the learned orders from profiled documents, or a JSON body
+    of {pack name: [pattern, ...]}. Saved to PATTERN_ORDER_FILE when set, and the extraction
+    workers are restarted so new submissions pick it up.
+    """
+    orders = request.get_json(silent=True) or pattern_packs.learned_orders()
+    if not isinstance(orders, dict) or not all(isinstance(patterns, list) for patterns in orders.values()):
+        return jsonify({"error": "Expected {pack name: [pattern, ...]}"}), 400
+
+    pattern_packs.apply_pattern_orders(orders)
+    if pattern_packs.PATTERN_ORDER_FILE:
+        try:
+            with open(pattern_packs.PATTERN_ORDER_FILE, "w", encoding="utf-8") as f:
+                json.dump(pattern_packs.current_orders(), f, indent=4)
+        except OSError as e:
+            return jsonify({"error": f"Could not save pattern order: {str(e)}"}), 500
+    extraction_service.close()
+
+    return jsonify({"applied": sorted(orders), "orders": pattern_packs.current_orders()}), 200
+
 @app.route('/api/download-cleaned-pdf/<filename>', methods=['GET'])
 def download_cleaned_pdf(filename):
     """Download cleaned PDF file"""
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        if os.path.exists(file_path) and "_cleaned.pdf" in filename:
+        digest = blob_store.find(filename)
+        if digest and "_cleaned.pdf" in filename:
             from flask import send_file
-            return send_file(file_path, as_attachment=True, download_name=filename)
+            return send_file(io.BytesIO(blob_store.read(digest)), as_attachment=True, download_name=filename)
         else:
             return jsonify({"error": "File not found or not a cleaned PDF"}), 404
     except Exception as e:
@@ -665,14 +975,15 @@ def download_cleaned_pdf(filename):
 def download_qc_report(filename):
     """Download QC validation report file (PDF or text)"""
     try:
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        if os.path.exists(file_path) and "QC_Validation_Report" in filename:
+        digest = blob_store.find(filename)
+        if digest and "QC_Validation_Report" in filename:
             from flask import send_file
+            report = io.BytesIO(blob_store.read(digest))
             # Set appropriate MIME type based on file extension
             if filename.endswith('.pdf'):
-                return send_file(file_path, as_attachment=True, download_name=filename, mimetype='application/pdf')
+                return send_file(report, as_attachment=True, download_name=filename, mimetype='application/pdf')
             else:
-                return send_file(file_path, as_attachment=True, download_name=filename, mimetype='text/plain')
+                return send_file(report, as_attachment=True, download_name=filename, mimetype='text/plain')
         else:
             return jsonify({"error": "File not found or not a QC report"}), 404
     except Exception as e:
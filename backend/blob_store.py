@@ -0,0 +1,267 @@
+import os
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from extractors.pdf_source import PdfUpload, UPLOAD_CHUNK_BYTES, UPLOAD_SPILL_BYTES
+
+BLOB_STORE_DIR = os.environ.get("BLOB_STORE_DIR", os.path.join("uploads", "blobs"))
+# Seconds a blob no job references is kept (for re-uploads of the same document and downloads)
+BLOB_TTL_SECONDS = int(os.environ.get("BLOB_TTL_SECONDS", 24 * 60 * 60))
+# Unreferenced in-memory blobs beyond this many bytes are dropped, least recently used first
+BLOB_MEMORY_BYTES = int(os.environ.get("BLOB_MEMORY_BYTES", 256 * 1024 * 1024))
+# Garbage is collected at most this often, on the next put
+BLOB_GC_INTERVAL_SECONDS = 60
+
+
+class Blob:
+    """One stored content: in memory (data) or on disk (path), with the jobs referencing it"""
+
+    def __init__(self, digest, size, data=None, path=None):
+        self.digest = digest
+        self.size = size
+        self.data = data
+        self.path = path
+        self.jobs = {}
+        self.last_used = time.time()
+
+
+class BlobStore:
+    """
+    Content-addressed store for uploaded documents and generated files. Each content is kept
+    once, under the SHA-256 of its bytes, however many brokers or jobs upload it; two uploads
+    with the same file name no longer overwrite each other.
+    Small blobs stay in memory, larger ones (and any whose path is asked for) live on disk under
+    root. Jobs take references with put/acquire and drop them all with release_job; a blob no
+    job references is removed ttl_seconds after its last use.
+    Generated files can be put under a name, which download endpoints look up with find.
+    """
+
+    def __init__(self, root=BLOB_STORE_DIR, ttl_seconds=BLOB_TTL_SECONDS, memory_limit=UPLOAD_SPILL_BYTES,
+                 memory_budget=BLOB_MEMORY_BYTES):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.memory_limit = memory_limit
+        self.memory_budget = memory_budget
+        self._blobs = OrderedDict()
+        self._names = {}
+        self._lock = threading.Lock()
+        self._last_gc = 0
+        os.makedirs(root, exist_ok=True)
+
+    def put(self, data, job_id=None, name=None):
+        """Store bytes (once per content) with a reference for job_id; returns the digest"""
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is None:
+                blob = Blob(digest, len(data))
+                if len(data) <= self.memory_limit:
+                    blob.data = data
+                else:
+                    blob.path = self._write(digest, [data])
+                self._blobs[digest] = blob
+            self._use(blob, job_id, name)
+        self._maybe_collect()
+        return digest
+
+    def put_stream(self, stream, job_id=None, name=None):
+        """
+        Store a binary stream read in chunks; once it grows past the memory limit the rest goes
+        straight to disk rather than into memory. Returns the digest
+        """
+        hasher = hashlib.sha256()
+        chunks = []
+        size = 0
+        handle = None
+        temporary = None
+        try:
+            while True:
+                chunk = stream.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                size += len(chunk)
+                if handle is None:
+                    chunks.append(chunk)
+                    if size > self.memory_limit:
+                        handle, temporary = tempfile.mkstemp(dir=self.root, suffix=".part")
+                        handle = os.fdopen(handle, "wb")
+                        for buffered in chunks:
+                            handle.write(buffered)
+                        chunks = None
+                else:
+                    handle.write(chunk)
+        finally:
+            if handle is not None:
+                handle.close()
+
+        digest = hasher.hexdigest()
+        with self._lock:
+            blob = self._blobs.get(digest)
+            if blob is None:
+                blob = Blob(digest, size)
+                if temporary is None:
+                    blob.data = b"".join(chunks)
+                else:
+                    blob.path = self._blob_path(digest)
+                    os.makedirs(os.path.dirname(blob.path), exist_ok=True)
+                    os.replace(temporary, blob.path)
+                    temporary = None
+                self._blobs[digest] = blob
+            self._use(blob, job_id, name)
+        if temporary is not None:
+            # Same content was already stored
+            os.remove(temporary)
+        self._maybe_collect()
+        return digest
+
+    def acquire(self, digest, job_id):
+        """Add a reference for job_id to a stored blob; returns False if it is not stored"""
+        with self._lock:
+            blob = self._lookup(digest)
+            if blob is None:
+                return False
+            self._use(blob, job_id, None)
+            return True
+
+    def release_job(self, job_id):
+        """Drop every reference job_id holds; unreferenced blobs expire after the TTL"""
+        with self._lock:
+            for blob in self._blobs.values():
+                if blob.jobs.pop(job_id, None) is not None:
+                    blob.last_used = time.time()
+            self._trim_memory()
+
+    def upload(self, digest, name=None):
+        """The blob as a PdfUpload for the extractors (its own bytes or file, not a copy), or None"""
+        with self._lock:
+            blob = self._lookup(digest)
+            if blob is None:
+                return None
+            blob.last_used = time.time()
+            return PdfUpload(name or f"{digest}.pdf", data=blob.data, path=blob.path, digest=digest)
+
+    def read(self, digest):
+        """The blob's bytes, or None"""
+        upload = self.upload(digest)
+        return upload.read() if upload else None
+
+    def path(self, digest):
+        """A file path of the blob, written to disk first if it was only in memory (None if not stored)"""
+        with self._lock:
+            blob = self._lookup(digest)
+            if blob is None:
+                return None
+            if blob.path is None:
+                blob.path = self._write(digest, [blob.data])
+            blob.last_used = time.time()
+            return blob.path
+
+    def find(self, name):
+        """Digest of the file last stored under name, or None"""
+        with self._lock:
+            digest = self._names.get(name)
+            return digest if digest and self._lookup(digest) else None
+
+    def collect_garbage(self):
+        """
+        Remove blobs no job references whose last use is older than the TTL, including blob files
+        left on disk by earlier runs. Returns the number removed
+        """
+        now = time.time()
+        removed = 0
+        with self._lock:
+            self._last_gc = now
+            for digest in [digest for digest, blob in self._blobs.items()
+                           if not blob.jobs and now - blob.last_used > self.ttl_seconds]:
+                self._remove(self._blobs.pop(digest))
+                removed += 1
+            self._names = {name: digest for name, digest in self._names.items() if digest in self._blobs}
+
+            known = {blob.path for blob in self._blobs.values() if blob.path}
+            for directory, _, files in os.walk(self.root):
+                for filename in files:
+                    path = os.path.join(directory, filename)
+                    try:
+                        if path not in known and now - os.path.getmtime(path) > self.ttl_seconds:
+                            os.remove(path)
+                            removed += 1
+                    except OSError:
+                        pass
+        return removed
+
+    def stats(self):
+        with self._lock:
+            blobs = list(self._blobs.values())
+            return {
+                "blobs": len(blobs),
+                "referenced": sum(1 for blob in blobs if blob.jobs),
+                "memory_bytes": sum(blob.size for blob in blobs if blob.data is not None),
+                "disk_bytes": sum(blob.size for blob in blobs if blob.path),
+                "names": len(self._names)
+            }
+
+    def _use(self, blob, job_id, name):
+        blob.last_used = time.time()
+        if job_id is not None:
+            blob.jobs[job_id] = blob.jobs.get(job_id, 0) + 1
+        if name:
+            self._names[name] = blob.digest
+        self._blobs.move_to_end(blob.digest)
+        if blob.path:
+            # Another process's collector goes by the file time
+            try:
+                os.utime(blob.path)
+            except OSError:
+                pass
+
+    def _lookup(self, digest):
+        blob = self._blobs.get(digest)
+        if blob is None:
+            # Stored on disk by an earlier run or another process
+            path = self._blob_path(digest)
+            if os.path.exists(path):
+                blob = Blob(digest, os.path.getsize(path), path=path)
+                self._blobs[digest] = blob
+        return blob
+
+    def _trim_memory(self):
+        """Drop the least recently used unreferenced in-memory blobs beyond the memory budget"""
+        in_memory = sum(blob.size for blob in self._blobs.values() if blob.data is not None)
+        for digest in list(self._blobs):
+            if in_memory <= self.memory_budget:
+                break
+            blob = self._blobs[digest]
+            if blob.data is not None and not blob.jobs:
+                in_memory -= blob.size
+                blob.data = None
+                if blob.path is None:
+                    del self._blobs[digest]
+
+    def _maybe_collect(self):
+        if time.time() - self._last_gc > BLOB_GC_INTERVAL_SECONDS:
+            self.collect_garbage()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _write(self, digest, chunks):
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temporary name first, so no reader sees a partial blob
+            handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+            with os.fdopen(handle, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(temporary, path)
+        return path
+
+    def _remove(self, blob):
+        if blob.path:
+            try:
+                os.remove(blob.path)
+            except OSError:
+                pass
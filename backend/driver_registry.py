@@ -0,0 +1,92 @@
+import copy
+from extractors.quote_extractor import merge_mvr_convictions
+from result_store import normalize_licence
+from validator.compare_engine import ValidationEngine
+
+# How many stored records per driver and report type are checked for one still valid
+DRIVER_RECORD_CANDIDATES = 10
+
+
+class DriverRecordRegistry:
+    """
+    Supplies MVR and DASH records from earlier submissions, keyed by normalized licence number
+    and read from the result store. A stored record is reused for a quote driver who has no
+    uploaded record of that type, as long as it is still valid for the quote effective date
+    (see ValidationEngine.report_is_current), so those drivers' reports need no upload or extraction.
+    Reused records carry a "reused_from" entry with the result they were first extracted for.
+    """
+
+    def __init__(self, result_store, engine=None):
+        self.result_store = result_store
+        self.engine = engine or ValidationEngine()
+
+    def find_record(self, licence_number, doc_type, quote):
+        """The newest stored MVR or DASH record (doc_type "mvr"/"dash") still valid for quote, or None"""
+        for stored in self.result_store.driver_records(licence_number, doc_type, DRIVER_RECORD_CANDIDATES):
+            record = stored["record"]
+            if doc_type == "mvr":
+                current = self.engine.report_is_current(quote, mvr=record)
+            else:
+                current = self.engine.report_is_current(quote, dash=record)
+            if current:
+                record = copy.deepcopy(record)
+                record["reused_from"] = {"result_id": stored["result_id"], "stored_at": stored["stored_at"]}
+                return record
+        return None
+
+    def fill_missing_records(self, extracted, no_dash_report=False):
+        """
+        Add a stored MVR (and DASH, unless no_dash_report) for every quote driver without an
+        uploaded one, merging the reused MVRs' convictions into the quote. Updates extracted in
+        place and returns the reused records as {"driver", "licence_number", "doc_type",
+        "result_id", "stored_at"}, also kept under extracted["reused_records"]
+        """
+        reused = []
+        doc_types = (("mvr", "mvrs", "licence_number"),) if no_dash_report else \
+            (("mvr", "mvrs", "licence_number"), ("dash", "dashes", "dln"))
+        for quote in extracted.get("quotes", []):
+            reused_mvrs = []
+            for driver in quote.get("drivers", []):
+                licence = normalize_licence(driver.get("licence_number"))
+                if not licence:
+                    continue
+                for doc_type, documents, licence_field in doc_types:
+                    if any(normalize_licence(record.get(licence_field)) == licence
+                           for record in extracted.get(documents, [])):
+                        continue
+                    record = self.find_record(licence, doc_type, quote)
+                    if record is None:
+                        continue
+                    extracted.setdefault(documents, []).append(record)
+                    if doc_type == "mvr":
+                        reused_mvrs.append(record)
+                    reused.append({
+                        "driver": driver.get("full_name"),
+                        "licence_number": driver.get("licence_number"),
+                        "doc_type": doc_type,
+                        **record["reused_from"]
+                    })
+            if reused_mvrs:
+                merge_mvr_convictions(quote, reused_mvrs)
+
+        if reused:
+            print(f"Reusing {len(reused)} stored driver record(s): " +
+                  ", ".join(f"{item['doc_type'].upper()} for {item['driver']}" for item in reused))
+            extracted["reused_records"] = extracted.get("reused_records", []) + reused
+        return reused
+
+
+def mark_reused_records(report, reused):
+    """
+    Note the reused records in a validation report: all of them under "reused_records", and each
+    driver's own under its entry in report["drivers"] (matched by licence number)
+    """
+    if not reused:
+        return report
+    report["reused_records"] = reused
+    for driver in report.get("drivers", []):
+        licence = normalize_licence(driver.get("driver_license"))
+        own = [item for item in reused if licence and normalize_licence(item["licence_number"]) == licence]
+        if own:
+            driver["reused_records"] = own
+    return report
@@ -0,0 +1,404 @@
+import os
+import copy
+import math
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker
+from extractors.mvr_extractor import extract_mvr_data
+from extractors.dash_extractor import extract_dash_data
+from extractors.quote_extractor import extract_quote_data, merge_mvr_convictions
+from extractors.time_budget import DOCUMENT_TIME_BUDGET_SECONDS, run_with_budget, timed_out_result
+from extractors.pattern_packs import drain_pattern_stats, merge_pattern_stats
+from extractors.pdf_source import SharedPdf, share_pdf, source_name
+
+# Worker processes extracting the documents of one submission side by side. 0 extracts in the
+# request thread, where the per-document time budget cannot interrupt a runaway pattern.
+EXTRACTION_WORKERS = int(os.environ.get("EXTRACTION_WORKERS", min(4, os.cpu_count() or 1)))
+
+# Extraction results kept per (document type, content digest), so a document stored in the
+# blob store is extracted once however many submissions or brokers upload it
+EXTRACTION_CACHE_SIZE = int(os.environ.get("EXTRACTION_CACHE_SIZE", 256))
+
+# Extra seconds a worker gets past its documents' budgets before it is presumed stuck
+# (e.g. inside PyMuPDF, which the budget cannot interrupt). Its pool is then retired and
+# terminated once every other submission's documents on it have finished.
+WORKER_GRACE_SECONDS = 10
+
+EXTRACTORS = {
+    "mvr": extract_mvr_data,
+    "dash": extract_dash_data,
+    "quote": extract_quote_data
+}
+
+# Result list for each document type
+RESULT_KEYS = {
+    "mvr": "mvrs",
+    "dash": "dashes",
+    "quote": "quotes"
+}
+
+
+def detect_and_extract(path):
+    """
+    Work out the type of an unlabelled document by trying each extractor in turn.
+    Returns (document type, extracted data), or (None, None) when no extractor recognises it
+    """
+    # Try MVR extraction
+    try:
+        mvr_data = extract_mvr_data(path)
+        if mvr_data and mvr_data.get('licence_number'):
+            return "mvr", mvr_data
+    except Exception:
+        pass
+
+    # Try DASH extraction
+    try:
+        dash_data = extract_dash_data(path)
+        if dash_data and (dash_data.get('claims') or dash_data.get('policies')):
+            return "dash", dash_data
+    except Exception:
+        pass
+
+    # Try Quote extraction
+    try:
+        quote_data = extract_quote_data(path)
+        if quote_data and (quote_data.get('drivers') or quote_data.get('vehicles')):
+            return "quote", quote_data
+    except Exception:
+        pass
+
+    return None, None
+
+
+def extract_document(doc_type, path, seconds=DOCUMENT_TIME_BUDGET_SECONDS):
+    """
+    Extract one document on its own within a time budget of seconds; quotes are extracted
+    without MVR convictions. A document that runs out of time yields its partial result
+    flagged "timed_out" (see run_with_budget).
+    doc_type: "mvr", "dash", "quote" or "auto" (detect the type first)
+    Returns (document type, extracted data)
+    """
+    if doc_type in EXTRACTORS:
+        return doc_type, run_with_budget(EXTRACTORS[doc_type], path, seconds)
+
+    detected = run_with_budget(detect_and_extract, path, seconds)
+    if isinstance(detected, dict):
+        # Ran out of time before any extractor recognised the document
+        return None, None
+    return detected
+
+
+def start_resource_tracker():
+    """
+    Start this process's shared memory resource tracker before forking workers, so they report
+    to it. A worker started without one launches its own, which removes every SharedPdf segment
+    the worker opened when the worker exits, even while the segment is still in use.
+    """
+    resource_tracker.ensure_running()
+
+
+def extract_document_in_worker(doc_type, path, seconds=DOCUMENT_TIME_BUDGET_SECONDS):
+    """
+    extract_document in a worker process; also returns the worker's pattern statistics for the
+    serving process. A SharedPdf is unmapped again once the document is extracted.
+    """
+    try:
+        return extract_document(doc_type, path, seconds), drain_pattern_stats()
+    finally:
+        if isinstance(path, SharedPdf):
+            path.detach()
+
+
+def _report_finished(future, index, on_done):
+    """Done callback of a worker future: report the document if the worker extracted it"""
+    if future.cancelled() or future.exception() is not None:
+        return
+    on_done(index, future.result()[0])
+
+
+class ExtractionService:
+    """
+    Extract every document of a submission independently, in worker processes, and join
+    the results at the end. Quotes no longer wait for the MVRs: their MVR convictions are
+    merged in once everything is extracted (see merge_mvr_convictions).
+    Each document gets time_budget seconds; one that runs out is kept as a partial result
+    flagged "timed_out" instead of holding up the whole submission.
+    Uploads from the blob store (with a content digest) are extracted once: later uploads of
+    the same document get a copy of the cached result.
+    A submission with a stuck document retires the shared pool rather than killing it: new
+    submissions get a fresh pool, and the retired one is terminated only when nothing but
+    abandoned documents is left running on it, so other brokers' documents still finish.
+    """
+
+    def __init__(self, max_workers=EXTRACTION_WORKERS, time_budget=DOCUMENT_TIME_BUDGET_SECONDS,
+                 cache_size=EXTRACTION_CACHE_SIZE):
+        self.max_workers = max_workers
+        self.time_budget = time_budget
+        self.cache_size = cache_size
+        self._pool = None
+        self._lock = threading.Lock()
+        # Futures still running on each pool, and the stuck ones given up on per retired pool
+        self._inflight = {}
+        self._abandoned = {}
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def extract_submission(self, documents, on_document=None):
+        """
+        documents: list of (doc_type, path) with doc_type "mvr", "dash", "quote" or "auto" and
+                   path a PDF path or an in-memory PdfUpload
+        on_document: optional callback, called with ((doc_type, path), (detected type, data)) as
+                     soon as each document is extracted, in completion order (for progress events)
+        Returns {"mvrs", "dashes", "quotes"}, each in upload order; documents that fail
+        to extract or cannot be recognised are skipped
+        """
+        results = {
+            "mvrs": [],
+            "dashes": [],
+            "quotes": []
+        }
+
+        for (requested_type, path), (doc_type, data) in zip(documents, self._extract_all(documents, on_document)):
+            filename = source_name(path)
+            if data is None:
+                if requested_type == "auto" and doc_type is None:
+                    print(f"Could not determine type for {filename}")
+                continue
+            if data.get("timed_out"):
+                print(f"{filename} exceeded the {self.time_budget}s extraction budget; keeping its partial result")
+
+            if doc_type == "mvr":
+                print(f"MVR extracted: {data.get('licence_number', 'No license')} - {data.get('name', 'No name')}")
+            elif doc_type == "dash":
+                print(f"DASH extracted: {len(data.get('claims', []))} claims")
+            else:
+                print(f"Quote extracted: {len(data.get('drivers', []))} drivers")
+            results[RESULT_KEYS[doc_type]].append(data)
+
+        # Every MVR is known now, so each quote gets all of their convictions
+        for quote_data in results["quotes"]:
+            merge_mvr_convictions(quote_data, results["mvrs"])
+
+        print(f"Extraction complete. MVRs: {len(results['mvrs'])}, DASHes: {len(results['dashes'])}, Quotes: {len(results['quotes'])}")
+        return results
+
+    def _extract_all(self, documents, on_document=None):
+        """(doc_type, data) for every document, in order; data is None when extraction failed"""
+        extracted = [self._cached(doc_type, path) for doc_type, path in documents]
+        pending = [position for position, document in enumerate(extracted) if document is None]
+        if len(pending) < len(documents):
+            print(f"Reusing the extraction of {len(documents) - len(pending)} previously uploaded document(s)")
+            if on_document:
+                for source, document in zip(documents, extracted):
+                    if document is not None:
+                        on_document(source, document)
+
+        on_done = None
+        if on_document:
+            on_done = lambda index, document: on_document(documents[pending[index]], document)
+        uncached = self._extract_uncached([documents[position] for position in pending], on_done)
+        for position, document in zip(pending, uncached):
+            extracted[position] = document
+            self._remember(documents[position], document)
+        return extracted
+
+    def _cached(self, doc_type, path):
+        digest = getattr(path, "digest", None)
+        if digest is None:
+            return None
+        with self._cache_lock:
+            document = self._cache.get((doc_type, digest))
+            if document is None:
+                return None
+            self._cache.move_to_end((doc_type, digest))
+        # Callers change the results (e.g. MVR convictions merged into quotes)
+        return copy.deepcopy(document)
+
+    def _remember(self, source, document):
+        requested_type, path = source
+        digest = getattr(path, "digest", None)
+        doc_type, data = document
+        if digest is None or self.cache_size <= 0 or data is None or data.get("timed_out") or data.get("extraction_error"):
+            return
+        with self._cache_lock:
+            self._cache[(requested_type, digest)] = copy.deepcopy(document)
+            self._cache.move_to_end((requested_type, digest))
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _extract_uncached(self, documents, on_done=None):
+        """
+        (doc_type, data) for every document, in order; on_done(index, document) is called as each
+        one is ready
+        """
+        if self.max_workers <= 0 or not documents:
+            return self._extract_in_process(documents, on_done)
+
+        futures = []
+        pool = None
+        try:
+            pool = self._get_pool()
+            for doc_type, path in documents:
+                futures.append(self._submit(pool, doc_type, path))
+        except (BrokenProcessPool, RuntimeError) as e:
+            print(f"Extraction workers unavailable, extracting in process: {e}")
+            self._reset_pool(pool)
+            return self._extract_in_process(documents, on_done)
+
+        if on_done:
+            # Report each document when its worker finishes; failed ones are reported below
+            for index, future in enumerate(futures):
+                future.add_done_callback(lambda future, index=index: _report_finished(future, index, on_done))
+
+        # Each worker takes its share of the documents one after another
+        deadline = None
+        if self.time_budget and self.time_budget > 0:
+            deadline = math.ceil(len(documents) / self.max_workers) * self.time_budget + WORKER_GRACE_SECONDS
+        _, stuck = wait(futures, timeout=deadline)
+        if stuck:
+            print(f"{len(stuck)} document(s) still extracting after {deadline}s, retiring the extraction workers")
+            self._retire_pool(pool, stuck)
+
+        extracted = []
+        for index, ((doc_type, path), future) in enumerate(zip(documents, futures)):
+            if future in stuck:
+                # A stuck auto-detected document has no type to keep a partial result under
+                if doc_type in EXTRACTORS:
+                    extracted.append((doc_type, timed_out_result(None, self.time_budget)))
+                else:
+                    extracted.append((None, None))
+            else:
+                try:
+                    document, pattern_counts = future.result()
+                    merge_pattern_stats(pattern_counts)
+                    extracted.append(document)
+                    continue
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. killed for memory); retry this document here
+                    print(f"Extraction worker failed on {source_name(path)}: {e}")
+                    self._reset_pool(pool)
+                    extracted.append(self._extract_safely(doc_type, path))
+                except Exception as e:
+                    print(f"Error processing {source_name(path)}: {e}")
+                    traceback.print_exc()
+                    extracted.append((doc_type, None))
+            if on_done:
+                on_done(index, extracted[-1])
+        return extracted
+
+    def _extract_in_process(self, documents, on_done=None):
+        extracted = []
+        for index, (doc_type, path) in enumerate(documents):
+            extracted.append(self._extract_safely(doc_type, path))
+            if on_done:
+                on_done(index, extracted[-1])
+        return extracted
+
+    def _submit(self, pool, doc_type, path):
+        """
+        Queue one document for a worker. Large in-memory uploads go through shared memory: the
+        worker gets a handle to the segment, which is removed once the job has ended.
+        """
+        shared = share_pdf(path)
+        if shared is None:
+            future = pool.submit(extract_document_in_worker, doc_type, path, self.time_budget)
+        else:
+            try:
+                future = pool.submit(extract_document_in_worker, doc_type, shared, self.time_budget)
+            except BaseException:
+                shared.release()
+                raise
+            future.add_done_callback(lambda _: shared.release())
+        with self._lock:
+            self._inflight.setdefault(pool, set()).add(future)
+        future.add_done_callback(lambda future: self._finished(pool, future))
+        return future
+
+    def _extract_safely(self, doc_type, path):
+        try:
+            return extract_document(doc_type, path, self.time_budget)
+        except Exception as e:
+            print(f"Error processing {source_name(path)}: {e}")
+            traceback.print_exc()
+            return doc_type, None
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                start_resource_tracker()
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def close(self):
+        """
+        Shut down the worker processes. New submissions start fresh workers (e.g. to pick up a
+        new pattern order); documents already queued by running submissions still finish.
+        """
+        self._reset_pool()
+
+    def _reset_pool(self, pool=None):
+        """
+        Stop sending new documents to pool (default: the current one) and let it exit once the
+        documents already queued on it are done; other submissions' work is never cancelled
+        """
+        with self._lock:
+            if self._pool is None or (pool is not None and self._pool is not pool):
+                return
+            retired, self._pool = self._pool, None
+        retired.shutdown(wait=False)
+
+    def _retire_pool(self, pool, stuck):
+        """
+        Stop sending documents to pool and give up on its stuck futures. Killing a worker breaks
+        the whole executor, so the pool is terminated only once everything else on it is done.
+        """
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+            abandoned = self._abandoned.setdefault(pool, set())
+            abandoned.update(stuck)
+            terminate = self._release_if_abandoned(pool)
+        if terminate:
+            self._terminate(pool)
+
+    def _finished(self, pool, future):
+        """Done callback of every worker future: terminate a retired pool once only abandoned work is left"""
+        with self._lock:
+            running = self._inflight.get(pool)
+            if running is None:
+                return
+            running.discard(future)
+            if not running and pool is not self._pool and pool not in self._abandoned:
+                self._inflight.pop(pool)
+            terminate = pool in self._abandoned and self._release_if_abandoned(pool)
+        if terminate:
+            self._terminate(pool)
+
+    def _release_if_abandoned(self, pool):
+        """Under _lock: forget a retired pool whose running futures are all abandoned"""
+        if not self._inflight.get(pool, set()) <= self._abandoned[pool]:
+            return False
+        self._inflight.pop(pool, None)
+        self._abandoned.pop(pool)
+        return True
+
+    @staticmethod
+    def _terminate(pool):
+        # The executor has no public way to stop a task that is already running
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def extract_submission(documents, max_workers=EXTRACTION_WORKERS, time_budget=DOCUMENT_TIME_BUDGET_SECONDS):
+    """
+    Convenience function to extract a submission's documents in parallel
+    """
+    service = ExtractionService(max_workers, time_budget)
+    try:
+        return service.extract_submission(documents)
+    finally:
+        service.close()
@@ -1,323 +1,635 @@
-import fitz  # PyMuPDF
 import re
 import json
+from validator.policy_intervals import analyze_policy_history
+from extractors.time_budget import track_partial
+from extractors.pattern_packs import PatternPack
+from extractors.ocr_fallback import needs_ocr, ocr_short_pages, mark_ocr_pages
+from extractors.pdf_source import open_pdf
+
+# Report header fields
+DLN_PATTERNS = PatternPack("dash.dln", (
+    r'DLN:\s*([A-Z]\d{4}[\-\s]?\d{5}[\-\s]?\d{5})',
+    r'DLN:\s*([A-Z0-9\-\s]+)\s+Ontario'
+))
+NAME_PATTERNS = PatternPack("dash.name", (
+    r'DRIVER REPORT\s*\n([A-Za-z\s\-]+?)\s*\n',
+    r'DRIVER REPORT\s*\n([A-Za-z\s\-]+)\s+DLN:',
+    r'DRIVER REPORT\s*\n([A-Za-z\s\-]+?)(?=\s*\n\s*DLN:)',
+    r'DRIVER REPORT\s*\n([A-Za-z\s\-]+?)(?=\s*\n\s*Date of Birth:)'
+))
+DATE_OF_BIRTH_PATTERN = re.compile(r'Date of Birth:\s*(\d{4}-\d{2}-\d{2})')
+REPORT_DATE_PATTERNS = PatternPack("dash.report_date", (
+    r'Report Date:\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\s+[A-Z]{3})',
+    r'Report Date:\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})',
+    r'Report Date:\s*(\d{4}-\d{2}-\d{2})'
+))
+ADDRESS_PATTERNS = PatternPack("dash.address", (
+    r'Address:\s*([^\n]+?)\s+Number of',
+    r'(\d+\s+[A-Za-z\s]+[A-Za-z]+\s+[A-Z]{2}\s+[A-Z0-9]{6})'
+))
+GENDER_PATTERN = re.compile(r'Gender:\s*(Male|Female)')
+MARITAL_STATUS_PATTERNS = PatternPack("dash.marital_status", (
+    r'Marital Status:\s*(Not married|Married|Single|Divorced|Widowed)',
+    r'Marital Status:\s*([A-Za-z\s]+?)\s+Years'
+))
+
+# Cancellation reason on a policy's status line in the summary list
+CANCELLATION_REASON_PATTERNS = PatternPack("dash.cancellation_reason", (
+    r'Cancelled[^-\n]*-\s*([^-\n]+)',
+    r'Cancelled[^-\n]*\s+([^-\n]+)',
+    r'Cancelled\s*-\s*([^-\n]+)',
+    r'Cancelled\s+([^-\n]+)'
+), re.IGNORECASE)
+
+# Summary lists on the first pages: each runs from its heading to the first end marker after it
+POLICIES_SECTION_HEADING = re.compile(r'Policies\s*\n')
+POLICIES_SECTION_END = re.compile(r'Claims|Previous Inquiries')
+POLICIES_SECTION_PATTERN = re.compile(r'Policies\s*\n(.*?)(?=Claims|Previous Inquiries)', re.DOTALL)
+CLAIMS_SECTION_HEADING = re.compile(r'Claims\s*\n')
+CLAIMS_SECTION_END = re.compile(r'Previous Inquiries|Policy #|Page')
+CLAIMS_SECTION_PATTERN = re.compile(r'Claims\s*\n(.*?)(?=Previous Inquiries|Policy #|Page)', re.DOTALL)
+
+# Lines of the claims summary list ("#1", "Date of Loss 2021-05-05", "At-Fault : 0%", "*note*")
+CLAIM_LIST_NUMBER_PATTERN = re.compile(r'#(\d+)')
+CLAIM_LIST_DATE_PATTERN = re.compile(r'Date of Loss\s+(\d{4}-\d{2}-\d{2})')
+CLAIM_LIST_AT_FAULT_PATTERN = re.compile(r'At-Fault\s*:\s*(\d+)%')
+CLAIM_LIST_NOTE_PATTERN = re.compile(r'^\*.*\*$')
+
+# Headings that start a block in the DASH text. One pass over these splits the text into
+# policy, claim and inquiry blocks (see DashSectionIndex).
+DASH_BLOCK_HEADING = re.compile(r'(Policy|Claim) #(\d+)|Page \d+|Previous Inquiries', re.IGNORECASE)
+
+# Per-claim field patterns, run only on the claim's own block
+CLAIM_DRIVER_PATTERNS = PatternPack("dash.claim_driver", (
+    r'First Party Driver Listed on Policy:\s*(Yes|No|True|False)',
+    r'First Party Driver:\s*(Yes|No|True|False)',
+    r'First Party Driver:\s*([^\n]+)',
+    r'Driver Listed on Policy:\s*(Yes|No|True|False)',
+    r'Driver:\s*(Yes|No|True|False)',
+    r'Driver:\s*([^\n]+)',
+    r'Insured Driver:\s*(Yes|No|True|False)',
+    r'Insured Driver:\s*([^\n]+)'
+), re.IGNORECASE)
+CLAIM_DRIVER_NAME_PATTERNS = PatternPack("dash.claim_driver_name", (
+    r'First Party Driver:\s*([^\n]+)',
+    r'Driver:\s*([^\n]+)',
+    r'Insured Driver:\s*([^\n]+)'
+), re.IGNORECASE)
+CLAIM_DRIVER_LISTED_PATTERNS = PatternPack("dash.claim_driver_listed", (
+    r'First Party Driver Listed on Policy:\s*(Yes|No|True|False)',
+    r'First Party Driver:\s*(Yes|No|True|False)',
+    r'Driver Listed on Policy:\s*(Yes|No|True|False)',
+    r'Driver:\s*(Yes|No|True|False)',
+    r'Insured Driver:\s*(Yes|No|True|False)'
+), re.IGNORECASE)
+CLAIM_AT_FAULT_PATTERNS = PatternPack("dash.claim_at_fault", (
+    r'First Party Driver At-Fault:\s*(Yes|No|True|False)',
+    r'First Party Driver At Fault:\s*(Yes|No|True|False)',
+    r'Driver At-Fault:\s*(Yes|No|True|False)',
+    r'Driver At Fault:\s*(Yes|No|True|False)',
+    r'At-Fault:\s*(Yes|No|True|False)',
+    r'At Fault:\s*(Yes|No|True|False)',
+    r'Fault:\s*(Yes|No|True|False)'
+), re.IGNORECASE)
+CLAIM_AT_FAULT_ENHANCED_PATTERNS = PatternPack("dash.claim_at_fault_enhanced", (
+    r'First Party Driver At-Fault:\s*(\d+%)',
+    r'First Party Driver At-Fault:\s*(Yes|No|True|False)',
+    r'First Party Driver At Fault:\s*(Yes|No|True|False)',
+    r'Driver At-Fault:\s*(Yes|No|True|False)',
+    r'Driver At Fault:\s*(Yes|No|True|False)',
+    r'At-Fault:\s*(Yes|No|True|False)',
+    # Fallback: the percentage on the claim's own heading line ("Claim #2 ... At-Fault : 100%")
+    r'At-Fault\s*:\s*(\d+%)'
+), re.IGNORECASE)
+CLAIM_TOTAL_LOSS_PATTERNS = PatternPack("dash.claim_total_loss", (
+    r'Total Loss:\s*\$?([\d,]+\.?\d*)',
+    r'Loss Amount:\s*\$?([\d,]+\.?\d*)',
+    r'Claim Amount:\s*\$?([\d,]+\.?\d*)'
+), re.IGNORECASE)
+CLAIM_STATUS_PATTERNS = PatternPack("dash.claim_status", (
+    r'Claim Status:\s*([^\n]+)',
+    r'Status:\s*([^\n]+)',
+    r'Claim State:\s*([^\n]+)'
+), re.IGNORECASE)
+
+# Detailed policy block patterns
+# The line after the heading is optional so a block with no details keeps its whole heading line
+POLICY_HEADING_PATTERN = re.compile(r'Policy #(\d+)\s+(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})\s+([^\n]+)\s+(?:.*?\n)?(.*)', re.DOTALL)
+POLICY_ID_PATTERN = re.compile(r'Policy #:\s*(\w+)')
+POLICYHOLDER_PATTERN = re.compile(r'Policyholder Name:\s*([^\n]+)')
+POLICY_VEHICLES_PATTERN = re.compile(r'Number of Private Passenger Vehicles:\s*(\d+)')
+POLICY_OPERATORS_PATTERN = re.compile(r'Number of Reported Operators:\s*(\d+)')
+
+
+
+def iter_dash_pages(path, ocr_texts=None):
+    """
+    Yield the text of each page of the DASH PDF in order; the PDF is closed once the caller stops.
+    Scanned pages are OCR'd: the first one found starts a parallel OCR of it and every later
+    scanned page. ocr_texts: optional dict, filled with {page number: OCR text} of the pages used
+    """
+    pdf_document = open_pdf(path)
+    try:
+        scanned = None
+        for page_num in range(len(pdf_document)):
+            page_text = pdf_document.load_page(page_num).get_text()
+            if needs_ocr(page_text):
+                if scanned is None:
+                    scanned = ocr_short_pages(pdf_document, start=page_num)
+                if page_num in scanned:
+                    page_text = scanned[page_num]
+                    if ocr_texts is not None:
+                        ocr_texts[page_num] = page_text
+            yield page_text
+    finally:
+        pdf_document.close()
+
+
+def read_dash_report(path, stream=True):
+    """
+    Parse a DASH PDF page by page with DashStreamParser.
+    With stream=True, reading stops once every section the result needs has closed.
+    Returns (result, text read)
+    """
+    parser = DashStreamParser()
+    track_partial(parser.result)
+    ocr_texts = {}
+    pages = iter_dash_pages(path, ocr_texts)
+    try:
+        for page_text in pages:
+            parser.feed(page_text)
+            if stream and parser.done:
+                break
+    finally:
+        pages.close()
+    parser.finish()
+    mark_ocr_pages(parser.result, ocr_texts)
+    return parser.result, parser.index.text
 
 
-def extract_dash_data(path):
-    # Open PDF with PyMuPDF
-    pdf_document = fitz.open(path)
-    text = ""
-    
-    # Extract text from all pages
-    for page_num in range(len(pdf_document)):
-        page = pdf_document.load_page(page_num)
-        text += page.get_text()
-    
-    # Close the document
-    pdf_document.close()
+def extract_dash_data(path, stream=True):
+    result, text = read_dash_report(path, stream)
 
     with open("Dash_test.txt", "w", encoding="utf-8") as f:
         f.write(text)
-    
-    result = {
-        "dln": None,
-        "name": None,
-        "date_of_birth": None,
-        "address": None,
-        "gender": None,
-        "marital_status": None,
-        "report_date": None,  # New field for Report Date
-        "policies": [],
-        "claims": [],
-        "policy_gaps": []  # New field for tracking policy gaps
-    }
+
+    # Save debug info
+    with open("dash_result.json", "w") as f:
+        json.dump(result, f, indent=4)
+
+    return result
+
+
+def _extract_dash_header(text, result):
+    """Fill the driver fields from the report header"""
 
     # DLN (Driver License Number) - handle with or without spaces/dashes
-    dln_patterns = [
-        r'DLN:\s*([A-Z]\d{4}[\-\s]?\d{5}[\-\s]?\d{5})',
-        r'DLN:\s*([A-Z0-9\-\s]+)\s+Ontario'
-    ]
-    for pattern in dln_patterns:
-        dln_match = re.search(pattern, text)
-        if dln_match:
-            result["dln"] = dln_match.group(1).strip()
-            break
+    dln_match = DLN_PATTERNS.search(text)
+    if dln_match:
+        result["dln"] = dln_match.group(1).strip()
 
     # Name - Look for the main driver name after DRIVER REPORT
-    name_patterns = [
-        r'DRIVER REPORT\s*\n([A-Za-z\s\-]+?)\s*\n',
-        r'DRIVER REPORT\s*\n([A-Za-z\s\-]+)\s+DLN:',
-        r'DRIVER REPORT\s*\n([A-Za-z\s\-]+?)(?=\s*\n\s*DLN:)',
-        r'DRIVER REPORT\s*\n([A-Za-z\s\-]+?)(?=\s*\n\s*Date of Birth:)'
-    ]
-    for pattern in name_patterns:
-        name_match = re.search(pattern, text)
-        if name_match:
-            result["name"] = name_match.group(1).strip()
-            break
+    name_match = NAME_PATTERNS.search(text)
+    if name_match:
+        result["name"] = name_match.group(1).strip()
 
     # Date of Birth
-    dob_match = re.search(r'Date of Birth:\s*(\d{4}-\d{2}-\d{2})', text)
+    dob_match = DATE_OF_BIRTH_PATTERN.search(text)
     if dob_match:
         result["date_of_birth"] = dob_match.group(1)
 
     # Report Date - extract the date the DASH report was generated
-    report_date_patterns = [
-        r'Report Date:\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\s+[A-Z]{3})',
-        r'Report Date:\s*(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})',
-        r'Report Date:\s*(\d{4}-\d{2}-\d{2})'
-    ]
-    for pattern in report_date_patterns:
-        report_date_match = re.search(pattern, text)
-        if report_date_match:
-            result["report_date"] = report_date_match.group(1)
-            break
+    report_date_match = REPORT_DATE_PATTERNS.search(text)
+    if report_date_match:
+        result["report_date"] = report_date_match.group(1)
 
     # Address - more specific pattern
-    address_patterns = [
-        r'Address:\s*([^\n]+?)\s+Number of',
-        r'(\d+\s+[A-Za-z\s]+[A-Za-z]+\s+[A-Z]{2}\s+[A-Z0-9]{6})'
-    ]
-    for pattern in address_patterns:
-        address_match = re.search(pattern, text)
-        if address_match:
-            result["address"] = address_match.group(1).strip()
-            break
+    address_match = ADDRESS_PATTERNS.search(text)
+    if address_match:
+        result["address"] = address_match.group(1).strip()
 
     # Gender
-    gender_match = re.search(r'Gender:\s*(Male|Female)', text)
+    gender_match = GENDER_PATTERN.search(text)
     if gender_match:
         result["gender"] = gender_match.group(1)
 
     # Marital Status - more specific pattern to avoid capturing following text
-    marital_patterns = [
-        r'Marital Status:\s*(Not married|Married|Single|Divorced|Widowed)',
-        r'Marital Status:\s*([A-Za-z\s]+?)\s+Years'
-    ]
-    for pattern in marital_patterns:
-        marital_match = re.search(pattern, text)
-        if marital_match:
-            result["marital_status"] = marital_match.group(1).strip()
-            break
+    marital_match = MARITAL_STATUS_PATTERNS.search(text)
+    if marital_match:
+        result["marital_status"] = marital_match.group(1).strip()
 
-    # Policies - Updated pattern to match the actual format and extract cancellation reasons
-    policies_section = re.search(r'Policies\s*\n(.*?)(?=Claims|Previous Inquiries)', text, re.DOTALL)
-    if policies_section:
-        policy_text = policies_section.group(1)
-        
-        # Split into individual policy blocks
-        policy_blocks = re.split(r'#\d+', policy_text)[1:]  # Skip the first empty element
+
+def _read_policy_list(policy_text):
+    """Policies from the summary list, with cancellation reasons"""
+    policies = []
+
+    # Split into individual policy blocks
+    policy_blocks = re.split(r'#\d+', policy_text)[1:]  # Skip the first empty element
+    
+    for i, block in enumerate(policy_blocks):
+        # Extract policy number (i+1 since we split on #)
+        policy_num = str(i + 1)
         
-        for i, block in enumerate(policy_blocks):
-            # Extract policy number (i+1 since we split on #)
-            policy_num = str(i + 1)
-            
-            # Extract dates
-            date_match = re.search(r'(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})', block)
-            if not date_match:
-                continue
-                
-            start_date = date_match.group(1)
-            end_date = date_match.group(2)
+        # Extract dates
+        date_match = re.search(r'(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})', block)
+        if not date_match:
+            continue
             
-            # Extract company name (everything between dates and status/cancellation)
-            lines = block.split('\n')
-            company_lines = []
-            status = "Active"  # Default status
-            cancellation_reason = None
-            
-            # Find the company name and status
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('*'):
-                    continue
-                    
-                # Check if this line contains a status
-                if any(status_word in line for status_word in ['Active', 'Inactive', 'Expired', 'Cancelled']):
-                    status = line
-                    # Check if cancellation reason is on the same line
-                    if 'Cancelled' in line:
-                        reason_patterns = [
-                            r'Cancelled[^-\n]*-\s*([^-\n]+)',
-                            r'Cancelled[^-\n]*\s+([^-\n]+)',
-                            r'Cancelled\s*-\s*([^-\n]+)',
-                            r'Cancelled\s+([^-\n]+)'
-                        ]
-                        
-                        for reason_pattern in reason_patterns:
-                            reason_match = re.search(reason_pattern, line, re.IGNORECASE)
-                            if reason_match:
-                                cancellation_reason = reason_match.group(1).strip()
-                                break
-                elif not re.match(r'^\d{4}-\d{2}-\d{2}', line):  # Not a date line
-                    company_lines.append(line)
-            
-            # Clean company name
-            company_clean = ' '.join(company_lines).strip()
-            company_clean = re.sub(r'\s*\*[^*]*\*\s*', '', company_clean).strip()
-            
-            # If no cancellation reason found in status line, check the next line
-            if 'Cancelled' in status and not cancellation_reason:
-                # Look for cancellation reason on the next line
-                block_lines = block.split('\n')
-                for j, line in enumerate(block_lines):
-                    if 'Cancelled' in line:
-                        # Check next line for reason
-                        if j + 1 < len(block_lines):
-                            next_line = block_lines[j + 1].strip()
-                            if next_line and not next_line.startswith('*'):
-                                cancellation_reason = next_line
-                                break
-                
-                # If still no reason found, use "Cancelled"
-                if not cancellation_reason:
-                    cancellation_reason = "Cancelled"
-            
-            result["policies"].append({
-                "policy_number": policy_num,
-                "start_date": start_date,
-                "end_date": end_date,
-                "company": company_clean,
-                "status": status.strip(),
-                "cancellation_reason": cancellation_reason
-            })
-        
-        # Detect policy gaps
-        result["policy_gaps"] = _detect_policy_gaps(result["policies"])
-
-    # Claims - Enhanced pattern with additional fields
-    claims_section = re.search(r'Claims\s*\n(.*?)(?=Previous Inquiries|Policy #|Page)', text, re.DOTALL)
-    if claims_section:
-        claims_text = claims_section.group(1)
-        
-        # Parse claims using a more robust approach
-        lines = claims_text.split('\n')
-        current_claim = None
-        current_company_lines = []
+        start_date = date_match.group(1)
+        end_date = date_match.group(2)
+        
+        # Extract company name (everything between dates and status/cancellation)
+        lines = block.split('\n')
+        company_lines = []
+        status = "Active"  # Default status
+        cancellation_reason = None
         
+        # Find the company name and status
         for line in lines:
             line = line.strip()
-            
-            # Check for claim number
-            claim_match = re.match(r'#(\d+)', line)
-            if claim_match:
-                # Save previous claim if exists
-                if current_claim:
-                    current_claim['company'] = ' '.join(current_company_lines).strip()
-                    result["claims"].append(current_claim)
-                
-                # Start new claim
-                claim_num = claim_match.group(1)
-                current_claim = {
-                    "claim_number": claim_num,
-                    "date": None,
-                    "company": None,
-                    "at_fault_percentage": None
-                }
-                current_company_lines = []
-                continue
-            
-            # Check for date
-            date_match = re.search(r'Date of Loss\s+(\d{4}-\d{2}-\d{2})', line)
-            if date_match and current_claim:
-                current_claim['date'] = date_match.group(1)
-                continue
-            
-            # Check for At-Fault percentage
-            at_fault_match = re.search(r'At-Fault\s*:\s*(\d+)%', line)
-            if at_fault_match and current_claim:
-                current_claim['at_fault_percentage'] = int(at_fault_match.group(1))
+            if not line or line.startswith('*'):
                 continue
+                
+            # Check if this line contains a status
+            if any(status_word in line for status_word in ['Active', 'Inactive', 'Expired', 'Cancelled']):
+                status = line
+                # Check if cancellation reason is on the same line
+                if 'Cancelled' in line:
+                    reason_match = CANCELLATION_REASON_PATTERNS.search(line)
+                    if reason_match:
+                        cancellation_reason = reason_match.group(1).strip()
+            elif not re.match(r'^\d{4}-\d{2}-\d{2}', line):  # Not a date line
+                company_lines.append(line)
+        
+        # Clean company name
+        company_clean = ' '.join(company_lines).strip()
+        company_clean = re.sub(r'\s*\*[^*]*\*\s*', '', company_clean).strip()
+        
+        # If no cancellation reason found in status line, check the next line
+        if 'Cancelled' in status and not cancellation_reason:
+            # Look for cancellation reason on the next line
+            block_lines = block.split('\n')
+            for j, line in enumerate(block_lines):
+                if 'Cancelled' in line:
+                    # Check next line for reason
+                    if j + 1 < len(block_lines):
+                        next_line = block_lines[j + 1].strip()
+                        if next_line and not next_line.startswith('*'):
+                            cancellation_reason = next_line
+                            break
             
-            # If line is not empty and doesn't match special patterns, it's part of company name
-            if line and not re.match(r'^\*.*\*$', line) and current_claim and current_claim['date'] and not current_claim['at_fault_percentage']:
-                current_company_lines.append(line)
-        
-        # Don't forget the last claim
-        if current_claim:
-            current_claim['company'] = ' '.join(current_company_lines).strip()
-            result["claims"].append(current_claim)
-        
-        # Extract additional details for all claims
-        for claim_data in result["claims"]:
-            claim_details = _extract_claim_details_enhanced(text, claim_data["claim_number"])
-            claim_data.update(claim_details)
+            # If still no reason found, use "Cancelled"
+            if not cancellation_reason:
+                cancellation_reason = "Cancelled"
+        
+        policies.append({
+            "policy_number": policy_num,
+            "start_date": start_date,
+            "end_date": end_date,
+            "company": company_clean,
+            "status": status.strip(),
+            "cancellation_reason": cancellation_reason
+        })
+
+    return policies
+
+
+def _read_claim_list(claims_text):
+    """Claims from the summary list: number, date of loss, company and at-fault percentage"""
+    claims = []
+    
+    # Parse claims using a more robust approach
+    lines = claims_text.split('\n')
+    current_claim = None
+    current_company_lines = []
+    
+    for line in lines:
+        line = line.strip()
+        
+        # Check for claim number
+        claim_match = CLAIM_LIST_NUMBER_PATTERN.match(line)
+        if claim_match:
+            # Save previous claim if exists
+            if current_claim:
+                current_claim['company'] = ' '.join(current_company_lines).strip()
+                claims.append(current_claim)
             
-            # Ensure we have the required fields with default values if not found
-            if not claim_data.get('first_party_driver'):
-                claim_data['first_party_driver'] = 'N/A'
-            if not claim_data.get('first_party_driver_at_fault'):
-                claim_data['first_party_driver_at_fault'] = 'N/A'
-            if not claim_data.get('total_loss'):
-                claim_data['total_loss'] = 'N/A'
-            if not claim_data.get('claim_status'):
-                claim_data['claim_status'] = 'N/A'
-
-    # Additional extraction for detailed policy information if needed
-    _extract_detailed_policies(text, result)
-    
-    # Detect policy gaps after all policies are extracted
-    result["policy_gaps"] = _detect_policy_gaps(result["policies"])
+            # Start new claim
+            claim_num = claim_match.group(1)
+            current_claim = {
+                "claim_number": claim_num,
+                "date": None,
+                "company": None,
+                "at_fault_percentage": None
+            }
+            current_company_lines = []
+            continue
+        
+        # Check for date
+        date_match = CLAIM_LIST_DATE_PATTERN.search(line)
+        if date_match and current_claim:
+            current_claim['date'] = date_match.group(1)
+            continue
+        
+        # Check for At-Fault percentage
+        at_fault_match = CLAIM_LIST_AT_FAULT_PATTERN.search(line)
+        if at_fault_match and current_claim:
+            current_claim['at_fault_percentage'] = int(at_fault_match.group(1))
+            continue
+        
+        # If line is not empty and doesn't match special patterns, it's part of company name
+        if line and not CLAIM_LIST_NOTE_PATTERN.match(line) and current_claim and current_claim['date'] and not current_claim['at_fault_percentage']:
+            current_company_lines.append(line)
     
-    # Save debug info
-    with open("dash_result.json", "w") as f:
-        json.dump(result, f, indent=4)
+    # Don't forget the last claim
+    if current_claim:
+        current_claim['company'] = ' '.join(current_company_lines).strip()
+        claims.append(current_claim)
 
-    return result
+    return claims
 
 
-def _detect_policy_gaps(policies):
+def _apply_claim_details(claim_data, claim_details):
+    """Merge the details read from a claim's block, with default values for anything not found"""
+    claim_data.update(claim_details)
+    
+    # Ensure we have the required fields with default values if not found
+    if not claim_data.get('first_party_driver'):
+        claim_data['first_party_driver'] = 'N/A'
+    if not claim_data.get('first_party_driver_at_fault'):
+        claim_data['first_party_driver_at_fault'] = 'N/A'
+    if not claim_data.get('total_loss'):
+        claim_data['total_loss'] = 'N/A'
+    if not claim_data.get('claim_status'):
+        claim_data['claim_status'] = 'N/A'
+
+
+class DashSectionIndex:
     """
-    Detect gaps between policy end dates and next policy start dates
+    Offsets of the policy, claim and inquiry blocks in the DASH text, found in a single pass.
+    Policy and claim blocks are keyed by their exact number, so claim "1" never reads "Claim #12".
+      policies / claims: {number: (start, end)} for the first block with that number
+      policy_blocks: [(number, start, end)] for every "Policy #n" block in document order
+      inquiries: [(start, end)] after each "Previous Inquiries" heading
+    A claim block runs to the next claim, page or inquiries heading; a policy block to the next
+    policy, claim or page heading; an inquiries block to the next heading of any kind.
+    The index can also be built a page at a time with extend(); a block is recorded once the
+    heading that ends it has been read, and close() ends the blocks still open.
+    """
+
+    def __init__(self, text=None):
+        self.policies = {}
+        self.policy_blocks = []
+        self.claims = {}
+        self.inquiries = []
+        self._chunks = []
+        self._length = 0
+        self._unscanned = ""
+        self._open_claim = None
+        self._open_policy = None
+        self._open_inquiry = None
+
+        if text is not None:
+            self.extend(text)
+            self.close()
+
+    @property
+    def text(self):
+        """Text read so far"""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @property
+    def has_open_block(self):
+        """
+        True while a policy or claim block is still waiting for the heading that ends it,
+        or the last line read is unfinished and may yet turn out to be a heading
+        """
+        return self._open_claim is not None or self._open_policy is not None or bool(self._unscanned)
+
+    def extend(self, text):
+        """Append the next page of text and record the blocks its headings end"""
+        self._chunks.append(text)
+        base = self._length - len(self._unscanned)
+        self._length += len(text)
+
+        # Headings never span lines, so scan to the last complete line and keep the rest for the next page
+        pending = self._unscanned + text
+        complete = pending.rfind("\n") + 1
+        self._scan(pending, base, complete)
+        self._unscanned = pending[complete:]
+
+    def close(self):
+        """End every block still open at the end of the text read so far"""
+        self._scan(self._unscanned, self._length - len(self._unscanned), len(self._unscanned))
+        self._unscanned = ""
+        self._end_claim(self._length)
+        self._end_policy(self._length)
+        self._end_inquiry(self._length)
+
+    def claim_block(self, claim_number):
+        """Text of the detail block for claim_number, or None if the claim has none"""
+        offsets = self.claims.get(str(claim_number))
+        return self.text[offsets[0]:offsets[1]] if offsets else None
+
+    def _scan(self, text, base, end):
+        for heading in DASH_BLOCK_HEADING.finditer(text, 0, end):
+            kind = (heading.group(1) or "").lower()
+            label = heading.group(0).lower()
+            start = base + heading.start()
+
+            if kind != "policy":
+                self._end_claim(start)
+            if kind == "policy" or kind == "claim" or label.startswith("page"):
+                self._end_policy(start)
+            self._end_inquiry(start)
+
+            if kind == "claim":
+                self._open_claim = (heading.group(2), start)
+            elif heading.group(1) == "Policy":
+                self._open_policy = (heading.group(2), start)
+            elif kind == "" and label.startswith("previous"):
+                self._open_inquiry = base + heading.end()
+
+    def _end_claim(self, end):
+        if self._open_claim is not None:
+            number, start = self._open_claim
+            self.claims.setdefault(number, (start, end))
+            self._open_claim = None
+
+    def _end_policy(self, end):
+        if self._open_policy is not None:
+            number, start = self._open_policy
+            self.policy_blocks.append((number, start, end))
+            self.policies.setdefault(number, (start, end))
+            self._open_policy = None
+
+    def _end_inquiry(self, end):
+        if self._open_inquiry is not None:
+            self.inquiries.append((self._open_inquiry, end))
+            self._open_inquiry = None
+
+
+class _SummarySection:
+    """
+    Incremental search for a summary list (Policies or Claims) whose end marker may only
+    arrive on a later page. Equivalent to section_pattern.search over the final text, but each
+    page only rescans the unfinished last line instead of everything read so far.
+    """
+
+    def __init__(self, heading_pattern, end_pattern, section_pattern):
+        self.heading_pattern = heading_pattern
+        self.end_pattern = end_pattern
+        self.section_pattern = section_pattern
+        self.start = None
+        self.search_from = 0
+        self.match = None
+
+    def update(self, text):
+        """Return the section match once its end marker has been read, else None"""
+        if self.match is not None:
+            return self.match
+
+        if self.start is None:
+            heading = self.heading_pattern.search(text, self.search_from)
+            if not heading:
+                # A heading can still complete only if it starts on the unfinished last line
+                self.search_from = text.rfind("\n") + 1
+                return None
+            self.start = heading.start()
+            self.search_from = heading.end()
+
+        if not self.end_pattern.search(text, self.search_from):
+            self.search_from = max(self.search_from, text.rfind("\n") + 1)
+            return None
+
+        self.match = self.section_pattern.search(text, self.start)
+        return self.match
+
+
+class DashStreamParser:
+    """
+    Page-at-a-time DASH parser. feed() takes each page's text in order and returns the policy
+    and claim records completed by that page: a listed claim once its detail block has closed,
+    a policy once its "Policy #n" block has been read. done turns True once both summary lists
+    and the detail block of every listed policy and claim have closed, so the caller can stop
+    reading; the rest of a long report is Previous Inquiries and boilerplate.
+    finish() completes the records still open and fills the header and policy gaps.
     """
-    gaps = []
-    
-    if len(policies) < 2:
-        return gaps
-    
-    # Sort policies by start date (oldest first)
-    sorted_policies = sorted(policies, key=lambda x: x.get("start_date", ""))
-    
-    for i in range(len(sorted_policies) - 1):
-        current_policy = sorted_policies[i]
-        next_policy = sorted_policies[i + 1]
-        
-        current_end = current_policy.get("end_date")
-        next_start = next_policy.get("start_date")
-        
-        if current_end and next_start:
-            try:
-                # Parse dates
-                from datetime import datetime
-                end_date = datetime.strptime(current_end, "%Y-%m-%d")
-                start_date = datetime.strptime(next_start, "%Y-%m-%d")
-                
-                # Check for gap (more than 1 day difference)
-                gap_days = (start_date - end_date).days
-                if gap_days > 1:
-                    gap_info = {
-                        "gap_days": gap_days,
-                        "previous_policy_end": current_end,
-                        "next_policy_start": next_start,
-                        "previous_policy_company": current_policy.get("company"),
-                        "next_policy_company": next_policy.get("company"),
-                        "cancellation_reason": current_policy.get("cancellation_reason")
-                    }
-                    gaps.append(gap_info)
-            except ValueError:
-                # Skip if date parsing fails
-                continue
-    
-    return gaps
+
+    def __init__(self):
+        self.index = DashSectionIndex()
+        self.pages_read = 0
+        self.result = {
+            "dln": None,
+            "name": None,
+            "date_of_birth": None,
+            "address": None,
+            "gender": None,
+            "marital_status": None,
+            "report_date": None,  # New field for Report Date
+            "policies": [],
+            "claims": [],
+            "policy_gaps": [],  # New field for tracking policy gaps
+            "policy_overlaps": [],
+            "insurance_coverage": None
+        }
+        self._policy_list = _SummarySection(POLICIES_SECTION_HEADING, POLICIES_SECTION_END, POLICIES_SECTION_PATTERN)
+        self._claim_list = _SummarySection(CLAIMS_SECTION_HEADING, CLAIMS_SECTION_END, CLAIMS_SECTION_PATTERN)
+        self._policies_listed = False
+        self._claims_listed = False
+        self._policy_blocks_read = 0
+        self._pending_claims = []
+        self._finished = False
+
+    @property
+    def done(self):
+        """True once nothing the result needs can appear on a later page"""
+        if not (self._policies_listed and self._claims_listed) or self.index.has_open_block:
+            return False
+        if self._pending_claims:
+            return False
+        if not self.result["policies"] and not self.result["claims"]:
+            # Empty summary lists give nothing to wait for, so any detail blocks could still follow
+            return False
+        return all(policy["policy_number"] in self.index.policies for policy in self.result["policies"])
+
+    def feed(self, page_text):
+        """Read the next page; returns [("policy" | "claim", record)] completed by it"""
+        self.index.extend(page_text)
+        self.pages_read += 1
+        return self._advance()
+
+    def finish(self):
+        """End the text at what has been read and complete every remaining record"""
+        if self._finished:
+            return []
+        self._finished = True
+        self.index.close()
+        self._policies_listed = self._claims_listed = True
+        completed = self._advance()
+
+        # Claims without a detail block of their own
+        for claim_data in self._pending_claims:
+            _apply_claim_details(claim_data, {})
+            completed.append(("claim", claim_data))
+        self._pending_claims = []
+
+        _extract_dash_header(self.index.text, self.result)
+        
+        # Detect policy gaps, overlaps and continuous coverage after all policies are extracted
+        self.result.update(analyze_policy_history(self.result["policies"]))
+        return completed
+
+    def _advance(self):
+        completed = []
+
+        if not self._policies_listed or not self._claims_listed:
+            text = self.index.text
+            if not self._policies_listed:
+                policies_section = self._policy_list.update(text)
+                if policies_section:
+                    self.result["policies"] = _read_policy_list(policies_section.group(1))
+                    self._policies_listed = True
+            if not self._claims_listed:
+                claims_section = self._claim_list.update(text)
+                if claims_section:
+                    self.result["claims"] = _read_claim_list(claims_section.group(1))
+                    self._pending_claims = list(self.result["claims"])
+                    self._claims_listed = True
+
+        # Detailed policy blocks, once the listed policies they add to are known
+        if self._policies_listed and self._policy_blocks_read < len(self.index.policy_blocks):
+            text = self.index.text
+            for _, start, end in self.index.policy_blocks[self._policy_blocks_read:]:
+                policy = _apply_policy_block(text, self.result, start, end)
+                if policy is not None:
+                    completed.append(("policy", policy))
+            self._policy_blocks_read = len(self.index.policy_blocks)
+
+        # Claim details from each listed claim's own block
+        if self._pending_claims:
+            pending = []
+            for claim_data in self._pending_claims:
+                if claim_data["claim_number"] in self.index.claims:
+                    _apply_claim_details(claim_data, _extract_claim_details_enhanced(self.index.text, claim_data["claim_number"], self.index))
+                    completed.append(("claim", claim_data))
+                else:
+                    pending.append(claim_data)
+            self._pending_claims = pending
+
+        return completed
 
 
-def _extract_claim_details(text, claim_number):
+def _extract_claim_details(text, claim_number, index=None):
     """
     Extract additional claim details for a specific claim number.
     
     Args:
         text (str): Full text from the PDF
         claim_number (str): The claim number to search for
+        index (DashSectionIndex): Optional index of the text's blocks, built if not given
         
     Returns:
         dict: Dictionary with additional claim details
@@ -325,292 +637,163 @@ def _extract_claim_details(text, claim_number):
     details = {}
     
     # Look for the specific claim section
-    claim_section_pattern = rf'Claim #{claim_number}.*?(?=Claim #\d+|Page \d+|$)'
-    claim_section_match = re.search(claim_section_pattern, text, re.DOTALL | re.IGNORECASE)
+    if index is None:
+        index = DashSectionIndex(text)
+    claim_section = index.claim_block(claim_number)
     
-    if claim_section_match:
-        claim_section = claim_section_match.group(0)
-        
+    if claim_section:
         # Extract First Party Driver - Enhanced patterns
-        driver_patterns = [
-            r'First Party Driver Listed on Policy:\s*(Yes|No|True|False)',
-            r'First Party Driver:\s*(Yes|No|True|False)',
-            r'First Party Driver:\s*([^\n]+)',
-            r'Driver Listed on Policy:\s*(Yes|No|True|False)',
-            r'Driver:\s*(Yes|No|True|False)',
-            r'Driver:\s*([^\n]+)',
-            r'Insured Driver:\s*(Yes|No|True|False)',
-            r'Insured Driver:\s*([^\n]+)'
-        ]
-        for pattern in driver_patterns:
-            driver_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if driver_match:
-                details['first_party_driver'] = driver_match.group(1).strip()
-                break
+        driver_match = CLAIM_DRIVER_PATTERNS.search(claim_section)
+        if driver_match:
+            details['first_party_driver'] = driver_match.group(1).strip()
         
         # Extract First Party Driver At-Fault - Enhanced patterns
-        at_fault_patterns = [
-            r'First Party Driver At-Fault:\s*(Yes|No|True|False)',
-            r'First Party Driver At Fault:\s*(Yes|No|True|False)',
-            r'Driver At-Fault:\s*(Yes|No|True|False)',
-            r'Driver At Fault:\s*(Yes|No|True|False)',
-            r'At-Fault:\s*(Yes|No|True|False)',
-            r'At Fault:\s*(Yes|No|True|False)',
-            r'Fault:\s*(Yes|No|True|False)'
-        ]
-        for pattern in at_fault_patterns:
-            at_fault_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if at_fault_match:
-                details['first_party_driver_at_fault'] = at_fault_match.group(1).strip()
-                break
+        at_fault_match = CLAIM_AT_FAULT_PATTERNS.search(claim_section)
+        if at_fault_match:
+            details['first_party_driver_at_fault'] = at_fault_match.group(1).strip()
         
         # Extract Total Loss
-        total_loss_patterns = [
-            r'Total Loss:\s*\$?([\d,]+\.?\d*)',
-            r'Loss Amount:\s*\$?([\d,]+\.?\d*)',
-            r'Claim Amount:\s*\$?([\d,]+\.?\d*)'
-        ]
-        for pattern in total_loss_patterns:
-            total_loss_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if total_loss_match:
-                details['total_loss'] = total_loss_match.group(1).replace(',', '')
-                break
+        total_loss_match = CLAIM_TOTAL_LOSS_PATTERNS.search(claim_section)
+        if total_loss_match:
+            details['total_loss'] = total_loss_match.group(1).replace(',', '')
         
         # Extract Claim Status
-        status_patterns = [
-            r'Claim Status:\s*([^\n]+)',
-            r'Status:\s*([^\n]+)',
-            r'Claim State:\s*([^\n]+)'
-        ]
-        for pattern in status_patterns:
-            status_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if status_match:
-                details['claim_status'] = status_match.group(1).strip()
-                break
+        status_match = CLAIM_STATUS_PATTERNS.search(claim_section)
+        if status_match:
+            details['claim_status'] = status_match.group(1).strip()
     
     return details
 
 
-def _extract_claim_details_enhanced(text, claim_number):
+def _extract_claim_details_enhanced(text, claim_number, index=None):
     """
-    Enhanced extraction of claim details that searches the entire document.
+    Enhanced extraction of claim details from the claim's own detail block.
     
     Args:
         text (str): Full text from the PDF
         claim_number (str): The claim number to search for
+        index (DashSectionIndex): Optional index of the text's blocks, built if not given
         
     Returns:
         dict: Dictionary with additional claim details
     """
     details = {}
     
-    # Look for the specific claim section with more comprehensive patterns
-    claim_section_pattern = rf'Claim #{claim_number}.*?(?=Claim #\d+|Page \d+|$)'
-    claim_section_match = re.search(claim_section_pattern, text, re.DOTALL | re.IGNORECASE)
+    # Look for the specific claim section, keyed by its exact number
+    if index is None:
+        index = DashSectionIndex(text)
+    claim_section = index.claim_block(claim_number)
     
-    if claim_section_match:
-        claim_section = claim_section_match.group(0)
-        
+    if claim_section:
         # Extract First Party Driver - Enhanced patterns based on actual PDF content
         # Priority: First Party Driver name, then fallback to Listed on Policy status
-        driver_name_patterns = [
-            rf'First Party Driver:\s*([^\n]+)',
-            rf'Driver:\s*([^\n]+)',
-            rf'Insured Driver:\s*([^\n]+)'
-        ]
         
         # First try to get the actual driver name
         driver_name_found = False
-        for pattern in driver_name_patterns:
-            driver_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if driver_match:
-                driver_value = driver_match.group(1).strip()
-                # If it's a name (not Yes/No/True/False), use it
-                if driver_value and driver_value not in ['Yes', 'No', 'True', 'False', 'Not available']:
-                    details['first_party_driver'] = driver_value
-                    driver_name_found = True
-                    break
+        for _, driver_match in CLAIM_DRIVER_NAME_PATTERNS.matches(claim_section):
+            driver_value = driver_match.group(1).strip()
+            # If it's a name (not Yes/No/True/False), use it
+            if driver_value and driver_value not in ['Yes', 'No', 'True', 'False', 'Not available']:
+                details['first_party_driver'] = driver_value
+                driver_name_found = True
+                break
         
         # If no driver name found, fallback to Listed on Policy status
         if not driver_name_found:
-            listed_patterns = [
-                rf'First Party Driver Listed on Policy:\s*(Yes|No|True|False)',
-                rf'First Party Driver:\s*(Yes|No|True|False)',
-                rf'Driver Listed on Policy:\s*(Yes|No|True|False)',
-                rf'Driver:\s*(Yes|No|True|False)',
-                rf'Insured Driver:\s*(Yes|No|True|False)'
-            ]
-            
-            for pattern in listed_patterns:
-                listed_match = re.search(pattern, claim_section, re.IGNORECASE)
-                if listed_match:
-                    details['first_party_driver'] = listed_match.group(1).strip()
-                    break
-        
-        # Extract First Party Driver At-Fault - Enhanced patterns
-        at_fault_patterns = [
-            rf'First Party Driver At-Fault:\s*(\d+%)',
-            rf'First Party Driver At-Fault:\s*(Yes|No|True|False)',
-            rf'First Party Driver At Fault:\s*(Yes|No|True|False)',
-            rf'Driver At-Fault:\s*(Yes|No|True|False)',
-            rf'Driver At Fault:\s*(Yes|No|True|False)',
-            rf'At-Fault:\s*(Yes|No|True|False)'
-        ]
-        
-        for pattern in at_fault_patterns:
-            at_fault_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if at_fault_match:
-                at_fault_value = at_fault_match.group(1).strip()
-                # Convert percentage to Yes/No
-                if '%' in at_fault_value:
-                    percentage = int(at_fault_value.replace('%', ''))
-                    details['first_party_driver_at_fault'] = 'Yes' if percentage > 0 else 'No'
-                else:
-                    details['first_party_driver_at_fault'] = at_fault_value
-                break
+            listed_match = CLAIM_DRIVER_LISTED_PATTERNS.search(claim_section)
+            if listed_match:
+                details['first_party_driver'] = listed_match.group(1).strip()
+        
+        # Extract First Party Driver At-Fault - Enhanced patterns, then the claim heading's percentage
+        at_fault_match = CLAIM_AT_FAULT_ENHANCED_PATTERNS.search(claim_section)
+        
+        if at_fault_match:
+            at_fault_value = at_fault_match.group(1).strip()
+            # Convert percentage to Yes/No
+            if '%' in at_fault_value:
+                percentage = int(at_fault_value.replace('%', ''))
+                details['first_party_driver_at_fault'] = 'Yes' if percentage > 0 else 'No'
+            else:
+                details['first_party_driver_at_fault'] = at_fault_value
         
         # Extract Total Loss
-        total_loss_patterns = [
-            rf'Total Loss:\s*\$?([\d,]+\.?\d*)',
-            rf'Loss Amount:\s*\$?([\d,]+\.?\d*)',
-            rf'Claim Amount:\s*\$?([\d,]+\.?\d*)'
-        ]
-        
-        for pattern in total_loss_patterns:
-            total_loss_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if total_loss_match:
-                details['total_loss'] = total_loss_match.group(1).replace(',', '')
-                break
+        total_loss_match = CLAIM_TOTAL_LOSS_PATTERNS.search(claim_section)
+        if total_loss_match:
+            details['total_loss'] = total_loss_match.group(1).replace(',', '')
         
         # Extract Claim Status
-        status_patterns = [
-            rf'Claim Status:\s*([^\n]+)',
-            rf'Status:\s*([^\n]+)',
-            rf'Claim State:\s*([^\n]+)'
-        ]
-        
-        for pattern in status_patterns:
-            status_match = re.search(pattern, claim_section, re.IGNORECASE)
-            if status_match:
-                details['claim_status'] = status_match.group(1).strip()
-                break
-    
-    # If we still don't have the required fields, search the entire document
-    if not details.get('first_party_driver'):
-        # Search for First Party Driver in the entire document - prioritize driver name
-        driver_name_patterns = [
-            rf'Claim #{claim_number}.*?First Party Driver:\s*([^\n]+)',
-            rf'First Party Driver:\s*([^\n]+).*?Claim #{claim_number}',
-            rf'Claim #{claim_number}.*?Driver:\s*([^\n]+)',
-            rf'Driver:\s*([^\n]+).*?Claim #{claim_number}'
-        ]
-        
-        # First try to get the actual driver name
-        driver_name_found = False
-        for pattern in driver_name_patterns:
-            driver_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if driver_match:
-                driver_value = driver_match.group(1).strip()
-                # If it's a name (not Yes/No/True/False), use it
-                if driver_value and driver_value not in ['Yes', 'No', 'True', 'False', 'Not available']:
-                    details['first_party_driver'] = driver_value
-                    driver_name_found = True
-                    break
-        
-        # If no driver name found, fallback to Listed on Policy status
-        if not driver_name_found:
-            listed_patterns = [
-                rf'Claim #{claim_number}.*?First Party Driver Listed on Policy:\s*(Yes|No|True|False)',
-                rf'Claim #{claim_number}.*?First Party Driver:\s*(Yes|No|True|False)',
-                rf'First Party Driver Listed on Policy:\s*(Yes|No|True|False).*?Claim #{claim_number}',
-                rf'First Party Driver:\s*(Yes|No|True|False).*?Claim #{claim_number}'
-            ]
-            
-            for pattern in listed_patterns:
-                driver_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-                if driver_match:
-                    details['first_party_driver'] = driver_match.group(1).strip()
-                    break
-    
-    # Similar enhanced search for At-Fault
-    if not details.get('first_party_driver_at_fault'):
-        at_fault_patterns = [
-            rf'Claim #{claim_number}.*?First Party Driver At-Fault:\s*(\d+%)',
-            rf'Claim #{claim_number}.*?First Party Driver At-Fault:\s*(Yes|No|True|False)',
-            rf'Claim #{claim_number}.*?At-Fault:\s*(Yes|No|True|False)',
-            rf'First Party Driver At-Fault:\s*(\d+%).*?Claim #{claim_number}',
-            rf'First Party Driver At-Fault:\s*(Yes|No|True|False).*?Claim #{claim_number}',
-            rf'At-Fault:\s*(Yes|No|True|False).*?Claim #{claim_number}'
-        ]
-        
-        for pattern in at_fault_patterns:
-            at_fault_match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if at_fault_match:
-                at_fault_value = at_fault_match.group(1).strip()
-                # Convert percentage to Yes/No
-                if '%' in at_fault_value:
-                    percentage = int(at_fault_value.replace('%', ''))
-                    details['first_party_driver_at_fault'] = 'Yes' if percentage > 0 else 'No'
-                else:
-                    details['first_party_driver_at_fault'] = at_fault_value
-                break
+        status_match = CLAIM_STATUS_PATTERNS.search(claim_section)
+        if status_match:
+            details['claim_status'] = status_match.group(1).strip()
     
     return details
 
 
-def _extract_detailed_policies(text, result):
+def _extract_detailed_policies(text, result, index=None):
     """Extract detailed policy information from the detailed sections"""
     
     # Look for detailed policy sections (Policy #1, Policy #2, etc.)
-    detailed_policy_sections = re.findall(
-        r'Policy #(\d+)\s+(\d{4}-\d{2}-\d{2})\s+to\s+(\d{4}-\d{2}-\d{2})\s+([^\n]+)\s+.*?\n(.*?)(?=Policy #\d+|Claim #\d+|Page \d+|$)', 
-        text, 
-        re.DOTALL
-    )
+    if index is None:
+        index = DashSectionIndex(text)
     
-    for policy_num, start_date, end_date, company, policy_details in detailed_policy_sections:
-        # Find if this policy already exists in our results
-        existing_policy = None
-        for policy in result["policies"]:
-            if policy.get("policy_number") == policy_num:
-                existing_policy = policy
-                break
-        
-        if existing_policy:
-            # Extract additional details
-            policy_number_match = re.search(r'Policy #:\s*(\w+)', policy_details)
-            if policy_number_match:
-                existing_policy["policy_id"] = policy_number_match.group(1)
-            
-            # Extract policyholder info
-            policyholder_match = re.search(r'Policyholder Name:\s*([^\n]+)', policy_details)
-            if policyholder_match:
-                existing_policy["policyholder"] = policyholder_match.group(1).strip()
-            
-            # Extract number of vehicles and operators
-            vehicles_match = re.search(r'Number of Private Passenger Vehicles:\s*(\d+)', policy_details)
-            if vehicles_match:
-                existing_policy["num_vehicles"] = int(vehicles_match.group(1))
-            
-            operators_match = re.search(r'Number of Reported Operators:\s*(\d+)', policy_details)
-            if operators_match:
-                existing_policy["num_operators"] = int(operators_match.group(1))
-        else:
-            # Create new detailed policy entry if it wasn't found in the basic list
-            policy_info = {
-                "policy_number": policy_num,
-                "start_date": start_date,
-                "end_date": end_date,
-                "company": company.strip(),
-                "status": "Active"  # Default, could be improved
-            }
-            
-            # Extract additional details
-            policy_number_match = re.search(r'Policy #:\s*(\w+)', policy_details)
-            if policy_number_match:
-                policy_info["policy_id"] = policy_number_match.group(1)
-            
-            result["policies"].append(policy_info)
+    for _, start, end in index.policy_blocks:
+        _apply_policy_block(text, result, start, end)
+
+
+def _apply_policy_block(text, result, start, end):
+    """
+    Add the details of the "Policy #n" block at text[start:end] to its listed policy,
+    or append it as a new policy. Returns the policy updated, or None if the block has no heading.
+    """
+    policy_match = POLICY_HEADING_PATTERN.match(text, start, end)
+    if not policy_match:
+        return None
+    policy_num, start_date, end_date, company, policy_details = policy_match.groups()
+    
+    # Find if this policy already exists in our results
+    existing_policy = None
+    for policy in result["policies"]:
+        if policy.get("policy_number") == policy_num:
+            existing_policy = policy
+            break
+    
+    if existing_policy:
+        # Extract additional details
+        policy_number_match = POLICY_ID_PATTERN.search(policy_details)
+        if policy_number_match:
+            existing_policy["policy_id"] = policy_number_match.group(1)
+        
+        # Extract policyholder info
+        policyholder_match = POLICYHOLDER_PATTERN.search(policy_details)
+        if policyholder_match:
+            existing_policy["policyholder"] = policyholder_match.group(1).strip()
+        
+        # Extract number of vehicles and operators
+        vehicles_match = POLICY_VEHICLES_PATTERN.search(policy_details)
+        if vehicles_match:
+            existing_policy["num_vehicles"] = int(vehicles_match.group(1))
+        
+        operators_match = POLICY_OPERATORS_PATTERN.search(policy_details)
+        if operators_match:
+            existing_policy["num_operators"] = int(operators_match.group(1))
+        return existing_policy
+
+    # Create new detailed policy entry if it wasn't found in the basic list
+    policy_info = {
+        "policy_number": policy_num,
+        "start_date": start_date,
+        "end_date": end_date,
+        "company": company.strip(),
+        "status": "Active"  # Default, could be improved
+    }
+    
+    # Extract additional details
+    policy_number_match = POLICY_ID_PATTERN.search(policy_details)
+    if policy_number_match:
+        policy_info["policy_id"] = policy_number_match.group(1)
+    
+    result["policies"].append(policy_info)
+    return policy_info
 
 
 def extract_detailed_claims(text):
@@ -780,4 +963,4 @@ def extract_and_save_claim_fields(json_file_path='dash_result.json'):
         return None
     except Exception as e:
         print(f"Error: {str(e)}")
-        return None
\ No newline at end of file
+        return None
@@ -9,7 +9,7 @@ import os
 import json
 import base64
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 import google.generativeai as genai
 from dotenv import load_dotenv
 
@@ -64,18 +64,23 @@ class GeminiApplicationExtractor:
         except Exception as e:
             print(f"⚠️  Warning: Could not clean up previous images: {e}")
     
-    def extract_and_validate_application(self, pdf_path: str) -> Dict[str, Any]:
+    def extract_and_validate_application(self, pdf_path: str, original_name: Optional[str] = None,
+                                         progress: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
         """
         Extract application data and perform QC validation
+        original_name: uploaded file name, when pdf_path is a stored copy under another name
+        progress: optional callback progress(stage, **data), told when the pages are sent to
+                  Gemini ("gemini_sent") and when its answer is back ("gemini_received")
         """
-        print(f"Starting Gemini-based application extraction for: {os.path.basename(pdf_path)}")
+        original_name = original_name or os.path.basename(pdf_path)
+        print(f"Starting Gemini-based application extraction for: {original_name}")
         
         # Clean up previous images to save space
         self._cleanup_previous_images()
         
         result = {
             "extraction_info": {
-                "original_file": os.path.basename(pdf_path),
+                "original_file": original_name,
                 "extraction_method": "gemini_ai",
                 "extraction_timestamp": datetime.now().isoformat()
             },
@@ -104,7 +109,7 @@ class GeminiApplicationExtractor:
             
             # Step 3: Send to Gemini for AI validation
             print("Sending to Gemini AI for validation...")
-            gemini_response = self._validate_with_gemini(extracted_pages_pdf)
+            gemini_response = self._validate_with_gemini(extracted_pages_pdf, progress)
             
             if gemini_response:
                 result["gemini_validations"] = gemini_response
@@ -267,7 +272,8 @@ class GeminiApplicationExtractor:
             print(f"Error extracting required pages: {e}")
             return None
     
-    def _validate_with_gemini(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+    def _validate_with_gemini(self, pdf_path: str,
+                              progress: Optional[Callable[..., None]] = None) -> Optional[Dict[str, Any]]:
         """
         Send PDF to Gemini for AI-powered validation
         """
@@ -340,7 +346,11 @@ class GeminiApplicationExtractor:
             
             # Send to Gemini
             print(f"Sending {len(images)} pages to Gemini for analysis...")
+            if progress:
+                progress("gemini_sent", pages=len(images))
             response = self.model.generate_content([prompt] + image_parts)
+            if progress:
+                progress("gemini_received", answered=bool(response and response.text))
             
             if not response or not response.text:
                 print("No response from Gemini")
@@ -452,9 +462,10 @@ Be thorough and accurate. If you cannot determine something clearly, mark it as
             print(f"Error saving Gemini response: {e}")
 
 
-def extract_and_validate_application_qc(pdf_path: str) -> Dict[str, Any]:
+def extract_and_validate_application_qc(pdf_path: str, original_name: Optional[str] = None,
+                                        progress: Optional[Callable[..., None]] = None) -> Dict[str, Any]:
     """
     Main function to extract and validate application using Gemini AI
     """
     extractor = GeminiApplicationExtractor()
-    return extractor.extract_and_validate_application(pdf_path)
+    return extractor.extract_and_validate_application(pdf_path, original_name, progress)
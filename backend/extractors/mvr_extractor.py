@@ -1,8 +1,11 @@
-import fitz  # PyMuPDF
 import re
 import json
-import os
+import time
 from datetime import datetime
+from extractors.time_budget import track_partial
+from extractors.pattern_packs import StepPack
+from extractors.ocr_fallback import ocr_short_pages, mark_ocr_pages
+from extractors.pdf_source import open_pdf, source_name
 
 def convert_date_format(date_str):
     """
@@ -31,7 +34,7 @@ def validate_extracted_data(result, path):
     """
     Validate extracted data and provide warnings for potential issues
     """
-    filename = os.path.basename(path)
+    filename = source_name(path)
     
     # Check if name looks like a date (common extraction error)
     if result.get("name"):
@@ -58,317 +61,475 @@ def validate_extracted_data(result, path):
     if missing_fields:
         print(f"WARNING: Missing essential fields: {missing_fields}")
 
-def extract_mvr_fields_improved(text, result):
+# Field values are read from at most this many characters after their label (leading whitespace not counted)
+VALUE_WINDOW = 512
+LEADING_WHITESPACE = re.compile(r'\s*')
+
+# Every label the MVR field specs look up; the index records where each one ends
+MVR_LABELS = (
+    "LICENCE NUMBER:", "LICENSE NUMBER:", "DLN:", "DRIVER LICENSE:", "LICENCE:",
+    "XREF FROM:", "XREF:", "NAME:",
+    "BIRTH DATE:", "DATE OF BIRTH:", "BORN:", "DOB:", "BIRTHDATE:",
+    "GENDER:", "SEX:",
+    "ADDRESS:", "RESIDENCE:", "MAILING ADDRESS:",
+    "EXPIRY DATE:", "EXPIRES:", "EXPIRATION:", "EXPDT:",
+    "ISSUE DATE:", "ISSUED:", "LICENSE ISSUED:", "FIRST ISSUED:", "ORIGINAL ISSUE:",
+    "LICENSE DATE:", "DRIVER LICENSE DATE:",
+    "STATUS:", "LICENSE STATUS:", "DRIVER STATUS:",
+    "RELEASE DATE:", "RELEASED:", "REPORT DATE:", "DATE RELEASED:", "GENERATED:", "REPORT GENERATED:",
+)
+
+LICENCE_VALUE = r'\s*([A-Z0-9\-]+)'
+NAME_VALUE = r'\s*([A-Z,\-]+(?:\s+[A-Z,\-]+)*)'
+DATE_VALUE = r'\s*(\d{2}/\d{2}/\d{4})'
+DASHED_DATE_VALUE = r'\s*(\d{2}-\d{2}-\d{4})'
+BLOCK_VALUE = r'\s*([^\n]+(?:\n[^\n]+)*?)(?=\n[A-Z][A-Z\s]*:|$)'
+
+
+# Name, birth date and expiry date as they appear in the summary table at the end of the abstract
+SUMMARY_ROW_PATTERN = re.compile(r'([A-Z\-]+,[A-Z\-]+)\s+(\d{2}/\d{2}/\d{4})\s+(\d{2}/\d{2}/\d{4})')
+
+
+# Markers between the sections of an Ontario abstract. See segment_mvr_text.
+DRIVING_RECORD_MARKER = "ONTARIO DRIVING RECORD"
+CONVICTIONS_HEADING = re.compile(r'DATE\s+CONVICTIONS, DISCHARGES AND OTHER ACTIONS')
+END_OF_RECORD = re.compile(r'SEARCH SUCCESSFUL|END OF REPORT')
+
+# Unlabelled patterns scan at most this many characters of each section they belong to,
+# which bounds their cost per document however long the conviction history is
+SECTION_SCAN_LIMIT = 20000
+
+
+def label_step(label, value, flags=0):
+    """Field step read from the window after label; the same step as a single regex for the full-text cascade"""
+    return (label, re.compile(value, flags), re.compile(re.escape(label) + value, flags), 1, None)
+
+
+def pattern_step(pattern, flags=0, group=1, sections=None):
+    """
+    Field step with no label to anchor it, searched only within the named sections
+    (the whole text when sections is None)
+    """
+    return (None, None, re.compile(pattern, flags), group, sections)
+
+
+def summary_step(group, sections=None):
+    """Field step read from the summary table row, which is searched for once and shared by every field"""
+    return (None, None, SUMMARY_ROW_PATTERN, group, sections)
+
+
+def field_steps(field, steps):
+    """A field's steps as a registered pattern pack, listed by their full-text pattern"""
+    return StepPack(f"mvr.{field}", steps, lambda step: step[2])
+
+
+# Field specs in priority order. Both the label index and the full-text cascade walk these lists.
+LICENCE_STEPS = field_steps("licence", [
+    label_step("LICENCE NUMBER:", LICENCE_VALUE),
+    label_step("LICENSE NUMBER:", LICENCE_VALUE),
+    label_step("DLN:", LICENCE_VALUE),
+    label_step("DRIVER LICENSE:", LICENCE_VALUE),
+    label_step("LICENCE:", LICENCE_VALUE),
+    # More specific pattern for the format we see in the debug files
+    pattern_step(r'ON\s+([A-Z0-9\-]+)\s+[A-Z,\-]+'),  # Matches the table format
+    # Fallback: Look for license number in the summary table at the end
+    pattern_step(r'([A-Z]\d{4}-\d{5}-\d{5})'),  # Format like T0168-58306-50618
+])
+
+XREF_STEPS = field_steps("xref", [
+    label_step("XREF FROM:", LICENCE_VALUE),
+    label_step("XREF:", LICENCE_VALUE),
+])
+
+NAME_STEPS = field_steps("name", [
+    # Most specific: Look for "Name:" followed by the actual name
+    label_step("NAME:", NAME_VALUE),
+    # Alternative: Look in the table format
+    pattern_step(r'ON\s+[A-Z0-9\-]+\s+([A-Z,\-]+(?:\s+[A-Z,\-]+)*)'),
+    # Look for LASTNAME,FIRSTNAME format specifically
+    pattern_step(r'([A-Z\-]+,[A-Z\-]+)'),
+    # Look for name after license number in driving record section
+    label_step("LICENCE NUMBER:", r'\s*[A-Z0-9\-]+\s+EXPIRY DATE:\s*\d{2}/\d{2}/\d{4}\s+NAME:' + NAME_VALUE),
+    # Fallback: Look for name in the summary table
+    summary_step(1),
+])
+
+NAME_CLEANUP_PATTERNS = [
+    re.compile(r'\n.*$'),  # Remove anything after newline
+    re.compile(r'\s+BIRTH\s+DATE.*$'),  # Remove "BIRTH DATE" and following text
+    re.compile(r'\s+GENDER.*$'),  # Remove "GENDER" and following text
+    re.compile(r'\s+HEIGHT.*$'),  # Remove "HEIGHT" and following text
+    re.compile(r'\s+ADDRESS.*$'),  # Remove "ADDRESS" and following text
+]
+
+BIRTH_STEPS = field_steps("birth_date", [
+    label_step("BIRTH DATE:", DATE_VALUE),
+    label_step("DATE OF BIRTH:", DATE_VALUE),
+    label_step("BORN:", DATE_VALUE),
+    label_step("DOB:", DATE_VALUE),
+    label_step("BIRTHDATE:", DATE_VALUE),
+    # Fallback: Look in the summary table
+    summary_step(2),
+])
+
+GENDER_STEPS = field_steps("gender", [
+    label_step("GENDER:", r'\s*([MF])'),
+    label_step("SEX:", r'\s*([MF])'),
+    pattern_step(r'MALE|FEMALE', group=0),
+])
+
+ADDRESS_STEPS = field_steps("address", [
+    label_step("ADDRESS:", BLOCK_VALUE, re.DOTALL),
+    label_step("RESIDENCE:", BLOCK_VALUE, re.DOTALL),
+    label_step("MAILING ADDRESS:", BLOCK_VALUE, re.DOTALL),
+])
+
+EXPIRY_STEPS = field_steps("expiry_date", [
+    label_step("EXPIRY DATE:", DATE_VALUE),
+    label_step("EXPIRES:", DATE_VALUE),
+    label_step("EXPIRATION:", DATE_VALUE),
+    label_step("EXPDT:", DATE_VALUE),
+    # Fallback: Look in the summary table
+    summary_step(3),
+])
+
+ISSUE_STEPS = field_steps("issue_date", [
+    label_step("ISSUE DATE:", DATE_VALUE),
+    label_step("ISSUED:", DATE_VALUE),
+    label_step("LICENSE ISSUED:", DATE_VALUE),
+    label_step("FIRST ISSUED:", DATE_VALUE),
+    label_step("ORIGINAL ISSUE:", DATE_VALUE),
+    label_step("LICENSE DATE:", DATE_VALUE),
+    label_step("DRIVER LICENSE DATE:", DATE_VALUE),
+    # Look for dates in the license history section
+    pattern_step(r'LICENSE HISTORY.*?(\d{2}/\d{2}/\d{4})', sections=("driving_record",)),
+    # Look for dates in the search line and summary table that might be issue dates
+    pattern_step(r'ON\s+[A-Z0-9\-]+\s+(\d{2}/\d{2}/\d{4})', sections=("header", "summary")),
+    # Look for dates in the abstract title lines
+    pattern_step(r'ABSTRACT.*?(\d{2}/\d{2}/\d{4})', sections=("header", "driving_record")),
+    # Look for dates in the driver abstract section
+    pattern_step(r'DRIVER ABSTRACT.*?(\d{2}/\d{2}/\d{4})', sections=("header", "driving_record")),
+    # Look for dates in the license abstract section
+    pattern_step(r'LICENSE ABSTRACT.*?(\d{2}/\d{2}/\d{4})', sections=("header", "driving_record")),
+    # Look for dates in the summary table that might be issue dates
+    summary_step(2, sections=("summary",)),
+    # Look for dates in the driver information section
+    pattern_step(r'DRIVER INFORMATION.*?(\d{2}/\d{2}/\d{4})', sections=("header", "driving_record")),
+    # Look for dates near license number
+    label_step("LICENCE NUMBER:", r'\s*[A-Z0-9\-]+\s+(\d{2}/\d{2}/\d{4})'),
+    # Look for dates in the license status section
+    pattern_step(r'LICENSE STATUS.*?(\d{2}/\d{2}/\d{4})', sections=("driving_record",)),
+])
+
+STATUS_STEPS = field_steps("status", [
+    label_step("STATUS:", r'\s*([A-Z]+)'),
+    label_step("LICENSE STATUS:", r'\s*([A-Z]+)'),
+    label_step("DRIVER STATUS:", r'\s*([A-Z]+)'),
+])
+
+RELEASE_DATE_STEPS = field_steps("release_date", [
+    label_step("RELEASE DATE:", DATE_VALUE),
+    label_step("RELEASE DATE:", DASHED_DATE_VALUE),
+    label_step("RELEASED:", DATE_VALUE),
+    label_step("RELEASED:", DASHED_DATE_VALUE),
+    label_step("REPORT DATE:", DATE_VALUE),
+    label_step("REPORT DATE:", DASHED_DATE_VALUE),
+    label_step("DATE RELEASED:", DATE_VALUE),
+    label_step("DATE RELEASED:", DASHED_DATE_VALUE),
+    label_step("GENERATED:", DATE_VALUE),
+    label_step("GENERATED:", DASHED_DATE_VALUE),
+    label_step("REPORT GENERATED:", DATE_VALUE),
+    label_step("REPORT GENERATED:", DASHED_DATE_VALUE),
+    # Look for the specific format in MVR abstracts section
+    pattern_step(r'ON\s+[A-Z0-9\-]+\s+(\d{2}-\d{2}-\d{4})'),
+])
+
+LICENCE_NAME_PATTERN = re.compile(r'([A-Z0-9\-]+)\s+([A-Z\-]+,[A-Z\-]+)')
+SUMMARY_TABLE_PATTERN = re.compile(r'([A-Z0-9\-]+)\s+([A-Z\-]+,[A-Z\-]+)\s+(\d{2}/\d{2}/\d{4})\s+(\d{2}/\d{2}/\d{4})')
+ANY_DATE_PATTERN = re.compile(r'(\d{2}/\d{2}/\d{4})')
+CONVICTIONS_SECTION_PATTERN = re.compile(r'DATE\s+CONVICTIONS, DISCHARGES AND OTHER ACTIONS(.*?)(?=SEARCH SUCCESSFUL|END OF REPORT|$)', re.DOTALL | re.IGNORECASE)
+CONVICTION_ENTRY_PATTERN = re.compile(r'(\d{2}/\d{2}/\d{4})\s+([^\n]+(?:\n(?!\d{2}/\d{2}/\d{4})[^\n]+)*)', re.DOTALL)
+CONVICTION_CLEANUP_PATTERNS = [
+    re.compile(r'\n.*?OFFENCE DATE.*?\n', re.DOTALL),
+    re.compile(r'\n.*?SUSPENSION NO\..*?\n', re.DOTALL),
+    re.compile(r'\n.*?DEMERIT POINTS.*?\n', re.DOTALL),
+    re.compile(r'\n.*?SUSPENDED UNTIL.*?\n', re.DOTALL),
+    re.compile(r'OFFENCE DATE \d{4}/\d{2}/\d{2}'),
+    re.compile(r'SUSPENSION NO\. \d+'),
+    re.compile(r'SUSPENDED UNTIL [A-Z]+\. \d+, \d{4},'),
+    re.compile(r'DEMERIT POINTS - [A-Z\s]+ SUSPENSION\.'),
+]
+
+
+def segment_mvr_text(text_normalized):
     """
-    Extract MVR fields using improved pattern matching with better specificity
+    Split an upper-cased abstract into sections, locating each marker once.
+    Returns {section: (start, end)} offsets:
+      header          up to "ONTARIO DRIVING RECORD" (abstract title and search line)
+      driving_record  licence, name, dates and status, up to the convictions heading
+      convictions     after the "DATE CONVICTIONS, DISCHARGES AND OTHER ACTIONS" heading
+      summary         from "SEARCH SUCCESSFUL" / "END OF REPORT" (the summary table row)
+    A missing marker leaves its section empty and the one before it runs on to the next marker.
+    """
+    length = len(text_normalized)
+    heading = CONVICTIONS_HEADING.search(text_normalized)
+    driving_record_start = text_normalized.find(DRIVING_RECORD_MARKER, 0, heading.start() if heading else length)
+    if driving_record_start == -1:
+        driving_record_start = 0
+
+    end_marker = END_OF_RECORD.search(text_normalized, heading.end() if heading else driving_record_start)
+    summary_start = end_marker.start() if end_marker else length
+
+    return {
+        "header": (0, driving_record_start),
+        "driving_record": (driving_record_start, heading.start() if heading else summary_start),
+        "convictions": (heading.end(), summary_start) if heading else (summary_start, summary_start),
+        "summary": (summary_start, length),
+    }
+
+
+class MVRLabelIndex:
+    """
+    Offsets of every known field label and section in the MVR text, built in a single scan.
+    The text is upper-cased once here and shared by the field extraction and the fallbacks.
+    """
+
+    def __init__(self, text):
+        self.text = text.upper()
+        self.sections = segment_mvr_text(self.text)
+        self.offsets = {}
+        self._searches = {}
+
+        # Every label ends with a colon, so only the colons need checking.
+        # Labels inside longer labels ("STATUS:" in "LICENSE STATUS:") are indexed too.
+        colon = self.text.find(":")
+        while colon != -1:
+            end = colon + 1
+            for label in MVR_LABELS:
+                if self.text.startswith(label, end - len(label)):
+                    self.offsets.setdefault(label, []).append(end)
+            colon = self.text.find(":", end)
+
+    def find(self, label, value_pattern, start=0):
+        """Match value_pattern right after the first occurrence of label (at or after start) where it fits"""
+        text_length = len(self.text)
+        for offset in self.offsets.get(label, ()):
+            if offset < start:
+                continue
+            value_start = LEADING_WHITESPACE.match(self.text, offset).end()
+            endpos = min(value_start + VALUE_WINDOW, text_length)
+            match = value_pattern.match(self.text, offset, endpos)
+            if match and match.end() >= endpos - 1 and endpos < text_length:
+                # The value runs to the edge of the window ($ also matches before a final newline);
+                # read it without the bound
+                match = value_pattern.match(self.text, offset)
+            if match:
+                return match
+        return None
+
+    def search(self, pattern, sections=None):
+        """
+        Search for an unlabelled pattern once per text: within the named sections in order
+        (at most SECTION_SCAN_LIMIT characters of each), or the whole text when sections is None
+        """
+        key = (pattern, sections)
+        if key not in self._searches:
+            if sections is None:
+                match = pattern.search(self.text)
+            else:
+                match = None
+                for section in sections:
+                    start, end = self.sections[section]
+                    match = pattern.search(self.text, start, min(end, start + SECTION_SCAN_LIMIT))
+                    if match:
+                        break
+            self._searches[key] = match
+        return self._searches[key]
+
+
+def find_field(steps, text_normalized, index=None):
+    """
+    Walk a field's steps (a StepPack) in order and yield each (pattern, value) found, counting every try.
+    With an index, labelled steps read the window after the label instead of searching the whole text,
+    and unlabelled patterns are searched once per text within their sections.
+    """
+    for position, (label, value_pattern, pattern, group, sections) in steps.ordered_steps():
+        start = time.perf_counter()
+        if index is None:
+            match = pattern.search(text_normalized)
+        elif label is not None:
+            match = index.find(label, value_pattern)
+        else:
+            match = index.search(pattern, sections)
+        steps.record(position, match is not None, time.perf_counter() - start)
+        if match:
+            yield pattern, match.group(group)
+
+
+def extract_mvr_fields_improved(text, result, index=None, use_index=True):
+    """
+    Extract MVR fields using improved pattern matching with better specificity.
+    Labelled fields are read through an MVRLabelIndex (built here unless one is passed in);
+    use_index=False searches the whole text for every pattern instead.
     """
     if not text:
         return
-    
+
+    if index is None and use_index:
+        index = MVRLabelIndex(text)
     # Normalize text for better pattern matching
-    text_normalized = text.upper()
-    
+    text_normalized = index.text if index is not None else text.upper()
+
     # License Number - improved patterns with better context
     # Priority 1: Actual License Number field (this is the primary license number)
-    license_patterns = [
-        r'LICENCE NUMBER:\s*([A-Z0-9\-]+)',
-        r'LICENSE NUMBER:\s*([A-Z0-9\-]+)',
-        r'DLN:\s*([A-Z0-9\-]+)',
-        r'DRIVER LICENSE:\s*([A-Z0-9\-]+)',
-        r'LICENCE:\s*([A-Z0-9\-]+)',
-        # More specific pattern for the format we see in the debug files
-        r'ON\s+([A-Z0-9\-]+)\s+[A-Z,\-]+',  # Matches the table format
-        # Fallback: Look for license number in the summary table at the end
-        r'([A-Z]\d{4}-\d{5}-\d{5})',  # Format like T0168-58306-50618
-    ]
-    
-    for pattern in license_patterns:
-        match = re.search(pattern, text_normalized, re.IGNORECASE)
-        if match:
-            license_num = match.group(1).strip()
-            # Validate license number format
-            if len(license_num) >= 8 and len(license_num) <= 20:
-                result["licence_number"] = license_num
-                break
-    
+    for _, value in find_field(LICENCE_STEPS, text_normalized, index):
+        license_num = value.strip()
+        # Validate license number format
+        if len(license_num) >= 8 and len(license_num) <= 20:
+            result["licence_number"] = license_num
+            break
+
     # Priority 2: If no actual license number found, try XREF From field as fallback
     if not result.get("licence_number"):
-        xref_patterns = [
-            r'XREF FROM:\s*([A-Z0-9\-]+)',
-            r'XREF:\s*([A-Z0-9\-]+)',
-        ]
-        
-        for pattern in xref_patterns:
-            match = re.search(pattern, text_normalized, re.IGNORECASE)
-            if match:
-                xref_num = match.group(1).strip()
-                if len(xref_num) >= 8 and len(xref_num) <= 20:
-                    result["licence_number"] = xref_num
-                    break
-    
-        # Name - much more specific patterns to avoid date extraction
-    name_patterns = [
-        # Most specific: Look for "Name:" followed by the actual name
-        r'NAME:\s*([A-Z,\-]+(?:\s+[A-Z,\-]+)*)',
-        # Alternative: Look in the table format
-        r'ON\s+[A-Z0-9\-]+\s+([A-Z,\-]+(?:\s+[A-Z,\-]+)*)',
-        # Look for LASTNAME,FIRSTNAME format specifically
-        r'([A-Z\-]+,[A-Z\-]+)',
-        # Look for name after license number in driving record section
-        r'LICENCE NUMBER:\s*[A-Z0-9\-]+\s+EXPIRY DATE:\s*\d{2}/\d{2}/\d{4}\s+NAME:\s*([A-Z,\-]+(?:\s+[A-Z,\-]+)*)',
-        # Fallback: Look for name in the summary table
-        r'([A-Z\-]+,[A-Z\-]+)\s+\d{2}/\d{2}/\d{4}\s+\d{2}/\d{2}/\d{4}',
-    ]
-    
-    for pattern in name_patterns:
-        match = re.search(pattern, text_normalized, re.IGNORECASE)
-        if match:
-            name = match.group(1).strip()
-            # Clean up the name by removing extra text
-            name = re.sub(r'\n.*$', '', name)  # Remove anything after newline
-            name = re.sub(r'\s+BIRTH\s+DATE.*$', '', name)  # Remove "BIRTH DATE" and following text
-            name = re.sub(r'\s+GENDER.*$', '', name)  # Remove "GENDER" and following text
-            name = re.sub(r'\s+HEIGHT.*$', '', name)  # Remove "HEIGHT" and following text
-            name = re.sub(r'\s+ADDRESS.*$', '', name)  # Remove "ADDRESS" and following text
-            name = name.strip()
-            
-            # Additional validation to avoid date extraction
-            if len(name) > 3 and not is_likely_date(name):
-                result["name"] = name
+        for _, value in find_field(XREF_STEPS, text_normalized, index):
+            xref_num = value.strip()
+            if len(xref_num) >= 8 and len(xref_num) <= 20:
+                result["licence_number"] = xref_num
                 break
-    
-    # Birth Date - improved patterns
-    birth_patterns = [
-        r'BIRTH DATE:\s*(\d{2}/\d{2}/\d{4})',
-        r'DATE OF BIRTH:\s*(\d{2}/\d{2}/\d{4})',
-        r'BORN:\s*(\d{2}/\d{2}/\d{4})',
-        r'DOB:\s*(\d{2}/\d{2}/\d{4})',
-        r'BIRTHDATE:\s*(\d{2}/\d{2}/\d{4})',
-        # Fallback: Look in the summary table
-        r'[A-Z\-]+,[A-Z\-]+\s+(\d{2}/\d{2}/\d{4})\s+\d{2}/\d{2}/\d{4}',
-    ]
-    
-    for pattern in birth_patterns:
-        match = re.search(pattern, text_normalized)
-        if match:
-            original_date = match.group(1)
-            result["birth_date"] = original_date # Keep original format
+
+    # Name - much more specific patterns to avoid date extraction
+    for _, value in find_field(NAME_STEPS, text_normalized, index):
+        name = value.strip()
+        # Clean up the name by removing extra text
+        for cleanup in NAME_CLEANUP_PATTERNS:
+            name = cleanup.sub('', name)
+        name = name.strip()
+
+        # Additional validation to avoid date extraction
+        if len(name) > 3 and not is_likely_date(name):
+            result["name"] = name
             break
-    
+
+    # Birth Date - improved patterns
+    for _, value in find_field(BIRTH_STEPS, text_normalized, index):
+        result["birth_date"] = value  # Keep original format
+        break
+
     # Gender - improved patterns
-    gender_patterns = [
-        r'GENDER:\s*([MF])',
-        r'SEX:\s*([MF])',
-        r'MALE|FEMALE',
-    ]
-    
-    for pattern in gender_patterns:
-        match = re.search(pattern, text_normalized)
-        if match:
-            if pattern == r'MALE|FEMALE':
-                result["gender"] = "M" if "MALE" in text_normalized else "F"
-            else:
-                result["gender"] = match.group(1)
-            break
-    
+    for pattern, value in find_field(GENDER_STEPS, text_normalized, index):
+        if pattern.pattern == r'MALE|FEMALE':
+            result["gender"] = "M" if "MALE" in text_normalized else "F"
+        else:
+            result["gender"] = value
+        break
+
     # Address - improved patterns with better context
-    address_patterns = [
-        r'ADDRESS:\s*([^\n]+(?:\n[^\n]+)*?)(?=\n[A-Z][A-Z\s]*:|$)',
-        r'RESIDENCE:\s*([^\n]+(?:\n[^\n]+)*?)(?=\n[A-Z][A-Z\s]*:|$)',
-        r'MAILING ADDRESS:\s*([^\n]+(?:\n[^\n]+)*?)(?=\n[A-Z][A-Z\s]*:|$)',
-    ]
-    
-    for pattern in address_patterns:
-        match = re.search(pattern, text_normalized, re.DOTALL | re.IGNORECASE)
-        if match:
-            address = match.group(1).strip()
-            # Clean up the address
-            address_lines = []
-            for line in address.split('\n'):
-                line = line.strip()
-                if line and not line.startswith('REFERENCE:') and not line.startswith('COMMENT:'):
-                    address_lines.append(line)
-            if address_lines:
-                result["address"] = '\n'.join(address_lines)
-            break
-    
+    for _, value in find_field(ADDRESS_STEPS, text_normalized, index):
+        address = value.strip()
+        # Clean up the address
+        address_lines = []
+        for line in address.split('\n'):
+            line = line.strip()
+            if line and not line.startswith('REFERENCE:') and not line.startswith('COMMENT:'):
+                address_lines.append(line)
+        if address_lines:
+            result["address"] = '\n'.join(address_lines)
+        break
+
     # Expiry Date - improved patterns
-    expiry_patterns = [
-        r'EXPIRY DATE:\s*(\d{2}/\d{2}/\d{4})',
-        r'EXPIRES:\s*(\d{2}/\d{2}/\d{4})',
-        r'EXPIRATION:\s*(\d{2}/\d{2}/\d{4})',
-        r'EXPDT:\s*(\d{2}/\d{2}/\d{4})',
-        # Fallback: Look in the summary table
-        r'[A-Z\-]+,[A-Z\-]+\s+\d{2}/\d{2}/\d{4}\s+(\d{2}/\d{2}/\d{4})',
-    ]
-    
-    for pattern in expiry_patterns:
-        match = re.search(pattern, text_normalized)
-        if match:
-            original_date = match.group(1)
-            result["expiry_date"] = original_date # Keep original format
-            break
-    
+    for _, value in find_field(EXPIRY_STEPS, text_normalized, index):
+        result["expiry_date"] = value  # Keep original format
+        break
+
     # Issue Date - improved patterns with fallback logic
-    issue_patterns = [
-        r'ISSUE DATE:\s*(\d{2}/\d{2}/\d{4})',
-        r'ISSUED:\s*(\d{2}/\d{2}/\d{4})',
-        r'LICENSE ISSUED:\s*(\d{2}/\d{2}/\d{4})',
-        r'FIRST ISSUED:\s*(\d{2}/\d{2}/\d{4})',
-        r'ORIGINAL ISSUE:\s*(\d{2}/\d{2}/\d{4})',
-        r'LICENSE DATE:\s*(\d{2}/\d{2}/\d{4})',
-        r'DRIVER LICENSE DATE:\s*(\d{2}/\d{2}/\d{4})',
-                # Look for dates in the license history section
-        r'LICENSE HISTORY.*?(\d{2}/\d{2}/\d{4})',
-        # Look for dates in the abstract section that might be issue dates
-        r'ON\s+[A-Z0-9\-]+\s+(\d{2}/\d{2}/\d{4})',
-        # Look for dates in the abstract summary section
-        r'ABSTRACT.*?(\d{2}/\d{2}/\d{4})',
-        # Look for dates in the driver abstract section
-        r'DRIVER ABSTRACT.*?(\d{2}/\d{2}/\d{4})',
-        # Look for dates in the license abstract section
-        r'LICENSE ABSTRACT.*?(\d{2}/\d{2}/\d{4})',
-        # Look for dates in the summary table that might be issue dates
-        r'[A-Z\-]+,[A-Z\-]+\s+(\d{2}/\d{2}/\d{4})\s+\d{2}/\d{2}/\d{4}',
-        # Look for dates in the driver information section
-        r'DRIVER INFORMATION.*?(\d{2}/\d{2}/\d{4})',
-        # Look for dates near license number
-        r'LICENCE NUMBER:\s*[A-Z0-9\-]+\s+(\d{2}/\d{2}/\d{4})',
-        # Look for dates in the abstract summary
-        r'ABSTRACT.*?(\d{2}/\d{2}/\d{4})',
-        # Look for dates in the license status section
-        r'LICENSE STATUS.*?(\d{2}/\d{2}/\d{4})',
-    ]
-    
-    for pattern in issue_patterns:
-        match = re.search(pattern, text_normalized)
-        if match:
-            original_date = match.group(1)
-            result["issue_date"] = original_date # Keep original format
-            break
-    
+    for _, value in find_field(ISSUE_STEPS, text_normalized, index):
+        result["issue_date"] = value  # Keep original format
+        break
+
     # If no issue date found, try to infer from other available dates
     if not result.get("issue_date"):
         # Look for the earliest date in the document as a potential issue date
-        all_dates = re.findall(r'(\d{2}/\d{2}/\d{4})', text_normalized)
-        if all_dates:
-            # Parse all dates and find the earliest one (likely the issue date)
-            try:
-                parsed_dates = []
-                for date_str in all_dates:
-                    try:
-                        day, month, year = date_str.split('/')
-                        parsed_date = datetime(int(year), int(month), int(day))
-                        parsed_dates.append((parsed_date, date_str))
-                    except:
-                        continue
-                
-                if parsed_dates:
-                    # Sort by date and take the earliest
-                    parsed_dates.sort(key=lambda x: x[0])
-                    earliest_date = parsed_dates[0][1]
-                    result["issue_date"] = earliest_date
-                    print(f"DEBUG: Inferred issue date from earliest date found: {earliest_date}")
-            except Exception as e:
-                print(f"DEBUG: Error inferring issue date: {e}")
-        
+        earliest_date = _earliest_date(ANY_DATE_PATTERN.findall(text_normalized), "earliest date found")
+        if earliest_date:
+            result["issue_date"] = earliest_date
+
         # Additional fallback: Look for dates in the abstract section with specific context
         if not result.get("issue_date"):
             # Look for dates that appear to be license-related in the abstract
-            abstract_section = re.search(r'ABSTRACT(.*?)(?=SEARCH SUCCESSFUL|END OF REPORT|$)', text, re.DOTALL | re.IGNORECASE)
-            if abstract_section:
-                abstract_text = abstract_section.group(1)
-                # Look for dates that might be license issue dates
-                abstract_dates = re.findall(r'(\d{2}/\d{2}/\d{4})', abstract_text)
-                if abstract_dates:
-                    # Take the earliest date from the abstract section
-                    try:
-                        parsed_abstract_dates = []
-                        for date_str in abstract_dates:
-                            try:
-                                day, month, year = date_str.split('/')
-                                parsed_date = datetime(int(year), int(month), int(day))
-                                parsed_abstract_dates.append((parsed_date, date_str))
-                            except:
-                                continue
-                        
-                        if parsed_abstract_dates:
-                            parsed_abstract_dates.sort(key=lambda x: x[0])
-                            earliest_abstract_date = parsed_abstract_dates[0][1]
-                            result["issue_date"] = earliest_abstract_date
-                            print(f"DEBUG: Inferred issue date from abstract section: {earliest_abstract_date}")
-                    except Exception as e:
-                        print(f"DEBUG: Error inferring issue date from abstract: {e}")
-    
+            abstract_start = text_normalized.find('ABSTRACT')
+            if abstract_start != -1:
+                abstract_start += len('ABSTRACT')
+                end_marker = END_OF_RECORD.search(text_normalized, abstract_start)
+                abstract_end = end_marker.start() if end_marker else len(text_normalized)
+                # Take the earliest date from the abstract section
+                abstract_dates = ANY_DATE_PATTERN.findall(text_normalized, abstract_start, abstract_end)
+                earliest_abstract_date = _earliest_date(abstract_dates, "abstract section")
+                if earliest_abstract_date:
+                    result["issue_date"] = earliest_abstract_date
+
     # Status - extract license status
-    status_patterns = [
-        r'STATUS:\s*([A-Z]+)',
-        r'LICENSE STATUS:\s*([A-Z]+)',
-        r'DRIVER STATUS:\s*([A-Z]+)',
-    ]
-    
-    for pattern in status_patterns:
-        match = re.search(pattern, text_normalized)
-        if match:
-            status = match.group(1).strip()
-            result["status"] = status
-            break
-    
+    for _, value in find_field(STATUS_STEPS, text_normalized, index):
+        result["status"] = value.strip()
+        break
+
     # Release Date - extract the date the MVR report was released/generated
-    release_date_patterns = [
-        r'RELEASE DATE:\s*(\d{2}/\d{2}/\d{4})',
-        r'RELEASE DATE:\s*(\d{2}-\d{2}-\d{4})',
-        r'RELEASED:\s*(\d{2}/\d{2}/\d{4})',
-        r'RELEASED:\s*(\d{2}-\d{2}-\d{4})',
-        r'REPORT DATE:\s*(\d{2}/\d{2}/\d{4})',
-        r'REPORT DATE:\s*(\d{2}-\d{2}-\d{4})',
-        r'DATE RELEASED:\s*(\d{2}/\d{2}/\d{4})',
-        r'DATE RELEASED:\s*(\d{2}-\d{2}-\d{4})',
-        r'GENERATED:\s*(\d{2}/\d{2}/\d{4})',
-        r'GENERATED:\s*(\d{2}-\d{2}-\d{4})',
-        r'REPORT GENERATED:\s*(\d{2}/\d{2}/\d{4})',
-        r'REPORT GENERATED:\s*(\d{2}-\d{2}-\d{4})',
-        # Look for the specific format in MVR abstracts section
-        r'ON\s+[A-Z0-9\-]+\s+(\d{2}-\d{2}-\d{4})'
-    ]
-    
-    for pattern in release_date_patterns:
-        match = re.search(pattern, text_normalized)
-        if match:
-            original_date = match.group(1)
-            # Convert DD-MM-YYYY to DD/MM/YYYY format for consistency
-            if '-' in original_date:
-                original_date = original_date.replace('-', '/')
-            result["release_date"] = original_date  # Keep DD/MM/YYYY format
-            break
-    
-    # Convictions - look for convictions section
-    convictions_section = re.search(r'DATE\s+CONVICTIONS, DISCHARGES AND OTHER ACTIONS(.*?)(?=SEARCH SUCCESSFUL|END OF REPORT|$)', text, re.DOTALL | re.IGNORECASE)
-    if convictions_section:
-        conviction_text = convictions_section.group(1)
+    for _, value in find_field(RELEASE_DATE_STEPS, text_normalized, index):
+        original_date = value
+        # Convert DD-MM-YYYY to DD/MM/YYYY format for consistency
+        if '-' in original_date:
+            original_date = original_date.replace('-', '/')
+        result["release_date"] = original_date  # Keep DD/MM/YYYY format
+        break
+
+    # Convictions - look for convictions section (descriptions keep the original case)
+    conviction_text = None
+    if index is not None and len(index.text) == len(text):
+        start, end = index.sections["convictions"]
+        conviction_text = text[start:end]
+    else:
+        convictions_section = CONVICTIONS_SECTION_PATTERN.search(text)
+        if convictions_section:
+            conviction_text = convictions_section.group(1)
+    if conviction_text:
         # Look for date patterns followed by conviction descriptions
-        conviction_matches = re.findall(r'(\d{2}/\d{2}/\d{4})\s+([^\n]+(?:\n(?!\d{2}/\d{2}/\d{4})[^\n]+)*)', conviction_text, re.DOTALL)
-        for date, description in conviction_matches:
-            # Keep original date format
-            converted_date = date
-            
+        for date, description in CONVICTION_ENTRY_PATTERN.findall(conviction_text):
             # Clean up the description
-            clean_desc = re.sub(r'\n.*?OFFENCE DATE.*?\n', '', description, flags=re.DOTALL)
-            clean_desc = re.sub(r'\n.*?SUSPENSION NO\..*?\n', '', clean_desc, flags=re.DOTALL)
-            clean_desc = re.sub(r'\n.*?DEMERIT POINTS.*?\n', '', clean_desc, flags=re.DOTALL)
-            clean_desc = re.sub(r'\n.*?SUSPENDED UNTIL.*?\n', '', clean_desc, flags=re.DOTALL)
-            clean_desc = re.sub(r'OFFENCE DATE \d{4}/\d{2}/\d{2}', '', clean_desc)
-            clean_desc = re.sub(r'SUSPENSION NO\. \d+', '', clean_desc)
-            clean_desc = re.sub(r'SUSPENDED UNTIL [A-Z]+\. \d+, \d{4},', '', clean_desc)
-            clean_desc = re.sub(r'DEMERIT POINTS - [A-Z\s]+ SUSPENSION\.', '', clean_desc)
+            clean_desc = description
+            for cleanup in CONVICTION_CLEANUP_PATTERNS:
+                clean_desc = cleanup.sub('', clean_desc)
             clean_desc = clean_desc.strip()
-            
+
             if clean_desc and len(clean_desc) > 5:  # Avoid very short descriptions
                 result["convictions"].append({
                     "description": clean_desc,
-                    "offence_date": converted_date
+                    "offence_date": date  # Keep original date format
                 })
 
+
+def _earliest_date(date_strings, source):
+    """Earliest valid DD/MM/YYYY date among date_strings (as written), or None"""
+    if not date_strings:
+        return None
+    try:
+        parsed_dates = []
+        for date_str in date_strings:
+            try:
+                day, month, year = date_str.split('/')
+                parsed_date = datetime(int(year), int(month), int(day))
+                parsed_dates.append((parsed_date, date_str))
+            except Exception:
+                continue
+
+        if parsed_dates:
+            # Sort by date and take the earliest
+            parsed_dates.sort(key=lambda x: x[0])
+            earliest_date = parsed_dates[0][1]
+            print(f"DEBUG: Inferred issue date from {source}: {earliest_date}")
+            return earliest_date
+    except Exception as e:
+        print(f"DEBUG: Error inferring issue date from {source}: {e}")
+    return None
+
 def is_likely_date(text):
     """
     Check if extracted text is likely a date rather than a name
@@ -396,119 +557,114 @@ def is_likely_date(text):
     
     return False
 
-def get_mock_mvr_data(pdf_path):
-    """
-    Return realistic mock MVR data for testing
-    """
-    # Extract name from filename for realistic testing
-    filename = os.path.basename(pdf_path)
-    if "Paulo" in filename:
-        return {
-            "licence_number": "M24156198730710",  # Actual license from quote
-            "name": "MELO, PAULO",
-            "birth_date": "10/07/1973",  # DD/MM/YYYY format (July 10, 1973)
-            "gender": "M",
-            "address": "55 HORNER AVE SUITE\nMISSISSAUGA ON L4Z3T3",
-            "convictions": [],  # No convictions for Paulo
-            "expiry_date": "10/07/2028",  # DD/MM/YYYY format
-            "issue_date": "10/07/1990"  # DD/MM/YYYY format
-        }
-    elif "Emily" in filename:
-        return {
-            "licence_number": "M24152246036023",  # Actual license from quote
-            "name": "MELO, EMILY",
-            "birth_date": "23/10/2003",  # DD/MM/YYYY format (October 23, 2003)
-            "gender": "F",
-            "address": "55 HORNER AVE SUITE\nMISSISSAUGA ON L4Z3T3",
-            "convictions": [],  # No convictions for Emily
-            "expiry_date": "23/10/2028",  # DD/MM/YYYY format
-            "issue_date": "15/11/2019"  # DD/MM/YYYY format
-        }
-    elif "Dora" in filename:
-        return {
-            "licence_number": "M24151750755122",  # Actual license from quote
-            "name": "MELO, DORA",
-            "birth_date": "22/01/1975",  # DD/MM/YYYY format (January 22, 1975)
-            "gender": "F",
-            "address": "55 HORNER AVE SUITE\nMISSISSAUGA ON L4Z3T3",
-            "convictions": [],  # No convictions for Dora
-            "expiry_date": "22/01/2028",  # DD/MM/YYYY format
-            "issue_date": "06/01/2000"  # DD/MM/YYYY format
-        }
+# PyMuPDF text extraction modes, in order of preference
+TEXT_MODES = ("text", "dict", "words")
+# A page's text counts as meaningful above this many characters
+MIN_PAGE_TEXT_CHARS = 100
+
+def page_text(page, mode):
+    """The page's text read with one of TEXT_MODES"""
+    if mode == "dict":
+        # Extract text blocks
+        blocks = page.get_text("dict")
+        page_text = ""
+        for block in blocks.get("blocks", []):
+            if "lines" in block:
+                for line in block["lines"]:
+                    for span in line.get("spans", []):
+                        page_text += span.get("text", "") + " "
+        return page_text
+    if mode == "words":
+        # Extract by words
+        words = page.get_text("words")
+        return " ".join([word[4] for word in words if word[4]])
+    return page.get_text("text")
+
+def _meaningful(text):
+    return bool(text) and len(text.strip()) > MIN_PAGE_TEXT_CHARS
+
+def plan_text_extraction(page):
+    """
+    Probe one page with every text mode and pick the mode for the whole document: the first
+    mode giving meaningful text, else the one giving the most. Modes are kept as per-page
+    fallbacks only if they could help: none once the chosen mode has read a meaningful page
+    (every mode reads the same text layer, so a page short in one is short in all), else
+    the modes that read anything at all from the probe page.
+    Returns (plan, {mode: probed text}); plan has "text_mode", "fallback_modes" and "probe_ms"
+    """
+    texts, probe_ms = {}, {}
+    for mode in TEXT_MODES:
+        start = time.perf_counter()
+        try:
+            texts[mode] = page_text(page, mode)
+        except Exception:
+            texts[mode] = ""
+        probe_ms[mode] = round((time.perf_counter() - start) * 1000, 3)
+
+    chosen = next((mode for mode in TEXT_MODES if _meaningful(texts[mode])), None)
+    if chosen:
+        fallbacks = []
     else:
-        # Generic mock data
-        return {
-            "licence_number": "X111222333",
-            "name": "TEST, DRIVER",
-            "birth_date": "01/01/1990",  # DD/MM/YYYY format
-            "gender": "M",
-            "address": "999 TEST ST\nTORONTO ON M1A1A1",
-            "convictions": [],
-            "expiry_date": "01/01/2028",  # DD/MM/YYYY format
-            "issue_date": "01/01/2023"  # DD/MM/YYYY format
-        }
-
-def extract_text_robust(pdf_document):
-    """
-    Extract text from PDF using multiple methods for better compatibility
+        chosen = max(TEXT_MODES, key=lambda mode: len(texts[mode].strip()))
+        fallbacks = [mode for mode in TEXT_MODES if mode != chosen and texts[mode].strip()]
+    return {"text_mode": chosen, "fallback_modes": fallbacks, "probe_ms": probe_ms}, texts
+
+def extract_text_robust(pdf_document, ocr_texts=None, metadata=None):
     """
+    Extract text from PDF using multiple methods for better compatibility.
+    The first page read is probed to plan one text mode for the document (see
+    plan_text_extraction); other modes are only tried on pages where it reads nothing.
+    Pages without meaningful text are left out.
+    ocr_texts: {page number: OCR text} used for scanned pages instead of their text layer
+    metadata: optional dict, filled with the plan, the pages that needed a fallback mode
+              and the extraction time
+    """
+    start = time.perf_counter()
     text = ""
+    plan = None
+    fallback_pages = []
     
     for page_num in range(len(pdf_document)):
+        if ocr_texts and page_num in ocr_texts:
+            text += ocr_texts[page_num]
+            continue
         page = pdf_document.load_page(page_num)
         
-        # Try different text extraction methods
-        try:
-            # Method 1: Standard text extraction
-            page_text = page.get_text()
-            if page_text and len(page_text.strip()) > 100:  # Check if we got meaningful text
-                text += page_text
-                continue
-        except:
-            pass
+        if plan is None:
+            plan, probed = plan_text_extraction(page)
+            read = probed.get
+        else:
+            read = lambda mode: _safe_page_text(page, mode)
         
-        try:
-            # Method 2: Text extraction with different parameters
-            page_text = page.get_text("text")
-            if page_text and len(page_text.strip()) > 100:
-                text += page_text
-                continue
-        except:
-            pass
-        
-        try:
-            # Method 3: Extract text blocks
-            blocks = page.get_text("dict")
-            page_text = ""
-            for block in blocks.get("blocks", []):
-                if "lines" in block:
-                    for line in block["lines"]:
-                        for span in line.get("spans", []):
-                            page_text += span.get("text", "") + " "
-            if page_text and len(page_text.strip()) > 100:
-                text += page_text
-                continue
-        except:
-            pass
-        
-        try:
-            # Method 4: Extract by words
-            words = page.get_text("words")
-            page_text = " ".join([word[4] for word in words if word[4]])
-            if page_text and len(page_text.strip()) > 100:
-                text += page_text
-                continue
-        except:
-            pass
+        candidate = read(plan["text_mode"])
+        if not candidate.strip() and plan["fallback_modes"]:
+            # The planned mode read nothing here; try the others, cheapest first
+            fallback_pages.append(page_num + 1)
+            for mode in plan["fallback_modes"]:
+                candidate = read(mode)
+                if _meaningful(candidate):
+                    break
+        if _meaningful(candidate):
+            text += candidate
     
+    if metadata is not None:
+        metadata.update(plan or {"text_mode": None, "fallback_modes": [], "probe_ms": {}})
+        metadata["fallback_pages"] = fallback_pages
+        metadata["extraction_ms"] = round((time.perf_counter() - start) * 1000, 3)
     return text
 
+def _safe_page_text(page, mode):
+    try:
+        return page_text(page, mode)
+    except Exception:
+        return ""
+
 def extract_text_alternative(pdf_path):
     """
     Alternative text extraction method using different PyMuPDF parameters
     """
     try:
-        pdf_document = fitz.open(pdf_path)
+        pdf_document = open_pdf(pdf_path)
         text = ""
         
         for page_num in range(len(pdf_document)):
@@ -522,7 +678,7 @@ def extract_text_alternative(pdf_path):
                 import re
                 text_content = re.sub(r'<[^>]+>', '', html_text)
                 text += text_content
-            except:
+            except Exception:
                 pass
             
             # If still no text, try to extract images and OCR (basic approach)
@@ -530,12 +686,12 @@ def extract_text_alternative(pdf_path):
                 try:
                     # Get text with different parameters
                     text += page.get_text("text", sort=True)
-                except:
+                except Exception:
                     pass
         
         pdf_document.close()
         return text
-    except:
+    except Exception:
         return ""
 
 def extract_mvr_data_robust(path):
@@ -554,43 +710,50 @@ def extract_mvr_data_robust(path):
         "status": None,
         "release_date": None  # New field for Release Date
     }
+    track_partial(result)
 
     try:
         # Strategy 1: Try standard extraction
-        pdf_document = fitz.open(path)
-        text = extract_text_robust(pdf_document)
-        pdf_document.close()
+        pdf_document = open_pdf(path)
+        try:
+            # Scanned pages (no text layer) are read by OCR
+            ocr_texts = ocr_short_pages(pdf_document)
+            metadata = {}
+            text = extract_text_robust(pdf_document, ocr_texts, metadata)
+            result["extraction_metadata"] = metadata
+        finally:
+            pdf_document.close()
+        mark_ocr_pages(result, ocr_texts)
         
-        if len(text.strip()) < 200:
+        if len(text.strip()) < 200 and not ocr_texts:
             # Strategy 2: Try alternative text extraction
             text = extract_text_alternative(path)
         
-        if len(text.strip()) < 200:
-            # Strategy 3: Try alternative text extraction again
-            text = extract_text_alternative(path)
-        
         # Save debug text
-        debug_filename = f"MVR_debug_{os.path.basename(path)}.txt"
+        debug_filename = f"MVR_debug_{source_name(path)}.txt"
         with open(debug_filename, "w", encoding="utf-8") as f:
             f.write(text)
         
         print(f"Extracted {len(text)} characters from {path}")
         
+        # Index the field labels once; the fallbacks reuse the same normalized text
+        index = MVRLabelIndex(text)
+        
         # Extract data using improved patterns
-        extract_mvr_fields_improved(text, result)
+        extract_mvr_fields_improved(text, result, index)
         
         # Validate and attempt to fix any issues
-        validate_and_fix_extracted_data(result, text, path)
+        validate_and_fix_extracted_data(result, text, path, index)
         
         # If still missing critical data, try fallback extraction
         if not result.get("name") or not result.get("licence_number"):
             print("Critical data missing, attempting fallback extraction...")
-            fallback_extraction(text, result)
+            fallback_extraction(text, result, index)
         
     except Exception as e:
         print(f"Error during MVR extraction from {path}: {e}")
-        # Return mock data for testing
-        result = get_mock_mvr_data(path)
+        # Keep whatever was extracted; never substitute made-up data
+        result["extraction_error"] = str(e)
     
     # Save result for debugging
     with open("mvr_result.json", "w") as f:
@@ -598,7 +761,7 @@ def extract_mvr_data_robust(path):
     
     return result
 
-def validate_and_fix_extracted_data(result, text, path):
+def validate_and_fix_extracted_data(result, text, path, index=None):
     """
     Validate extracted data and attempt to fix common issues
     """
@@ -609,7 +772,7 @@ def validate_and_fix_extracted_data(result, text, path):
             print(f"WARNING: Name '{result['name']}' contains date indicators - attempting to fix")
             result["name"] = None
             # Try to re-extract name with more specific patterns
-            extract_name_fallback(text, result)
+            extract_name_fallback(text, result, index)
     
     # Check if license number is reasonable
     if result.get("licence_number"):
@@ -623,22 +786,26 @@ def validate_and_fix_extracted_data(result, text, path):
     if missing_fields:
         print(f"WARNING: Missing essential fields: {missing_fields}")
 
-def extract_name_fallback(text, result):
+def extract_name_fallback(text, result, index=None):
     """
     Fallback name extraction using different strategies
     """
-    text_normalized = text.upper()
+    if index is None:
+        index = MVRLabelIndex(text)
+    text_normalized = index.text
     
     # Strategy 1: Look for name in the driving record section
-    driving_record_match = re.search(r'ONTARIO DRIVING RECORD.*?NAME:\s*([A-Z,\-]+(?:\s+[A-Z,\-]+)*)', text_normalized, re.DOTALL)
-    if driving_record_match:
-        name = driving_record_match.group(1).strip()
-        if len(name) > 3 and not is_likely_date(name):
-            result["name"] = name
-            return
+    driving_record = text_normalized.find('ONTARIO DRIVING RECORD')
+    if driving_record != -1:
+        driving_record_match = index.find("NAME:", NAME_STEPS.steps[0][1], driving_record + len('ONTARIO DRIVING RECORD'))
+        if driving_record_match:
+            name = driving_record_match.group(1).strip()
+            if len(name) > 3 and not is_likely_date(name):
+                result["name"] = name
+                return
     
     # Strategy 2: Look for name in the summary table at the end
-    summary_match = re.search(r'([A-Z\-]+,[A-Z\-]+)\s+\d{2}/\d{2}/\d{4}\s+\d{2}/\d{2}/\d{4}', text_normalized)
+    summary_match = index.search(SUMMARY_ROW_PATTERN)
     if summary_match:
         name = summary_match.group(1).strip()
         if len(name) > 3 and not is_likely_date(name):
@@ -646,27 +813,27 @@ def extract_name_fallback(text, result):
             return
     
     # Strategy 3: Look for name after license number
-    license_name_match = re.search(r'([A-Z0-9\-]+)\s+([A-Z\-]+,[A-Z\-]+)', text_normalized)
+    license_name_match = LICENCE_NAME_PATTERN.search(text_normalized)
     if license_name_match:
         name = license_name_match.group(2).strip()
         if len(name) > 3 and not is_likely_date(name):
             result["name"] = name
             return
 
-def fallback_extraction(text, result):
+def fallback_extraction(text, result, index=None):
     """
     Fallback extraction using different strategies when primary extraction fails
     """
-    text_normalized = text.upper()
+    if index is None:
+        index = MVRLabelIndex(text)
     
     # Priority 1: Try to extract XREF From field
-    xref_match = re.search(r'XREF FROM:\s*([A-Z0-9\-]+)', text_normalized, re.IGNORECASE)
+    xref_match = index.find("XREF FROM:", XREF_STEPS.steps[0][1])
     if xref_match and not result.get("licence_number"):
         result["licence_number"] = xref_match.group(1).strip()
     
     # Priority 2: Try to extract from the summary table at the end
-    summary_pattern = r'([A-Z0-9\-]+)\s+([A-Z\-]+,[A-Z\-]+)\s+(\d{2}/\d{2}/\d{4})\s+(\d{2}/\d{2}/\d{4})'
-    summary_match = re.search(summary_pattern, text_normalized)
+    summary_match = index.search(SUMMARY_TABLE_PATTERN)
     
     if summary_match:
         if not result.get("licence_number"):
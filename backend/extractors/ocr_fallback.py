@@ -0,0 +1,156 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import fitz  # PyMuPDF
+
+# OCR is optional: without pytesseract (and the tesseract binary) scanned pages stay unread
+try:
+    import cv2
+    import pytesseract
+except ImportError:
+    cv2 = None
+    pytesseract = None
+
+# A page whose text layer has fewer characters than this is treated as scanned and OCR'd
+OCR_MIN_PAGE_CHARS = int(os.environ.get("OCR_MIN_PAGE_CHARS", 25))
+# Resolution the scanned pages are rendered at for OCR
+OCR_DPI = int(os.environ.get("OCR_DPI", 300))
+# Worker processes OCR-ing the scanned pages of one document side by side
+OCR_WORKERS = int(os.environ.get("OCR_WORKERS", min(4, os.cpu_count() or 1)))
+# OCR text kept in memory per page-image hash; OCR_CACHE_DIR also keeps it on disk
+OCR_CACHE_SIZE = int(os.environ.get("OCR_CACHE_SIZE", 256))
+OCR_CACHE_DIR = os.environ.get("OCR_CACHE_DIR")
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_tesseract_found = None
+
+
+def ocr_available():
+    """Whether pytesseract, OpenCV and the tesseract binary are all installed"""
+    global _tesseract_found
+    if pytesseract is None or cv2 is None:
+        return False
+    if _tesseract_found is None:
+        try:
+            pytesseract.get_tesseract_version()
+            _tesseract_found = True
+        except Exception:
+            _tesseract_found = False
+    return _tesseract_found
+
+
+def needs_ocr(page_text, min_chars=OCR_MIN_PAGE_CHARS):
+    """A page with an empty or near-empty text layer"""
+    return len((page_text or "").strip()) < min_chars
+
+
+def ocr_short_pages(pdf_document, start=0, min_chars=OCR_MIN_PAGE_CHARS):
+    """
+    OCR the pages of an open PDF (from page start on) whose text layer is shorter than
+    min_chars; pages with a real text layer are never rendered.
+    Returns {page number: OCR text} for the pages OCR could read
+    """
+    short_pages = [
+        page_num for page_num in range(start, len(pdf_document))
+        if needs_ocr(pdf_document.load_page(page_num).get_text(), min_chars)
+    ]
+    if not short_pages:
+        return {}
+    if not ocr_available():
+        print(f"{len(short_pages)} page(s) have no text layer; install pytesseract and tesseract to OCR them")
+        return {}
+    return ocr_pages(pdf_document, short_pages)
+
+
+def ocr_pages(pdf_document, page_numbers):
+    """
+    OCR the given pages. Each page is rendered and hashed here; pages seen before come from
+    the cache, the rest are OCR'd in parallel worker processes.
+    Returns {page number: OCR text}, leaving out pages where OCR found no text
+    """
+    images = {}
+    texts = {}
+    for page_num in page_numbers:
+        pixmap = pdf_document.load_page(page_num).get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY)
+        image_hash = hashlib.sha256(pixmap.samples).hexdigest()
+        cached = _cached_text(image_hash)
+        if cached is None:
+            images[page_num] = (image_hash, pixmap.tobytes("png"))
+        else:
+            texts[page_num] = cached
+
+    if images:
+        pending = list(images.items())
+        workers = min(OCR_WORKERS, len(pending))
+        if workers <= 1:
+            recognised = [ocr_page_image(png) for _, (_, png) in pending]
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            try:
+                recognised = list(pool.map(ocr_page_image, [png for _, (_, png) in pending]))
+            finally:
+                # Don't wait for the workers if the document's time budget interrupted us
+                pool.shutdown(wait=False, cancel_futures=True)
+        for (page_num, (image_hash, _)), text in zip(pending, recognised):
+            _cache_text(image_hash, text)
+            texts[page_num] = text
+
+    return {page_num: text for page_num, text in sorted(texts.items()) if text.strip()}
+
+
+def preprocess_page_image(image):
+    """Clean up a grayscale scan for OCR: remove speckle noise, then binarize with Otsu's threshold"""
+    image = cv2.medianBlur(image, 3)
+    _, image = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    return image
+
+
+def ocr_page_image(png_bytes):
+    """OCR one rendered page (PNG bytes); runs in a worker process"""
+    image = cv2.imdecode(np.frombuffer(png_bytes, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return ""
+    return pytesseract.image_to_string(preprocess_page_image(image))
+
+
+def _cached_text(image_hash):
+    with _cache_lock:
+        if image_hash in _cache:
+            _cache.move_to_end(image_hash)
+            return _cache[image_hash]
+    if OCR_CACHE_DIR:
+        try:
+            with open(os.path.join(OCR_CACHE_DIR, f"{image_hash}.txt"), "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        _cache_text(image_hash, text, write_through=False)
+        return text
+    return None
+
+
+def _cache_text(image_hash, text, write_through=True):
+    with _cache_lock:
+        _cache[image_hash] = text
+        _cache.move_to_end(image_hash)
+        while len(_cache) > OCR_CACHE_SIZE:
+            _cache.popitem(last=False)
+    if OCR_CACHE_DIR and write_through:
+        try:
+            os.makedirs(OCR_CACHE_DIR, exist_ok=True)
+            with open(os.path.join(OCR_CACHE_DIR, f"{image_hash}.txt"), "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Could not write OCR cache entry {image_hash}: {e}")
+
+
+def mark_ocr_pages(result, ocr_texts):
+    """Flag an extraction result as (partly) read by OCR, with the 1-based OCR'd pages"""
+    if ocr_texts:
+        result["ocr_derived"] = True
+        result["ocr_pages"] = sorted(page_num + 1 for page_num in ocr_texts)
+    return result
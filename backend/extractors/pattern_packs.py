@@ -0,0 +1,261 @@
+import os
+import re
+import json
+import threading
+import time
+
+# Set PATTERN_PROFILING=1 to try every pattern of a pack on every text, which records
+# which patterns match together and whether they agree (needed for a learned order)
+PATTERN_PROFILING = os.environ.get("PATTERN_PROFILING", "").lower() in ("1", "true", "yes")
+
+# JSON file of learned pattern orders ({pack name: [pattern, ...]}) applied at import
+PATTERN_ORDER_FILE = os.environ.get("PATTERN_ORDER_FILE")
+
+PATTERN_PACKS = {}
+_stats_lock = threading.Lock()
+
+
+class PatternPack:
+    """
+    A named list of fallback patterns for one field, compiled once at import and tried in
+    priority order. Each try is counted per pattern (tries, hits and time spent) in the
+    registry, so patterns that never match real documents show up in pattern_stats().
+    The declared order is the priority; a learned order (see learned_order) can replace it.
+    """
+
+    def __init__(self, name, patterns, flags=0):
+        self.name = name
+        self.patterns = [re.compile(pattern, flags) if isinstance(pattern, str) else pattern for pattern in patterns]
+        self.order = list(range(len(self.patterns)))
+        self.reset_stats()
+        register_pack(self)
+
+    def reset_stats(self):
+        count = len(self.patterns)
+        self.tries = [0] * count
+        self.hits = [0] * count
+        self.seconds = [0.0] * count
+        # Texts tried with every pattern, and per pair how often both matched with different values
+        self.profiled = 0
+        self.disagreements = [[0] * count for _ in range(count)]
+
+    def record(self, position, matched, seconds):
+        """Count one try of the pattern at declared position"""
+        with _stats_lock:
+            self.tries[position] += 1
+            self.seconds[position] += seconds
+            if matched:
+                self.hits[position] += 1
+
+    def matches(self, text, pos=0, endpos=None):
+        """
+        Yield (pattern, match) for each pattern that matches text[pos:endpos], in order.
+        Callers that accept the first match simply stop iterating; later patterns aren't tried.
+        """
+        if endpos is None:
+            endpos = len(text)
+        if PATTERN_PROFILING:
+            yield from self._profiled_matches(text, pos, endpos)
+            return
+
+        for position in self.order:
+            pattern = self.patterns[position]
+            start = time.perf_counter()
+            match = pattern.search(text, pos, endpos)
+            self.record(position, match is not None, time.perf_counter() - start)
+            if match:
+                yield pattern, match
+
+    def search(self, text, pos=0, endpos=None):
+        """First match in order, or None"""
+        for _, match in self.matches(text, pos, endpos):
+            return match
+        return None
+
+    def _profiled_matches(self, text, pos, endpos):
+        found = {}
+        for position, pattern in enumerate(self.patterns):
+            start = time.perf_counter()
+            match = pattern.search(text, pos, endpos)
+            self.record(position, match is not None, time.perf_counter() - start)
+            if match:
+                found[position] = match
+
+        with _stats_lock:
+            self.profiled += 1
+            for first in found:
+                for second in found:
+                    if first < second and found[first].groups() != found[second].groups():
+                        self.disagreements[first][second] += 1
+
+        for position in self.order:
+            if position in found:
+                yield self.patterns[position], found[position]
+
+    def learned_order(self):
+        """
+        Declared positions reordered by how often each pattern matched in profiled texts, most
+        often first. A pattern only moves ahead of a higher-priority one if the two never matched
+        the same text with different values, so the profiled texts extract exactly as before.
+        Without profiling data the declared order is kept.
+        """
+        if not self.profiled:
+            return list(range(len(self.patterns)))
+
+        remaining = list(range(len(self.patterns)))
+        order = []
+        while remaining:
+            # Patterns whose higher-priority rivals are all placed already
+            ready = [
+                position for position in remaining
+                if not any(self.disagreements[earlier][position] for earlier in remaining if earlier < position)
+            ]
+            best = max(ready, key=lambda position: (self.hits[position], -position))
+            order.append(best)
+            remaining.remove(best)
+        return order
+
+    def apply_order(self, patterns):
+        """
+        Use the order given as pattern strings; patterns not listed keep their relative
+        order after the listed ones. Unknown patterns are ignored.
+        """
+        order = []
+        for pattern in patterns:
+            # Two steps can share a pattern; each listed copy takes the next unused one
+            for position, compiled in enumerate(self.patterns):
+                if compiled.pattern == pattern and position not in order:
+                    order.append(position)
+                    break
+        self.order = order + [position for position in range(len(self.patterns)) if position not in order]
+
+    def stats(self):
+        return {
+            "order": [self.patterns[position].pattern for position in self.order],
+            "learned_order": [self.patterns[position].pattern for position in self.learned_order()],
+            "profiled_texts": self.profiled,
+            "patterns": [
+                {
+                    "pattern": pattern.pattern,
+                    "position": position,
+                    "tries": self.tries[position],
+                    "hits": self.hits[position],
+                    "hit_rate": self.hits[position] / self.tries[position] if self.tries[position] else None,
+                    "total_ms": self.seconds[position] * 1000
+                }
+                for position, pattern in enumerate(self.patterns)
+            ]
+        }
+
+
+class StepPack(PatternPack):
+    """
+    A pattern pack whose entries are field steps with extra lookup data (the MVR label steps).
+    pattern_of(step) gives the pattern the registry shows and orders by; the caller runs
+    each step and reports it with record().
+    """
+
+    def __init__(self, name, steps, pattern_of):
+        self.steps = list(steps)
+        super().__init__(name, [pattern_of(step) for step in self.steps])
+
+    def ordered_steps(self):
+        """(declared position, step) in the current order"""
+        return [(position, self.steps[position]) for position in self.order]
+
+
+def register_pack(pack):
+    """Add a pack to the registry, applying its learned order if the order file has one"""
+    PATTERN_PACKS[pack.name] = pack
+    if pack.name in _loaded_orders:
+        pack.apply_order(_loaded_orders[pack.name])
+    return pack
+
+
+def pattern_stats():
+    """Per-pattern tries, hits and time of every registered pack"""
+    with _stats_lock:
+        return {name: pack.stats() for name, pack in sorted(PATTERN_PACKS.items())}
+
+
+def reset_pattern_stats():
+    with _stats_lock:
+        for pack in PATTERN_PACKS.values():
+            pack.reset_stats()
+
+
+def drain_pattern_stats():
+    """
+    The raw counters of every pack that was tried, which are then reset. Worker processes send
+    these back so the counts of all documents end up in the serving process (merge_pattern_stats).
+    """
+    with _stats_lock:
+        drained = {}
+        for name, pack in PATTERN_PACKS.items():
+            if any(pack.tries):
+                drained[name] = {
+                    "tries": pack.tries,
+                    "hits": pack.hits,
+                    "seconds": pack.seconds,
+                    "profiled": pack.profiled,
+                    "disagreements": pack.disagreements
+                }
+                pack.reset_stats()
+        return drained
+
+
+def merge_pattern_stats(drained):
+    """Add counters from drain_pattern_stats (e.g. of a worker process) to this process's packs"""
+    with _stats_lock:
+        for name, counters in drained.items():
+            pack = PATTERN_PACKS.get(name)
+            if pack is None or len(counters["tries"]) != len(pack.patterns):
+                continue
+            for position in range(len(pack.patterns)):
+                pack.tries[position] += counters["tries"][position]
+                pack.hits[position] += counters["hits"][position]
+                pack.seconds[position] += counters["seconds"][position]
+                for other in range(len(pack.patterns)):
+                    pack.disagreements[position][other] += counters["disagreements"][position][other]
+            pack.profiled += counters["profiled"]
+
+
+def learned_orders():
+    """{pack name: [pattern, ...]} in learned order, for packs where it differs from the current one"""
+    orders = {}
+    for name, pack in sorted(PATTERN_PACKS.items()):
+        order = pack.learned_order()
+        if order != pack.order:
+            orders[name] = [pack.patterns[position].pattern for position in order]
+    return orders
+
+
+def current_orders():
+    """{pack name: [pattern, ...]} for every pack not in its declared order"""
+    return {
+        name: [pack.patterns[position].pattern for position in pack.order]
+        for name, pack in sorted(PATTERN_PACKS.items())
+        if pack.order != list(range(len(pack.patterns)))
+    }
+
+
+def apply_pattern_orders(orders):
+    """Apply {pack name: [pattern, ...]} to the registered packs (and to packs registered later)"""
+    _loaded_orders.update(orders)
+    for name, patterns in orders.items():
+        if name in PATTERN_PACKS:
+            PATTERN_PACKS[name].apply_order(patterns)
+
+
+def _load_order_file(path):
+    if not path:
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Could not load pattern order file {path}: {e}")
+        return {}
+
+
+_loaded_orders = _load_order_file(PATTERN_ORDER_FILE)
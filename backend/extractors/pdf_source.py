@@ -0,0 +1,212 @@
+import os
+import tempfile
+import threading
+from multiprocessing import shared_memory
+import fitz  # PyMuPDF
+
+# Uploads up to this size are kept in memory; larger ones are spilled to a temporary file
+UPLOAD_SPILL_BYTES = int(os.environ.get("UPLOAD_SPILL_BYTES", 16 * 1024 * 1024))
+UPLOAD_CHUNK_BYTES = 256 * 1024
+# In-memory uploads at least this large reach extraction workers through shared memory instead of being pickled
+SHARED_PDF_MIN_BYTES = int(os.environ.get("SHARED_PDF_MIN_BYTES", 2 * 1024 * 1024))
+
+
+class PdfUpload:
+    """
+    An uploaded PDF, held in memory (data) or, above UPLOAD_SPILL_BYTES, in a temporary file
+    (path). The extractors accept it wherever they take a PDF path (see open_pdf); worker
+    processes receive small uploads' bytes with the task and large ones through shared
+    memory (see share_pdf) instead of re-reading a saved upload.
+    digest is set for uploads backed by the blob store, which owns their file.
+    """
+
+    def __init__(self, name, data=None, path=None, digest=None):
+        self.name = name
+        self.data = data
+        self.path = path
+        self.digest = digest
+
+    @property
+    def size(self):
+        return len(self.data) if self.data is not None else os.path.getsize(self.path)
+
+    def open(self):
+        if self.data is not None:
+            return fitz.open(stream=self.data, filetype="pdf")
+        return fitz.open(self.path)
+
+    def read(self):
+        """The PDF's bytes"""
+        if self.data is not None:
+            return self.data
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def cleanup(self):
+        """Remove the spilled temporary file, if any (blob store files are left to the store)"""
+        if self.digest is None and self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                print(f"Could not remove spilled upload {self.path}: {e}")
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        where = f"{len(self.data)} bytes in memory" if self.data is not None else self.path
+        return f"PdfUpload({self.name!r}, {where})"
+
+
+def read_upload(file, name=None, spill_bytes=UPLOAD_SPILL_BYTES):
+    """
+    Read an uploaded file (a Werkzeug FileStorage or any object with a binary stream/read)
+    into a PdfUpload, in memory unless it grows past spill_bytes
+    """
+    stream = getattr(file, "stream", file)
+    name = name or getattr(file, "filename", None) or "upload.pdf"
+    chunks = []
+    size = 0
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            return PdfUpload(name, data=b"".join(chunks))
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > spill_bytes:
+            break
+
+    # Too large to keep in memory: write what was read and the rest to a temporary file
+    handle, path = tempfile.mkstemp(suffix=".pdf", prefix="upload_")
+    with os.fdopen(handle, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        chunks = None
+        while True:
+            chunk = stream.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            f.write(chunk)
+    return PdfUpload(name, path=path)
+
+
+class SharedPdf:
+    """
+    A PDF's bytes in a multiprocessing.shared_memory segment. It pickles to just its segment name
+    and size, so an extraction worker receives a handle rather than the bytes and reads them from
+    the segment itself (PyMuPDF only opens bytes, not a memoryview of the segment).
+    The creating process counts the jobs using the segment (acquire/release) and unlinks it
+    when the last one ends; a worker detaches once its job is done.
+    """
+
+    def __init__(self, name, segment, size):
+        self.name = name
+        self.segment = segment
+        self.size = size
+        self._memory = None
+        self._view = None
+        self._refs = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def create(cls, upload):
+        """Copy an upload's bytes into a new segment"""
+        data = upload.read()
+        memory = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        memory.buf[:len(data)] = data
+        shared = cls(upload.name, memory.name, len(data))
+        shared._memory = memory
+        return shared
+
+    def __getstate__(self):
+        return {"name": self.name, "segment": self.segment, "size": self.size}
+
+    def __setstate__(self, state):
+        self.__init__(state["name"], state["segment"], state["size"])
+
+    def _buffer(self):
+        if self._memory is None:
+            self._memory = shared_memory.SharedMemory(name=self.segment)
+        if self._view is None:
+            self._view = self._memory.buf[:self.size]
+        return self._view
+
+    def open(self):
+        return fitz.open(stream=self.read(), filetype="pdf")
+
+    def read(self):
+        return bytes(self._buffer())
+
+    def acquire(self):
+        """Count one more job using the segment"""
+        with self._lock:
+            self._refs += 1
+        return self
+
+    def release(self):
+        """A job using the segment ended; the last one to end removes the segment"""
+        with self._lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+        self._close(unlink=True)
+
+    def detach(self):
+        """Unmap the segment in this process (a worker, once its job is done)"""
+        self._close(unlink=False)
+
+    def cleanup(self):
+        self.detach()
+
+    def _close(self, unlink):
+        if self._memory is None:
+            return
+        if self._view is not None:
+            try:
+                self._view.release()
+            except BufferError:
+                # A document opened from the segment was never closed; the mapping goes with the process
+                print(f"Shared PDF {self.name} is still in use, leaving it mapped")
+                return
+            self._view = None
+        self._memory.close()
+        if unlink:
+            try:
+                self._memory.unlink()
+            except FileNotFoundError:
+                pass
+        self._memory = None
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"SharedPdf({self.name!r}, {self.segment}, {self.size} bytes)"
+
+
+def share_pdf(source, min_bytes=SHARED_PDF_MIN_BYTES):
+    """
+    A SharedPdf (with one job counted) for an in-memory upload of at least min_bytes, for handing
+    to a worker process; None for paths, spilled or small uploads, or if no segment can be made
+    """
+    if not isinstance(source, PdfUpload) or source.data is None or len(source.data) < min_bytes:
+        return None
+    try:
+        return SharedPdf.create(source).acquire()
+    except OSError as e:
+        print(f"Could not place {source.name} in shared memory, sending its bytes instead: {e}")
+        return None
+
+
+def open_pdf(source):
+    """Open a PDF given as a path, a PdfUpload or a SharedPdf"""
+    if isinstance(source, (PdfUpload, SharedPdf)):
+        return source.open()
+    return fitz.open(source)
+
+
+def source_name(source):
+    """File name of a PDF given as a path, a PdfUpload or a SharedPdf"""
+    if isinstance(source, (PdfUpload, SharedPdf)):
+        return source.name
+    return os.path.basename(source)
@@ -1,16 +1,47 @@
-import fitz  # PyMuPDF
 import re
 import json
+from bisect import bisect_left
+from extractors.time_budget import track_partial
+from extractors.pattern_packs import PatternPack
+from extractors.table_extractor import page_rows, read_tables
+from extractors.pdf_source import open_pdf
+
+# Every driver/vehicle header and every word that can end a driver or vehicle section.
+# One pass over these splits the quote into sections (see QuoteSectionIndex).
+QUOTE_SECTION_MARKER = re.compile(
+    r"(?P<word>Driver|Vehicle)(?: (?P<number>\d+) of (?P<total>\d+)(?P<header> \| )?)?|Coverage(?P<plural>s)?|Effective"
+)
+DRIVER_NAME_PATTERN = re.compile(r"[A-Za-z\s\-]+")
+
+EFFECTIVE_DATE_PATTERNS = PatternPack("quote.effective_date", (
+    r"Effective Date:\s*(\d{2}/\d{2}/\d{4})",
+    r"Effective:\s*(\d{2}/\d{2}/\d{4})"
+))
+# Street address, then the city on the same or the next line
+ADDRESS_PATTERNS = PatternPack("quote.address", (
+    r"(\d+\s+[A-Za-z\s]+(?:Ave|St|Street|Avenue|Road|Rd|Dr|Drive|Blvd|Boulevard|Way|Lane|Ln|Court|Ct|Place|Pl))\s*,?\s*([A-Za-z\s]+)",
+    r"(\d+\s+[A-Za-z\s]+)\n([A-Za-z\s]+),\s+[A-Z]{2}"
+))
+
+# Coverage names picked up from the coverage section, in reporting order
+COVERAGE_LABELS = [
+    r"Bodily Injury|Property Damage|Accident Benefits|All Perils|Direct Compensation|Uninsured Automobile|Accident Waiver|Loss of Use|Liab to Unowned Veh|Family Protection",
+    r"Third Party Liability|Collision|Comprehensive"
+]
+COVERAGE_LABEL_PATTERNS = [re.compile(f"({labels})", re.IGNORECASE) for labels in COVERAGE_LABELS]
 
 def extract_quote_data(path, mvr_data_list=None):
     # Use PyMuPDF instead of pdfplumber
-    doc = fitz.open(path)
+    doc = open_pdf(path)
     
     # Extract text with better structure preservation
     text = ""
-    for page in doc:
+    rows = []
+    for page_number, page in enumerate(doc):
         # Get text with layout preservation - this maintains spatial relationships better
         text += page.get_text("text")
+        # Table rows from word coordinates keep a coverage's name and amounts together
+        rows.extend(page_rows(page, page_number))
     
     doc.close()
     
@@ -30,17 +61,12 @@ def extract_quote_data(path, mvr_data_list=None):
         "coverages": [],
         "address": None
     }
+    track_partial(result)
 
     # Effective Date - more specific patterns
-    effective_patterns = [
-        r"Effective Date:\s*(\d{2}/\d{2}/\d{4})",
-        r"Effective:\s*(\d{2}/\d{2}/\d{4})"
-    ]
-    for pattern in effective_patterns:
-        effective_date_match = re.search(pattern, text)
-        if effective_date_match:
-            result["quote_effective_date"] = effective_date_match.group(1)
-            break
+    effective_date_match = EFFECTIVE_DATE_PATTERNS.search(text)
+    if effective_date_match:
+        result["quote_effective_date"] = effective_date_match.group(1)
 
     # Prepared By - more specific pattern
     prepared_by_match = re.search(r"Prepared[^\n]*by\s+([A-Za-z\s]+?)(?:\s+Effective|\n)", text)
@@ -48,22 +74,17 @@ def extract_quote_data(path, mvr_data_list=None):
         result["quote_prepared_by"] = prepared_by_match.group(1).strip()
 
     # Address - look for street address pattern
-    address_patterns = [
-        r"(\d+\s+[A-Za-z\s]+(?:Ave|St|Street|Avenue|Road|Rd|Dr|Drive|Blvd|Boulevard|Way|Lane|Ln|Court|Ct|Place|Pl))\s*,?\s*([A-Za-z\s]+)",
-        r"(\d+\s+[A-Za-z\s]+)\n([A-Za-z\s]+),\s+[A-Z]{2}"
-    ]
-    for pattern in address_patterns:
-        address_match = re.search(pattern, text)
-        if address_match:
-            result["address"] = f"{address_match.group(1).strip()}, {address_match.group(2).strip()}"
-            break
-
-    # Extract drivers - simple approach
-    driver_matches = re.findall(r"Driver \d+ of \d+ \| ([A-Za-z\s\-]+)", text)
-    for driver_name in driver_matches:
-        driver_name = driver_name.strip()
+    address_match = ADDRESS_PATTERNS.search(text)
+    if address_match:
+        result["address"] = f"{address_match.group(1).strip()}, {address_match.group(2).strip()}"
+
+    # Locate every driver and vehicle section once
+    index = QuoteSectionIndex(text)
+
+    # Extract drivers - each from its own section
+    for driver_name, driver_section in index.driver_sections():
         if driver_name and len(driver_name.split()) >= 2:
-            driver_details = _extract_driver_details(text, driver_name)
+            driver_details = _extract_driver_details(text, driver_name, section=driver_section)
             if driver_details:
                 result["drivers"].append(driver_details)
 
@@ -76,9 +97,7 @@ def extract_quote_data(path, mvr_data_list=None):
             result["applicant"]["last_name"] = " ".join(name_parts[1:])
 
     # Vehicles - Look for VIN patterns and surrounding info
-    vehicle_sections = re.findall(r"Vehicle (\d+) of (\d+) \| (.*?)(?=Vehicle \d+ of \d+|Driver|Coverages|$)", text, re.DOTALL)
-    
-    for vehicle_num, total_vehicles, vehicle_text in vehicle_sections:
+    for vehicle_num, total_vehicles, vehicle_text in index.vehicle_sections():
         vehicle_info = _extract_vehicle_details(vehicle_text)
         if vehicle_info:
             result["vehicles"].append(vehicle_info)
@@ -98,41 +117,6 @@ def extract_quote_data(path, mvr_data_list=None):
                 vehicle_info["vin"] = vin
                 result["vehicles"].append(vehicle_info)
 
-    # INTEGRATE MVR CONVICTIONS - This is the key fix!
-    if mvr_data_list:
-        print(f"Quote extractor: Processing {len(mvr_data_list)} MVR records for conviction integration")
-        for mvr_data in mvr_data_list:
-            if mvr_data and mvr_data.get("convictions"):
-                print(f"Quote extractor: Found {len(mvr_data['convictions'])} convictions in MVR for {mvr_data.get('name', 'Unknown')}")
-                for conviction in mvr_data["convictions"]:
-                    # Convert MVR date format (dd/mm/yyyy) to quote format (mm/dd/yyyy)
-                    mvr_date = conviction.get("offence_date")
-                    if mvr_date:
-                        # Parse dd/mm/yyyy and convert to mm/dd/yyyy
-                        try:
-                            day, month, year = mvr_date.split('/')
-                            quote_date = f"{month}/{day}/{year}"
-                            
-                            # Add conviction with converted date format
-                            result["convictions"].append({
-                                "description": conviction.get("description", ""),
-                                "date": quote_date,
-                                "source": "MVR",
-                                "driver_license": mvr_data.get("licence_number")
-                            })
-                            print(f"Quote extractor: Integrated MVR conviction: {conviction.get('description', '')} on {quote_date}")
-                        except:
-                            # If date conversion fails, use original date
-                            result["convictions"].append({
-                                "description": conviction.get("description", ""),
-                                "date": mvr_date,
-                                "source": "MVR",
-                                "driver_license": mvr_data.get("licence_number")
-                            })
-                            print(f"Quote extractor: Integrated MVR conviction (date conversion failed): {conviction.get('description', '')} on {mvr_date}")
-    else:
-        print("Quote extractor: No MVR data provided for conviction integration")
-
     # Convictions - Much more specific extraction from quote PDF itself
     # Look for actual conviction patterns in dedicated sections
     conviction_section_patterns = [
@@ -167,7 +151,7 @@ def extract_quote_data(path, mvr_data_list=None):
                                 "source": "Quote"
                             })
     
-    # Remove duplicate convictions
+    # Remove duplicate convictions (MVR convictions are merged in afterwards, see merge_mvr_convictions)
     seen_convictions = set()
     unique_convictions = []
     for conv in result["convictions"]:
@@ -184,7 +168,6 @@ def extract_quote_data(path, mvr_data_list=None):
     # Enhanced Convictions and Suspensions Extraction
     # Look for the specific structure found in the PDF
     convictions_and_suspensions = _extract_convictions_and_suspensions(text)
-    # Merge with existing convictions (don't overwrite MVR convictions)
     for conv in convictions_and_suspensions["convictions"]:
         conv["source"] = "Quote"
         result["convictions"].append(conv)
@@ -194,14 +177,12 @@ def extract_quote_data(path, mvr_data_list=None):
     claims_info = _extract_claims_information(text)
     result["claims"] = claims_info
 
-    # Coverages - more specific extraction
-    coverage_section = re.search(r"Coverage[s]?\s*(.*?)(?=Driver|Vehicle|Effective|$)", text, re.DOTALL | re.IGNORECASE)
+    # Coverages - read from the coverage table rows, else from the text
+    result["coverages"] = _coverages_from_table(read_tables(rows)["coverages"])
+    coverage_section = None if result["coverages"] else re.search(r"Coverage[s]?\s*(.*?)(?=Driver|Vehicle|Effective|$)", text, re.DOTALL | re.IGNORECASE)
     if coverage_section:
         coverage_text = coverage_section.group(1)
-        coverage_patterns = [
-            r"(Bodily Injury|Property Damage|Accident Benefits|All Perils|Direct Compensation|Uninsured Automobile|Accident Waiver|Loss of Use|Liab to Unowned Veh|Family Protection)[^\d]*\$?([\d,]+)",
-            r"(Third Party Liability|Collision|Comprehensive)[^\d]*\$?([\d,]+)"
-        ]
+        coverage_patterns = [rf"({labels})[^\d]*\$?([\d,]+)" for labels in COVERAGE_LABELS]
         
         for pattern in coverage_patterns:
             coverage_matches = re.findall(pattern, coverage_text, re.IGNORECASE)
@@ -211,12 +192,60 @@ def extract_quote_data(path, mvr_data_list=None):
                     "limit": limit.replace(",", "")
                 })
 
+    # Callers that already have the MVRs get them merged straight away
+    if mvr_data_list is not None:
+        merge_mvr_convictions(result, mvr_data_list)
+
     # Save debug info
     with open("quote_result.json", "w") as f:
         json.dump(result, f, indent=4)
 
     return result
 
+def _coverages_from_table(coverage_rows):
+    """Coverages of known types from the coverage table rows, grouped like the text patterns"""
+    coverages = []
+    for label_pattern in COVERAGE_LABEL_PATTERNS:
+        for row in coverage_rows:
+            label_match = label_pattern.search(row.label)
+            if label_match:
+                coverages.append({
+                    "type": label_match.group(1).strip(),
+                    "limit": row.limit
+                })
+    return coverages
+
+
+def merge_mvr_convictions(quote_data, mvr_data_list):
+    """
+    Merge the convictions of every MVR into a quote extracted on its own, ahead of the
+    quote's own convictions. A conviction listed in the quote's Convictions section
+    (description and date only) is dropped when an MVR already has it; the detailed
+    driver convictions (with km/h and severity) are always kept.
+    Returns quote_data, updated in place
+    """
+    mvr_convictions = []
+    if mvr_data_list:
+        print(f"Quote extractor: Processing {len(mvr_data_list)} MVR records for conviction integration")
+        for mvr_data in mvr_data_list:
+            if mvr_data and mvr_data.get("convictions"):
+                print(f"Quote extractor: Found {len(mvr_data['convictions'])} convictions in MVR for {mvr_data.get('name', 'Unknown')}")
+                mvr_convictions.extend(mvr_convictions_for_quote(mvr_data))
+    else:
+        print("Quote extractor: No MVR data provided for conviction integration")
+
+    seen_convictions = set()
+    merged_convictions = []
+    for conv in mvr_convictions + quote_data.get("convictions", []):
+        if "severity" not in conv:
+            conv_key = (conv["description"].lower(), conv["date"])
+            if conv_key in seen_convictions:
+                continue
+            seen_convictions.add(conv_key)
+        merged_convictions.append(conv)
+    quote_data["convictions"] = merged_convictions
+    return quote_data
+
 
 def _extract_claims_information(text):
     """Extract claims information from the PDF text"""
@@ -504,8 +533,123 @@ def _extract_vehicle_details(vehicle_text):
 
     return vehicle_info
 
-def _extract_driver_details(text, driver_name, license_num=None):
-    """Extract detailed information for a specific driver"""
+def mvr_convictions_for_quote(mvr_data):
+    """
+    Convert one MVR's convictions into quote conviction entries (source "MVR"),
+    with dates converted from dd/mm/yyyy to the quote's mm/dd/yyyy format
+    """
+    convictions = []
+    if not mvr_data or not mvr_data.get("convictions"):
+        return convictions
+    
+    for conviction in mvr_data["convictions"]:
+        # Convert MVR date format (dd/mm/yyyy) to quote format (mm/dd/yyyy)
+        mvr_date = conviction.get("offence_date")
+        if mvr_date:
+            # Parse dd/mm/yyyy and convert to mm/dd/yyyy
+            try:
+                day, month, year = mvr_date.split('/')
+                quote_date = f"{month}/{day}/{year}"
+
+                # Add conviction with converted date format
+                convictions.append({
+                    "description": conviction.get("description", ""),
+                    "date": quote_date,
+                    "source": "MVR",
+                    "driver_license": mvr_data.get("licence_number")
+                })
+                print(f"Quote extractor: Integrated MVR conviction: {conviction.get('description', '')} on {quote_date}")
+            except Exception:
+                # If date conversion fails, use original date
+                convictions.append({
+                    "description": conviction.get("description", ""),
+                    "date": mvr_date,
+                    "source": "MVR",
+                    "driver_license": mvr_data.get("licence_number")
+                })
+                print(f"Quote extractor: Integrated MVR conviction (date conversion failed): {conviction.get('description', '')} on {mvr_date}")
+    
+    return convictions
+
+class QuoteSectionIndex:
+    """
+    Offsets of the "Driver N of M | name" and "Vehicle N of M | " sections in the quote text,
+    found in a single pass over QUOTE_SECTION_MARKER.
+    A driver section runs from the end of the name to the next driver header, "Vehicle",
+    "Coverage" or "Effective"; a vehicle section from its header to the next vehicle header,
+    "Driver" or "Coverages". Each header gets its own section, so two drivers with the same
+    name, or one name that starts another ("John Smith" / "John Smithson"), never share one.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.drivers = []   # [(name, start, end)]
+        self.vehicles = []  # [(number, total, start, end)]
+
+        # Without MULTILINE, "$" also matches before a final newline
+        text_end = len(text) - 1 if text.endswith("\n") else len(text)
+
+        driver_headers, vehicle_headers = [], []
+        driver_ends, vehicle_ends, header_starts = [], [], []
+        for marker in QUOTE_SECTION_MARKER.finditer(text):
+            word = marker.group("word")
+            numbered = marker.group("number") is not None
+            position = marker.start()
+
+            if word == "Driver":
+                # Any "Driver" ends a vehicle section; only a numbered one ends a driver section
+                vehicle_ends.append(position)
+                if numbered:
+                    driver_ends.append(position)
+                    if marker.group("header"):
+                        driver_headers.append(marker.end())
+                        header_starts.append(position)
+            elif word == "Vehicle":
+                driver_ends.append(position)
+                if numbered:
+                    vehicle_ends.append(position)
+                    if marker.group("header"):
+                        vehicle_headers.append(marker)
+                        header_starts.append(position)
+            else:
+                # "Coverage" and "Effective" end a driver section; only "Coverages" ends a vehicle section
+                driver_ends.append(position)
+                if marker.group("plural"):
+                    vehicle_ends.append(position)
+
+        def section_end(ends, start):
+            next_end = bisect_left(ends, start)
+            return ends[next_end] if next_end < len(ends) else max(start, text_end)
+
+        for header_end in driver_headers:
+            # The name is letters up to the first other character, but never runs into the next header
+            name_match = DRIVER_NAME_PATTERN.match(text, header_end, section_end(header_starts, header_end))
+            if not name_match:
+                continue
+            raw_name = name_match.group(0)
+            name = raw_name.strip()
+            start = header_end + len(raw_name.rstrip())
+            self.drivers.append((name, start, section_end(driver_ends, start)))
+
+        for header in vehicle_headers:
+            start = header.end()
+            self.vehicles.append((header.group("number"), header.group("total"), start, section_end(vehicle_ends, start)))
+
+    def driver_sections(self):
+        """[(driver name, section text)] in document order"""
+        return [(name, self.text[start:end]) for name, start, end in self.drivers]
+
+    def vehicle_sections(self):
+        """[(vehicle number, total vehicles, section text)] in document order"""
+        return [(number, total, self.text[start:end]) for number, total, start, end in self.vehicles]
+
+
+def _extract_driver_details(text, driver_name, license_num=None, section=None):
+    """
+    Extract detailed information for a specific driver.
+    section: the driver's own section text (see QuoteSectionIndex); when not given it is
+    looked up in text by name
+    """
     driver_info = {
         "full_name": driver_name.strip(),
         "birth_date": None,
@@ -541,20 +685,21 @@ def _extract_driver_details(text, driver_name, license_num=None):
         rf"{re.escape(driver_name)}(.*?)(?=Driver|Vehicle|Coverage|Effective|\n[A-Z][a-z]+\s+[A-Z][a-z]+)"
     ]
     
-    driver_section = None
-    for pattern in driver_patterns:
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            driver_section = match.group(1)
-            break
-    
-    if not driver_section:
-        # Fallback: look for driver info in a window around the name
-        name_index = text.find(driver_name)
-        if name_index > 0:
-            window_start = max(0, name_index)
-            window_end = min(len(text), name_index + 1000)
-            driver_section = text[window_start:window_end]
+    driver_section = section
+    if section is None:
+        for pattern in driver_patterns:
+            match = re.search(pattern, text, re.DOTALL)
+            if match:
+                driver_section = match.group(1)
+                break
+        
+        if not driver_section:
+            # Fallback: look for driver info in a window around the name
+            name_index = text.find(driver_name)
+            if name_index > 0:
+                window_start = max(0, name_index)
+                window_end = min(len(text), name_index + 1000)
+                driver_section = text[window_start:window_end]
     
     if driver_section:
         # With PyMuPDF's better structure, we can use more precise patterns
@@ -928,4 +1073,4 @@ def _extract_convictions_and_suspensions(text):
             unique_suspensions.append(susp)
     result["suspensions"] = unique_suspensions
     
-    return result
\ No newline at end of file
+    return result
@@ -0,0 +1,246 @@
+import re
+from statistics import median
+
+# Words whose vertical centres are within this fraction of the row's median word height share a row
+ROW_TOLERANCE = 0.5
+# A horizontal gap wider than this fraction of the row's median word height starts a new cell
+CELL_GAP = 0.9
+
+LICENCE_TOKEN = re.compile(r'[A-Z]\d{4}-\d{5}-\d{5}')
+VIN_TOKEN = re.compile(r'[A-Z0-9]{17}')
+YEAR_TOKEN = re.compile(r'\d{4}')
+DAY_OR_MONTH_TOKEN = re.compile(r'\d{1,2}')
+NAME_TOKEN = re.compile(r'[A-Za-z]+')
+AMOUNT_TOKEN = re.compile(r'\$?\d[\d,]*(?:\.\d+)?')
+COVERAGE_HEADING = re.compile(r'Coverages?\b', re.IGNORECASE)
+SECTION_HEADING = re.compile(r'(?:Driver|Vehicle|Effective)\b')
+
+
+class TableRow:
+    """
+    One line of a PDF page rebuilt from word coordinates: words is the row's text left to
+    right, cells the words grouped by the horizontal gaps between them (table columns).
+    """
+
+    def __init__(self, page, top, bottom, words, cells):
+        self.page = page
+        self.top = top
+        self.bottom = bottom
+        self.words = words
+        self.cells = cells
+
+    @property
+    def text(self):
+        return " ".join(self.words)
+
+    def __repr__(self):
+        return f"TableRow(page={self.page}, cells={self.cells!r})"
+
+
+class DriverRow:
+    """Driver table row: [number] name licence birth-year birth-month birth-day gender(M/F) marital(S/M)"""
+
+    def __init__(self, number, name, licence_number, birth_year, birth_month, birth_day, gender, marital_status):
+        self.number = number
+        self.name = name
+        self.licence_number = licence_number
+        self.birth_year = birth_year
+        self.birth_month = birth_month
+        self.birth_day = birth_day
+        self.gender = gender
+        self.marital_status = marital_status
+
+    @classmethod
+    def from_row(cls, row):
+        """The driver in row, or None if the row doesn't read as one"""
+        words = row.words
+        for position, word in enumerate(words):
+            if not LICENCE_TOKEN.fullmatch(word):
+                continue
+            details = words[position + 1:position + 6]
+            if len(details) < 5:
+                return None
+            year, month, day, gender, marital = details
+            if not (YEAR_TOKEN.fullmatch(year) and DAY_OR_MONTH_TOKEN.fullmatch(month) and
+                    DAY_OR_MONTH_TOKEN.fullmatch(day) and gender in ("M", "F") and marital in ("S", "M")):
+                return None
+
+            # The name is the run of alphabetic words right before the licence, after an optional row number
+            name_start = position
+            while name_start > 0 and NAME_TOKEN.fullmatch(words[name_start - 1]):
+                name_start -= 1
+            if name_start == position:
+                return None
+            number = words[name_start - 1] if name_start > 0 and words[name_start - 1].isdigit() else None
+            return cls(number, " ".join(words[name_start:position]), word, year, month, day, gender, marital)
+        return None
+
+    def as_dict(self):
+        """The driver in the comparison service's field format"""
+        return {
+            "full_name": self.name,
+            "birth_date": f"{self.birth_month}/{self.birth_day}/{self.birth_year}",
+            "licence_number": self.licence_number,
+            "licence_class": None,  # Will extract separately
+            "gender": "Male" if self.gender == "M" else "Female",
+            "marital_status": "Single" if self.marital_status == "S" else "Married"
+        }
+
+
+class VehicleRow:
+    """Vehicle table row: year make model trim body-type VIN"""
+
+    def __init__(self, year, make, model, trim, body_type, vin):
+        self.year = year
+        self.make = make
+        self.model = model
+        self.trim = trim
+        self.body_type = body_type
+        self.vin = vin
+
+    @classmethod
+    def from_row(cls, row):
+        """The vehicle in row, or None if the row doesn't start with a year and end with a VIN"""
+        words = row.words
+        if len(words) < 3 or not YEAR_TOKEN.fullmatch(words[0]) or not VIN_TOKEN.fullmatch(words[-1]):
+            return None
+
+        cells = row.cells
+        if len(cells) == 6 and cells[0] == words[0] and cells[-1] == words[-1]:
+            # One cell per column
+            return cls(*cells)
+
+        # Columns not separated: one word each for make, model and trim, the rest is the body type
+        middle = words[1:-1]
+        return cls(
+            words[0],
+            middle[0] if middle else None,
+            middle[1] if len(middle) > 1 else None,
+            middle[2] if len(middle) > 2 else None,
+            " ".join(middle[3:]) or None,
+            words[-1]
+        )
+
+    def as_dict(self, garaging_location=None):
+        """The vehicle in the comparison service's field format"""
+        return {
+            "vin": self.vin,
+            "vehicle_type": "Private Passenger",
+            "fuel_type": "Gasoline",
+            "primary_use": "Pleasure",
+            "garaging_location": garaging_location,
+            "year": self.year,
+            "make": self.make,
+            "model": self.model,
+            "trim": self.trim,
+            "body_type": self.body_type
+        }
+
+
+class CoverageRow:
+    """Coverage table row: coverage name followed by its amounts (limit, then deductible or premium)"""
+
+    def __init__(self, label, amounts):
+        self.label = label
+        self.amounts = amounts
+
+    @property
+    def limit(self):
+        """The first amount in whole dollars, digits only"""
+        return self.amounts[0].lstrip("$").split(".")[0].replace(",", "") if self.amounts else None
+
+    @classmethod
+    def from_row(cls, row):
+        """The coverage in row, or None if the row has no name before its first amount"""
+        words = row.words
+        for position, word in enumerate(words):
+            if AMOUNT_TOKEN.fullmatch(word):
+                label = " ".join(words[:position]).strip()
+                if not label:
+                    return None
+                return cls(label, [amount for amount in words[position:] if AMOUNT_TOKEN.fullmatch(amount)])
+        return None
+
+
+def page_rows(page, page_number=0):
+    """
+    Rebuild the rows of one PyMuPDF page from page.get_text("words") coordinates: words are
+    sorted by vertical centre and swept once into rows, then split into cells at wide gaps.
+    """
+    words = page.get_text("words")
+    if not words:
+        return []
+
+    words = sorted(words, key=lambda word: ((word[1] + word[3]) / 2, word[0]))
+    rows = []
+    current = [words[0]]
+    current_centre = (words[0][1] + words[0][3]) / 2
+    for word in words[1:]:
+        centre = (word[1] + word[3]) / 2
+        height = median(w[3] - w[1] for w in current)
+        if abs(centre - current_centre) <= height * ROW_TOLERANCE:
+            current.append(word)
+            # Running mean of the row's centres, so a slightly sloped line stays together
+            current_centre += (centre - current_centre) / len(current)
+        else:
+            rows.append(_table_row(page_number, current))
+            current = [word]
+            current_centre = centre
+    rows.append(_table_row(page_number, current))
+    return rows
+
+
+def _table_row(page_number, words):
+    words = sorted(words, key=lambda word: word[0])
+    gap_limit = median(word[3] - word[1] for word in words) * CELL_GAP
+    cells = [[words[0][4]]]
+    for previous, word in zip(words, words[1:]):
+        if word[0] - previous[2] > gap_limit:
+            cells.append([word[4]])
+        else:
+            cells[-1].append(word[4])
+    return TableRow(
+        page_number,
+        min(word[1] for word in words),
+        max(word[3] for word in words),
+        [word[4] for word in words],
+        [" ".join(cell) for cell in cells]
+    )
+
+
+def document_rows(doc):
+    """Rows of every page of an open PyMuPDF document, in reading order"""
+    rows = []
+    for page_number, page in enumerate(doc):
+        rows.extend(page_rows(page, page_number))
+    return rows
+
+
+def read_tables(rows):
+    """
+    Sort rows into typed driver, vehicle and coverage rows in one pass. Coverage rows are
+    only read between a "Coverage(s)" heading and the next Driver/Vehicle/Effective heading.
+    Returns {"drivers": [DriverRow], "vehicles": [VehicleRow], "coverages": [CoverageRow]}
+    """
+    tables = {"drivers": [], "vehicles": [], "coverages": []}
+    in_coverages = False
+    for row in rows:
+        first_word = row.words[0]
+        if COVERAGE_HEADING.match(first_word):
+            in_coverages = True
+        elif SECTION_HEADING.match(first_word):
+            in_coverages = False
+
+        driver = DriverRow.from_row(row)
+        if driver:
+            tables["drivers"].append(driver)
+            continue
+        vehicle = VehicleRow.from_row(row)
+        if vehicle:
+            tables["vehicles"].append(vehicle)
+            continue
+        if in_coverages:
+            coverage = CoverageRow.from_row(row)
+            if coverage:
+                tables["coverages"].append(coverage)
+    return tables
@@ -0,0 +1,70 @@
+import os
+import signal
+import threading
+from extractors.pdf_source import source_name
+
+# Wall-clock seconds one document's extraction may run before it is interrupted
+DOCUMENT_TIME_BUDGET_SECONDS = float(os.environ.get("DOCUMENT_TIME_BUDGET_SECONDS", 30))
+
+_state = threading.local()
+
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised inside an extractor when its document's time budget runs out.
+    A BaseException (like KeyboardInterrupt) so the extractors' own
+    "except Exception" fallbacks don't swallow it.
+    """
+
+
+def track_partial(result):
+    """
+    Register the result dict an extractor is filling in; if the time budget runs out,
+    run_with_budget returns it as it stands. Returns result
+    """
+    _state.partial = result
+    return result
+
+
+def budget_enforceable():
+    """The interrupting timer needs SIGALRM and the main thread (worker processes run their tasks there)"""
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+def run_with_budget(extract, path, seconds=DOCUMENT_TIME_BUDGET_SECONDS):
+    """
+    Run extract(path) with a wall-clock budget of seconds. A regex still backtracking when the
+    budget runs out is interrupted too (the regex engine checks for signals while matching).
+    Returns the extractor's result, or on timeout the partial result it registered with
+    track_partial, flagged "timed_out": True. Without SIGALRM or outside the main thread
+    the extractor runs unbounded.
+    """
+    _state.partial = None
+    if not seconds or seconds <= 0 or not budget_enforceable():
+        return extract(path)
+
+    def interrupt(signum, frame):
+        raise ExtractionTimeout(f"Extraction exceeded {seconds}s")
+
+    previous_handler = signal.signal(signal.SIGALRM, interrupt)
+    try:
+        try:
+            signal.setitimer(signal.ITIMER_REAL, seconds)
+            return extract(path)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    except ExtractionTimeout:
+        print(f"Extraction of {source_name(path)} exceeded its {seconds}s budget, returning a partial result")
+        return timed_out_result(_state.partial, seconds)
+    finally:
+        signal.signal(signal.SIGALRM, previous_handler)
+        _state.partial = None
+
+
+def timed_out_result(partial, seconds):
+    """A partial result (or an empty one) flagged as cut short by the time budget"""
+    result = dict(partial or {})
+    result["timed_out"] = True
+    result["time_budget_seconds"] = seconds
+    return result
+
@@ -0,0 +1,104 @@
+import os
+import re
+import json
+import time
+import threading
+
+# A channel is dropped this long after its last event, so late or reconnecting clients can still replay it
+PROGRESS_TTL_SECONDS = int(os.environ.get("PROGRESS_TTL_SECONDS", 10 * 60))
+# An idle stream sends a comment this often, so proxies keep the connection open
+PROGRESS_KEEPALIVE_SECONDS = 15
+# Client-chosen progress IDs (a UUID in practice)
+PROGRESS_ID = re.compile(r'[A-Za-z0-9_-]{8,64}')
+# Stages after which a submission sends nothing more
+FINAL_STAGES = ("done", "error")
+
+
+class ProgressChannel:
+    """The events of one submission so far, with a condition streams wait on for new ones"""
+
+    def __init__(self):
+        self.events = []
+        self.finished = False
+        self.updated = time.time()
+        self.condition = threading.Condition()
+
+
+class ProgressHub:
+    """
+    Progress events of running submissions, streamed to clients as Server-Sent Events.
+    The client picks a progress ID, opens the stream for it and sends the ID with its upload;
+    the endpoint publishes each stage (uploaded, classified, extracted, validated per driver,
+    gemini_sent/gemini_received, then done or error) as it happens. Every event is kept until
+    the channel expires, so a stream opened late, or reconnecting with Last-Event-ID, replays
+    what it missed.
+    """
+
+    def __init__(self, ttl_seconds=PROGRESS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def channel(self, progress_id):
+        """The channel for progress_id, created if new; None for an invalid ID"""
+        if not progress_id or not PROGRESS_ID.fullmatch(progress_id):
+            return None
+        with self._lock:
+            now = time.time()
+            for expired in [key for key, channel in self._channels.items() if now - channel.updated > self.ttl_seconds]:
+                del self._channels[expired]
+            channel = self._channels.get(progress_id)
+            if channel is None:
+                channel = self._channels[progress_id] = ProgressChannel()
+            return channel
+
+    def publish(self, progress_id, stage, **data):
+        """Add an event to progress_id's channel (nothing happens without a valid ID)"""
+        channel = self.channel(progress_id)
+        if channel is None:
+            return
+        with channel.condition:
+            if channel.finished:
+                return
+            channel.events.append({"id": len(channel.events) + 1, "stage": stage, "time": time.time(), **data})
+            channel.finished = stage in FINAL_STAGES
+            channel.updated = time.time()
+            channel.condition.notify_all()
+
+    def reporter(self, progress_id):
+        """A report(stage, **data) function publishing to progress_id; it does nothing without an ID"""
+        if not progress_id:
+            return lambda stage, **data: None
+        return lambda stage, **data: self.publish(progress_id, stage, **data)
+
+    def stream(self, progress_id, last_event_id=0, keepalive_seconds=PROGRESS_KEEPALIVE_SECONDS):
+        """
+        Server-Sent Events text for progress_id: the events after last_event_id, then each new one
+        as it is published, until the submission is done or the channel has been idle for the TTL
+        """
+        channel = self.channel(progress_id)
+        if channel is None:
+            yield _sse_event({"id": 0, "stage": "error", "error": "Invalid progress ID"})
+            return
+
+        sent = last_event_id
+        while True:
+            with channel.condition:
+                if len(channel.events) <= sent and not channel.finished:
+                    channel.condition.wait(keepalive_seconds)
+                events = channel.events[sent:]
+                finished = channel.finished
+                idle = time.time() - channel.updated
+            for event in events:
+                yield _sse_event(event)
+            sent += len(events)
+            if finished and sent >= len(channel.events):
+                return
+            if not events:
+                if idle > self.ttl_seconds:
+                    return
+                yield ": keepalive\n\n"
+
+
+def _sse_event(event):
+    return f"id: {event['id']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
@@ -1,9 +1,13 @@
-import fitz  # PyMuPDF
 import json
 import re
-import os
-from datetime import datetime
+import numpy as np
 from validator.compare_engine import ValidationEngine
+from validator.fleet_matching import assign_by_score, equal_outer
+from extractors.table_extractor import page_rows, read_tables
+from extractors.pdf_source import PdfUpload, open_pdf, read_upload
+
+# Score at which a quote/PDF driver or vehicle pair is a high confidence match
+MATCH_THRESHOLD = 60
 
 class QuoteComparisonService:
     """
@@ -24,14 +28,19 @@ class QuoteComparisonService:
             print(f"Error loading quote_result.json: {e}")
             self.quote_data = {}
     
-    def extract_pdf_text(self, pdf_path):
-        """Extract text from PDF using PyMuPDF with better extraction"""
+    def extract_pdf_text(self, pdf_path, rows=None):
+        """
+        Extract text from PDF using PyMuPDF with better extraction
+        rows: optional list, filled with each page's table rows (word coordinates) in the same pass
+        """
         try:
-            doc = fitz.open(pdf_path)
+            doc = open_pdf(pdf_path)
             text = ""
             
             for page_num in range(len(doc)):
                 page = doc.load_page(page_num)
+                if rows is not None:
+                    rows.extend(page_rows(page, page_num))
                 
                 # Try multiple extraction methods
                 page_text = page.get_text("text")
@@ -59,8 +68,12 @@ class QuoteComparisonService:
             print(f"Error extracting PDF text: {e}")
             return ""
     
-    def extract_pdf_fields(self, pdf_text):
-        """Extract key fields from PDF text using structured patterns"""
+    def extract_pdf_fields(self, pdf_text, tables=None):
+        """
+        Extract key fields from PDF text using structured patterns
+        tables: optional read_tables() result of the same PDF; its driver and vehicle rows,
+                read by column position, are used instead of the flattened-text patterns
+        """
         extracted_data = {
             "drivers": [],
             "vehicles": [],
@@ -83,6 +96,35 @@ class QuoteComparisonService:
         if effective_match:
             extracted_data["quote_effective_date"] = effective_match.group(1)
         
+        if tables and tables["drivers"]:
+            extracted_data["drivers"] = [driver.as_dict() for driver in tables["drivers"]]
+        else:
+            self._extract_drivers_from_text(pdf_text, extracted_data)
+        
+        if tables and tables["vehicles"]:
+            extracted_data["vehicles"] = [
+                vehicle.as_dict(extracted_data.get("address", "")) for vehicle in tables["vehicles"]
+            ]
+        else:
+            self._extract_vehicle_from_text(pdf_text, extracted_data)
+        
+        # Also try to find VIN directly
+        vin_matches = re.findall(r"([A-Z0-9]{17})", pdf_text)
+        for vin in vin_matches:
+            if not any(v.get("vin") == vin for v in extracted_data["vehicles"]):
+                vehicle_info = {
+                    "vin": vin,
+                    "vehicle_type": "Private Passenger",
+                    "fuel_type": "Gasoline",
+                    "primary_use": "Pleasure",
+                    "garaging_location": extracted_data.get("address", "")
+                }
+                extracted_data["vehicles"].append(vehicle_info)
+        
+        return extracted_data
+    
+    def _extract_drivers_from_text(self, pdf_text, extracted_data):
+        """Driver rows from the flattened text, for PDFs whose table rows didn't read as drivers"""
         # Extract drivers using the structured format from the PDF
         # Pattern: Name License_Number Birth_Year Birth_Month Birth_Day Gender Marital_Status
         # Use finditer to get non-overlapping matches
@@ -119,7 +161,9 @@ class QuoteComparisonService:
                 "marital_status": marital
             }
             extracted_data["drivers"].append(driver_info)
-        
+    
+    def _extract_vehicle_from_text(self, pdf_text, extracted_data):
+        """The first vehicle row in the flattened text, for PDFs whose table rows didn't read as vehicles"""
         # Extract vehicle information - look for the specific pattern in the PDF
         vehicle_match = re.search(r"(\d{4})\s+([A-Z\s]+)\s+([A-Z\s]+)\s+([A-Z0-9]+)\s+([A-Z\s-]+)\s+([A-Z0-9]{17})", pdf_text)
         if vehicle_match:
@@ -143,21 +187,6 @@ class QuoteComparisonService:
                 "body_type": body_type
             }
             extracted_data["vehicles"].append(vehicle_info)
-        
-        # Also try to find VIN directly
-        vin_matches = re.findall(r"([A-Z0-9]{17})", pdf_text)
-        for vin in vin_matches:
-            if not any(v.get("vin") == vin for v in extracted_data["vehicles"]):
-                vehicle_info = {
-                    "vin": vin,
-                    "vehicle_type": "Private Passenger",
-                    "fuel_type": "Gasoline",
-                    "primary_use": "Pleasure",
-                    "garaging_location": extracted_data.get("address", "")
-                }
-                extracted_data["vehicles"].append(vehicle_info)
-        
-        return extracted_data
     
     def _extract_driver_details(self, text, match):
         """Extract detailed driver information from text"""
@@ -274,16 +303,21 @@ class QuoteComparisonService:
         
         return None
     
-    def compare_data(self, pdf_path):
-        """Main comparison function"""
+    def compare_data(self, pdf_path, fleet=False):
+        """
+        Main comparison function
+        fleet: pair quote and PDF drivers/vehicles one-to-one by assignment over a score matrix
+               instead of taking the first candidate scoring 60 or more
+        """
         try:
             # Extract text from PDF
-            pdf_text = self.extract_pdf_text(pdf_path)
+            rows = []
+            pdf_text = self.extract_pdf_text(pdf_path, rows)
             if not pdf_text:
                 return {"error": "Could not extract text from PDF"}
             
             # Extract fields from PDF
-            pdf_data = self.extract_pdf_fields(pdf_text)
+            pdf_data = self.extract_pdf_fields(pdf_text, read_tables(rows))
             
             # Save extracted data for debugging
             extracted_data = {
@@ -317,8 +351,12 @@ class QuoteComparisonService:
             }
             
             # Compare drivers
-            for json_driver in self.quote_data.get("drivers", []):
-                driver_comparison = self._compare_driver(json_driver, pdf_data["drivers"])
+            json_drivers = self.quote_data.get("drivers", [])
+            if fleet:
+                driver_comparisons = self._compare_drivers_fleet(json_drivers, pdf_data["drivers"])
+            else:
+                driver_comparisons = [self._compare_driver(json_driver, pdf_data["drivers"]) for json_driver in json_drivers]
+            for driver_comparison in driver_comparisons:
                 comparison_results["drivers"].append(driver_comparison)
                 if driver_comparison["status"] == "MATCH":
                     comparison_results["summary"]["matched_drivers"] += 1
@@ -326,8 +364,12 @@ class QuoteComparisonService:
                     comparison_results["summary"]["issues_found"] += 1
             
             # Compare vehicles
-            for json_vehicle in self.quote_data.get("vehicles", []):
-                vehicle_comparison = self._compare_vehicle(json_vehicle, pdf_data["vehicles"])
+            json_vehicles = self.quote_data.get("vehicles", [])
+            if fleet:
+                vehicle_comparisons = self._compare_vehicles_fleet(json_vehicles, pdf_data["vehicles"])
+            else:
+                vehicle_comparisons = [self._compare_vehicle(json_vehicle, pdf_data["vehicles"]) for json_vehicle in json_vehicles]
+            for vehicle_comparison in vehicle_comparisons:
                 comparison_results["vehicles"].append(vehicle_comparison)
                 if vehicle_comparison["status"] == "MATCH":
                     comparison_results["summary"]["matched_vehicles"] += 1
@@ -362,31 +404,7 @@ class QuoteComparisonService:
         }
         
         for pdf_driver in pdf_drivers:
-            match_score = 0
-            matches = {}
-            
-            # Compare names
-            if self._names_match(json_driver.get("full_name"), pdf_driver.get("full_name")):
-                match_score += 40
-                matches["name"] = "MATCH"
-            else:
-                matches["name"] = "MISMATCH"
-            
-            # Compare license numbers (handle hyphen format differences)
-            json_license = json_driver.get("licence_number", "").replace("-", "")
-            pdf_license = pdf_driver.get("licence_number", "").replace("-", "")
-            if json_license == pdf_license:
-                match_score += 40
-                matches["license"] = "MATCH"
-            else:
-                matches["license"] = "MISMATCH"
-            
-            # Compare birth dates
-            if json_driver.get("birth_date") == pdf_driver.get("birth_date"):
-                match_score += 20
-                matches["birth_date"] = "MATCH"
-            else:
-                matches["birth_date"] = "MISMATCH"
+            match_score, matches = self._score_driver_pair(json_driver, pdf_driver)
             
             comparison["pdf_matches"].append({
                 "pdf_driver": pdf_driver,
@@ -394,7 +412,7 @@ class QuoteComparisonService:
                 "matches": matches
             })
             
-            if match_score >= 60:  # High confidence match
+            if match_score >= MATCH_THRESHOLD:  # High confidence match
                 comparison["status"] = "MATCH"
                 comparison["confidence"] = match_score
                 break
@@ -411,29 +429,7 @@ class QuoteComparisonService:
         }
         
         for pdf_vehicle in pdf_vehicles:
-            match_score = 0
-            matches = {}
-            
-            # Compare VIN
-            if json_vehicle.get("vin") == pdf_vehicle.get("vin"):
-                match_score += 60
-                matches["vin"] = "MATCH"
-            else:
-                matches["vin"] = "MISMATCH"
-            
-            # Compare vehicle type
-            if json_vehicle.get("vehicle_type") == pdf_vehicle.get("vehicle_type"):
-                match_score += 20
-                matches["vehicle_type"] = "MATCH"
-            else:
-                matches["vehicle_type"] = "MISMATCH"
-            
-            # Compare fuel type
-            if json_vehicle.get("fuel_type") == pdf_vehicle.get("fuel_type"):
-                match_score += 20
-                matches["fuel_type"] = "MATCH"
-            else:
-                matches["fuel_type"] = "MISMATCH"
+            match_score, matches = self._score_vehicle_pair(json_vehicle, pdf_vehicle)
             
             comparison["pdf_matches"].append({
                 "pdf_vehicle": pdf_vehicle,
@@ -441,23 +437,150 @@ class QuoteComparisonService:
                 "matches": matches
             })
             
-            if match_score >= 60:  # High confidence match
+            if match_score >= MATCH_THRESHOLD:  # High confidence match
                 comparison["status"] = "MATCH"
                 comparison["confidence"] = match_score
                 break
         
         return comparison
     
+    def _score_driver_pair(self, json_driver, pdf_driver):
+        """Score one quote driver against one PDF driver: name 40, licence 40, birth date 20"""
+        match_score = 0
+        matches = {}
+        
+        # Compare names
+        if self._names_match(json_driver.get("full_name"), pdf_driver.get("full_name")):
+            match_score += 40
+            matches["name"] = "MATCH"
+        else:
+            matches["name"] = "MISMATCH"
+        
+        # Compare license numbers (handle hyphen format differences)
+        json_license = json_driver.get("licence_number", "").replace("-", "")
+        pdf_license = pdf_driver.get("licence_number", "").replace("-", "")
+        if json_license == pdf_license:
+            match_score += 40
+            matches["license"] = "MATCH"
+        else:
+            matches["license"] = "MISMATCH"
+        
+        # Compare birth dates
+        if json_driver.get("birth_date") == pdf_driver.get("birth_date"):
+            match_score += 20
+            matches["birth_date"] = "MATCH"
+        else:
+            matches["birth_date"] = "MISMATCH"
+        
+        return match_score, matches
+    
+    def _score_vehicle_pair(self, json_vehicle, pdf_vehicle):
+        """Score one quote vehicle against one PDF vehicle: VIN 60, vehicle type 20, fuel type 20"""
+        match_score = 0
+        matches = {}
+        
+        # Compare VIN
+        if json_vehicle.get("vin") == pdf_vehicle.get("vin"):
+            match_score += 60
+            matches["vin"] = "MATCH"
+        else:
+            matches["vin"] = "MISMATCH"
+        
+        # Compare vehicle type
+        if json_vehicle.get("vehicle_type") == pdf_vehicle.get("vehicle_type"):
+            match_score += 20
+            matches["vehicle_type"] = "MATCH"
+        else:
+            matches["vehicle_type"] = "MISMATCH"
+        
+        # Compare fuel type
+        if json_vehicle.get("fuel_type") == pdf_vehicle.get("fuel_type"):
+            match_score += 20
+            matches["fuel_type"] = "MATCH"
+        else:
+            matches["fuel_type"] = "MISMATCH"
+        
+        return match_score, matches
+    
+    def _compare_drivers_fleet(self, json_drivers, pdf_drivers):
+        """
+        Fleet mode: score every quote/PDF driver pair at once from normalized keys, then
+        assign one-to-one so no PDF driver is matched twice. Empty fields never count as a match.
+        """
+        def licence_key(driver):
+            return (driver.get("licence_number") or "").replace("-", "")
+        
+        def birth_key(driver):
+            return driver.get("birth_date") or ""
+        
+        def field(name, weight, key):
+            return name, weight, equal_outer([key(d) for d in json_drivers], [key(d) for d in pdf_drivers])
+        
+        fields = [
+            field("name", 40, lambda driver: self._name_key(driver.get("full_name"))),
+            field("license", 40, licence_key),
+            field("birth_date", 20, birth_key),
+        ]
+        return self._fleet_comparisons(json_drivers, pdf_drivers, fields, "json_driver", "pdf_driver")
+    
+    def _compare_vehicles_fleet(self, json_vehicles, pdf_vehicles):
+        """Fleet mode for vehicles: VIN/type/fuel score matrix, then one-to-one assignment"""
+        def field(name, weight):
+            json_keys = [vehicle.get(name) or "" for vehicle in json_vehicles]
+            pdf_keys = [vehicle.get(name) or "" for vehicle in pdf_vehicles]
+            return name, weight, equal_outer(json_keys, pdf_keys)
+        
+        fields = [field("vin", 60), field("vehicle_type", 20), field("fuel_type", 20)]
+        return self._fleet_comparisons(json_vehicles, pdf_vehicles, fields, "json_vehicle", "pdf_vehicle")
+    
+    def _fleet_comparisons(self, json_items, pdf_items, fields, json_key, pdf_key):
+        """
+        Build comparison entries (same shape as _compare_driver/_compare_vehicle) from an assignment.
+        fields: (name, weight, boolean match matrix) triples; the assignment, the reported
+        match_score and the per-field matches all come from these same matrices.
+        Only pairs reaching MATCH_THRESHOLD are assigned, so a qualifying pair is never
+        traded for several weaker ones; items left unassigned report no PDF match.
+        """
+        shape = (len(json_items), len(pdf_items))
+        scores = np.zeros(shape)
+        if json_items and pdf_items:
+            for _, weight, matched in fields:
+                scores += weight * matched
+        assignment = assign_by_score(scores, MATCH_THRESHOLD)
+        comparisons = []
+        
+        for row, json_item in enumerate(json_items):
+            comparison = {
+                json_key: json_item,
+                "pdf_matches": [],
+                "status": "NO_MATCH",
+                "confidence": 0
+            }
+            if row in assignment:
+                column, score = assignment[row]
+                match_score = int(score)
+                matches = {name: "MATCH" if matched[row, column] else "MISMATCH" for name, _, matched in fields}
+                comparison["pdf_matches"].append({
+                    pdf_key: pdf_items[column],
+                    "match_score": match_score,
+                    "matches": matches
+                })
+                comparison["status"] = "MATCH"
+                comparison["confidence"] = match_score
+            comparisons.append(comparison)
+        
+        return comparisons
+    
+    def _name_key(self, name):
+        """Normalized name used by both pairwise and fleet driver matching"""
+        return re.sub(r'\s+', ' ', name.strip().lower()) if name else ""
+    
     def _names_match(self, name1, name2):
         """Compare names with fuzzy matching"""
         if not name1 or not name2:
             return False
         
-        # Normalize names
-        name1 = re.sub(r'\s+', ' ', name1.strip().lower())
-        name2 = re.sub(r'\s+', ' ', name2.strip().lower())
-        
-        return name1 == name2
+        return self._name_key(name1) == self._name_key(name2)
     
     def _compare_address(self, address1, address2):
         """Compare addresses"""
@@ -471,25 +594,17 @@ class QuoteComparisonService:
         return addr1 == addr2
 
 # Flask endpoint function
-def compare_quote_with_pdf(pdf_file):
+def compare_quote_with_pdf(pdf_file, fleet=False):
     """Flask endpoint function to compare PDF with quote data"""
     service = QuoteComparisonService()
     
-    # Save uploaded file temporarily
-    temp_path = f"uploads/temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    os.makedirs("uploads", exist_ok=True)
-    
+    # Read the upload into memory (a temporary file only if it is very large)
+    upload = None
     try:
-        pdf_file.save(temp_path)
-        result = service.compare_data(temp_path)
-        
-        # Clean up temp file
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        
-        return result
+        upload = pdf_file if isinstance(pdf_file, PdfUpload) else read_upload(pdf_file)
+        return service.compare_data(upload, fleet=fleet)
     except Exception as e:
-        # Clean up temp file on error
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-        return {"error": f"Processing failed: {str(e)}"} 
\ No newline at end of file
+        return {"error": f"Processing failed: {str(e)}"}
+    finally:
+        if upload is not None:
+            upload.cleanup()
\ No newline at end of file
@@ -0,0 +1,290 @@
+import os
+import re
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from datetime import datetime
+
+# SQLite database holding past extractions, validation reports and QC results
+RESULT_DB_PATH = os.environ.get("RESULT_DB_PATH", "results.db")
+# Results older than this are deleted
+RESULT_RETENTION_DAYS = int(os.environ.get("RESULT_RETENTION_DAYS", 90))
+# Expired results are purged at most this often, on the next save
+RESULT_PURGE_INTERVAL_SECONDS = 60 * 60
+# Quote effective date formats, stored as YYYY-MM-DD so they can be searched by range
+EFFECTIVE_DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d", "%Y/%m/%d", "%B %d, %Y", "%b %d, %Y")
+
+
+def normalize_licence(licence):
+    """A licence number in one format for Quote, MVR and DASH: upper case letters and digits only"""
+    return re.sub(r'[^A-Z0-9]', '', str(licence).upper()) if licence else ""
+
+
+def normalize_client_name(name):
+    """A client name as searched: lower case with single spaces"""
+    return " ".join(str(name).lower().split()) if name else ""
+
+
+def parse_effective_date(value):
+    """A quote effective date as YYYY-MM-DD; ValueError if it isn't in a known format"""
+    value = str(value).strip()
+    for date_format in EFFECTIVE_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized date: {value}")
+
+
+def normalize_effective_date(value):
+    """A quote effective date as YYYY-MM-DD, or the text as given if it isn't a known format"""
+    if not value:
+        return None
+    try:
+        return parse_effective_date(value)
+    except ValueError:
+        return str(value).strip()
+
+
+def _client_name(quote):
+    """The quote's applicant, or its first driver when the applicant wasn't read"""
+    applicant = quote.get("applicant") or {}
+    name = " ".join(part for part in (applicant.get("first_name"), applicant.get("last_name")) if part)
+    if not name and quote.get("drivers"):
+        name = quote["drivers"][0].get("full_name")
+    return name or None
+
+
+def _document_licences(extracted):
+    """(document type, normalized licence) of every driver in a submission's extracted documents"""
+    licences = set()
+    for quote in extracted.get("quotes", []):
+        for driver in quote.get("drivers", []):
+            licences.add(("quote", normalize_licence(driver.get("licence_number"))))
+    for mvr in extracted.get("mvrs", []):
+        licences.add(("mvr", normalize_licence(mvr.get("licence_number"))))
+    for dash in extracted.get("dashes", []):
+        licences.add(("dash", normalize_licence(dash.get("dln"))))
+    return sorted((doc_type, licence) for doc_type, licence in licences if licence)
+
+
+def _driver_records(extracted):
+    """
+    (document type, normalized licence, record) of the MVR and DASH records extracted from the
+    submission's own uploads; records it reused from earlier results are already stored
+    """
+    records = []
+    for doc_type, documents, licence_field in (("mvr", "mvrs", "licence_number"), ("dash", "dashes", "dln")):
+        for record in extracted.get(documents, []):
+            licence = normalize_licence(record.get(licence_field))
+            if licence and not record.get("reused_from") and not record.get("extraction_error"):
+                records.append((doc_type, licence, record))
+    return records
+
+
+class ResultStore:
+    """
+    Past results in a local SQLite database, so reports can be served, searched and rendered
+    again without re-extracting the PDFs. Each result is one entry (the extracted documents
+    with the validation report, or a QC result) stored as JSON, indexed by job ID, client
+    name, quote effective date and the licence numbers of its drivers. The MVR and DASH
+    records are also kept one per row by licence number, for the driver record registry.
+    Results older than retention_days are deleted. save returns a new result ID; get returns
+    the entry for a result ID, or None if it is unknown or expired.
+    """
+
+    def __init__(self, path=RESULT_DB_PATH, retention_days=RESULT_RETENTION_DAYS):
+        self.path = path
+        self.retention_seconds = retention_days * 24 * 60 * 60
+        self._last_purge = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    result_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    job_id TEXT,
+                    created_at REAL NOT NULL,
+                    client_name TEXT,
+                    client_key TEXT,
+                    quote_effective_date TEXT,
+                    entry TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS result_licences (
+                    result_id TEXT NOT NULL,
+                    doc_type TEXT NOT NULL,
+                    licence_number TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS driver_records (
+                    result_id TEXT NOT NULL,
+                    doc_type TEXT NOT NULL,
+                    licence_number TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    record TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_job ON results (job_id);
+                CREATE INDEX IF NOT EXISTS idx_results_client ON results (client_key);
+                CREATE INDEX IF NOT EXISTS idx_results_effective ON results (quote_effective_date);
+                CREATE INDEX IF NOT EXISTS idx_results_created ON results (created_at);
+                CREATE INDEX IF NOT EXISTS idx_licences_number ON result_licences (licence_number);
+                CREATE INDEX IF NOT EXISTS idx_licences_result ON result_licences (result_id);
+                CREATE INDEX IF NOT EXISTS idx_records_licence ON driver_records (licence_number, doc_type, created_at);
+                CREATE INDEX IF NOT EXISTS idx_records_result ON driver_records (result_id);
+            """)
+            # Databases created before submissions were fingerprinted
+            if "fingerprint" not in {column["name"] for column in conn.execute("PRAGMA table_info(results)")}:
+                conn.execute("ALTER TABLE results ADD COLUMN fingerprint TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_results_fingerprint ON results (fingerprint, created_at)")
+            conn.commit()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return closing(conn)
+
+    def save(self, entry, kind="validation", job_id=None, fingerprint=None):
+        """Store a result entry (of the submission with fingerprint, if given) and return its new result ID"""
+        result_id = uuid.uuid4().hex
+        extracted = entry.get("extracted") or {}
+        quotes = extracted.get("quotes") or []
+        quote = quotes[0] if quotes else {}
+        client_name = entry.get("client_name") or _client_name(quote)
+        created_at = time.time()
+
+        with self._connect() as conn, conn:
+            conn.execute(
+                "INSERT INTO results (result_id, kind, job_id, created_at, client_name, client_key,"
+                " quote_effective_date, fingerprint, entry) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (result_id, kind, job_id, created_at, client_name, normalize_client_name(client_name) or None,
+                 normalize_effective_date(quote.get("quote_effective_date")), fingerprint,
+                 json.dumps(entry, ensure_ascii=False, default=str))
+            )
+            conn.executemany(
+                "INSERT INTO result_licences (result_id, doc_type, licence_number) VALUES (?, ?, ?)",
+                [(result_id, doc_type, licence) for doc_type, licence in _document_licences(extracted)]
+            )
+            conn.executemany(
+                "INSERT INTO driver_records (result_id, doc_type, licence_number, created_at, record)"
+                " VALUES (?, ?, ?, ?, ?)",
+                [(result_id, doc_type, licence, created_at, json.dumps(record, ensure_ascii=False, default=str))
+                 for doc_type, licence, record in _driver_records(extracted)]
+            )
+        if time.time() - self._last_purge > RESULT_PURGE_INTERVAL_SECONDS:
+            self.purge_expired()
+        return result_id
+
+    def get(self, result_id):
+        """Return the stored entry for result_id, or None if unknown or expired"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT entry FROM results WHERE result_id = ? AND created_at >= ?",
+                               (result_id, time.time() - self.retention_seconds)).fetchone()
+        return json.loads(row["entry"]) if row else None
+
+    def find_by_fingerprint(self, fingerprint, max_age_seconds):
+        """(result ID, entry) of the newest result of the submission with fingerprint saved within max_age_seconds, or None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT result_id, entry FROM results WHERE fingerprint = ? AND created_at >= ?"
+                " ORDER BY created_at DESC LIMIT 1",
+                (fingerprint, time.time() - min(max_age_seconds, self.retention_seconds))
+            ).fetchone()
+        return (row["result_id"], json.loads(row["entry"])) if row else None
+
+    def summary(self, result_id):
+        """The indexed fields of a stored result (see search), or None if unknown or expired"""
+        with self._connect() as conn:
+            rows = self._summaries(conn, "r.result_id = ?", [result_id], 1)
+        return rows[0] if rows else None
+
+    def driver_records(self, licence_number, doc_type, limit=10):
+        """
+        The MVR or DASH records (doc_type "mvr"/"dash") stored for a licence number, newest first,
+        as {"result_id", "stored_at", "record"}
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT result_id, created_at, record FROM driver_records WHERE licence_number = ? AND doc_type = ?"
+                " AND created_at >= ? ORDER BY created_at DESC LIMIT ?",
+                (normalize_licence(licence_number), doc_type, time.time() - self.retention_seconds, limit)
+            ).fetchall()
+        return [
+            {
+                "result_id": row["result_id"],
+                "stored_at": datetime.fromtimestamp(row["created_at"]).isoformat(),
+                "record": json.loads(row["record"])
+            }
+            for row in rows
+        ]
+
+    def search(self, licence_number=None, client_name=None, effective_from=None, effective_to=None,
+               job_id=None, kind=None, limit=50):
+        """
+        Stored results matching every given criterion, newest first: a driver's licence number
+        (in any format), a client name prefix, a quote effective date range (inclusive, any
+        known date format), a job ID or a result kind. Returns their indexed fields, not entries.
+        Raises ValueError for an effective date in no known format.
+        """
+        conditions = []
+        params = []
+        if licence_number:
+            conditions.append("r.result_id IN (SELECT result_id FROM result_licences WHERE licence_number = ?)")
+            params.append(normalize_licence(licence_number))
+        if client_name:
+            # Prefix range, so the client_key index is used
+            prefix = normalize_client_name(client_name)
+            conditions.append("r.client_key >= ? AND r.client_key < ?")
+            params.extend([prefix, prefix + "\uffff"])
+        if effective_from:
+            conditions.append("r.quote_effective_date >= ?")
+            params.append(parse_effective_date(effective_from))
+        if effective_to:
+            conditions.append("r.quote_effective_date <= ?")
+            params.append(parse_effective_date(effective_to))
+        if job_id:
+            conditions.append("r.job_id = ?")
+            params.append(job_id)
+        if kind:
+            conditions.append("r.kind = ?")
+            params.append(kind)
+
+        with self._connect() as conn:
+            return self._summaries(conn, " AND ".join(conditions) or "1", params, limit)
+
+    def _summaries(self, conn, where, params, limit):
+        rows = conn.execute(
+            "SELECT r.result_id, r.kind, r.job_id, r.created_at, r.client_name, r.quote_effective_date"
+            f" FROM results r WHERE ({where}) AND r.created_at >= ? ORDER BY r.created_at DESC LIMIT ?",
+            params + [time.time() - self.retention_seconds, limit]
+        ).fetchall()
+        summaries = []
+        for row in rows:
+            licences = conn.execute("SELECT doc_type, licence_number FROM result_licences WHERE result_id = ?",
+                                    (row["result_id"],)).fetchall()
+            summaries.append({
+                "result_id": row["result_id"],
+                "kind": row["kind"],
+                "job_id": row["job_id"],
+                "created_at": datetime.fromtimestamp(row["created_at"]).isoformat(),
+                "client_name": row["client_name"],
+                "quote_effective_date": row["quote_effective_date"],
+                "licence_numbers": sorted({licence["licence_number"] for licence in licences})
+            })
+        return summaries
+
+    def purge_expired(self):
+        """Delete results older than the retention period; returns the number deleted"""
+        self._last_purge = time.time()
+        cutoff = self._last_purge - self.retention_seconds
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM result_licences WHERE result_id IN"
+                         " (SELECT result_id FROM results WHERE created_at < ?)", (cutoff,))
+            conn.execute("DELETE FROM driver_records WHERE created_at < ?", (cutoff,))
+            deleted = conn.execute("DELETE FROM results WHERE created_at < ?", (cutoff,)).rowcount
+        if deleted:
+            print(f"Purged {deleted} result(s) older than {self.retention_seconds // 86400} days")
+        return deleted
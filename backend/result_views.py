@@ -0,0 +1,140 @@
+import threading
+from collections import OrderedDict
+
+# Stored entries kept parsed for the lazy result endpoints, which read one result many times
+RESULT_VIEW_CACHE_SIZE = 32
+# Extracted document lists come back in pages of at most this many documents
+DOCUMENT_PAGE_LIMIT = 50
+# Extracted document lists of a stored entry, by the name used in the URL
+DOCUMENT_KINDS = ("quotes", "mvrs", "dashes")
+
+_entries = OrderedDict()
+_entries_lock = threading.Lock()
+
+
+def load_entry(result_store, result_id):
+    """
+    A stored entry, parsed once for repeated requests (entries never change once stored).
+    Callers must not modify it. None if unknown or expired
+    """
+    with _entries_lock:
+        if result_id in _entries:
+            _entries.move_to_end(result_id)
+            return _entries[result_id]
+    entry = result_store.get(result_id)
+    if entry is not None:
+        with _entries_lock:
+            _entries[result_id] = entry
+            while len(_entries) > RESULT_VIEW_CACHE_SIZE:
+                _entries.popitem(last=False)
+    return entry
+
+
+def _sections(driver_report):
+    """Names of the per-rule sections of a driver report (mvr_validation, dash_validation, ...)"""
+    return [key for key, value in driver_report.items() if key.endswith("_validation") and isinstance(value, dict)]
+
+
+def _section_counts(section):
+    return {
+        "status": section.get("status"),
+        "critical_errors": len(section.get("critical_errors", [])),
+        "warnings": len(section.get("warnings", [])),
+        "matches": len(section.get("matches", []))
+    }
+
+
+def driver_summary(index, driver_report):
+    """A driver's status and per-section counts, without any message lists"""
+    return {
+        "index": index,
+        "driver_name": driver_report.get("driver_name"),
+        "driver_license": driver_report.get("driver_license"),
+        "validation_status": driver_report.get("validation_status"),
+        "critical_errors": len(driver_report.get("critical_errors", [])),
+        "warnings": len(driver_report.get("warnings", [])),
+        "matches": len(driver_report.get("matches", [])),
+        "sections": {name: _section_counts(driver_report[name]) for name in _sections(driver_report)},
+        "reused_records": driver_report.get("reused_records", [])
+    }
+
+
+def result_summary(result_id, entry):
+    """
+    The first response for a stored result: the report summary, one summary per driver and how
+    many documents were extracted, with none of the documents or message lists
+    """
+    extracted = entry.get("extracted") or {}
+    summary = {
+        "result_id": result_id,
+        "no_dash_report": entry.get("no_dash_report", False),
+        "categories": entry.get("categories"),
+        "documents": {kind: len(extracted.get(kind, [])) for kind in DOCUMENT_KINDS}
+    }
+    report = entry.get("validation_report")
+    if report is not None:
+        summary["summary"] = report.get("summary")
+        summary["drivers"] = [driver_summary(index, driver) for index, driver in enumerate(report.get("drivers", []))]
+        summary["reused_records"] = report.get("reused_records", [])
+        if report.get("error"):
+            summary["error"] = report["error"]
+    elif entry.get("compact_report") is not None:
+        # Already a one-page summary
+        summary["compact_report"] = entry["compact_report"]
+    elif entry.get("qc_validation_results") is not None:
+        summary["summary"] = entry.get("summary")
+        summary["application_file"] = entry.get("application_file")
+    return summary
+
+
+def driver_detail(entry, index):
+    """
+    One driver's report with its critical errors and warnings, overall and per section; the
+    matches lists are left out (see driver_matches) and only counted. None if there is no such driver
+    """
+    drivers = (entry.get("validation_report") or {}).get("drivers", [])
+    if not 0 <= index < len(drivers):
+        return None
+    driver_report = drivers[index]
+    detail = {key: value for key, value in driver_report.items() if key not in _sections(driver_report) and key != "matches"}
+    detail["index"] = index
+    detail["matches_count"] = len(driver_report.get("matches", []))
+    for name in _sections(driver_report):
+        section = driver_report[name]
+        detail[name] = {
+            **{key: value for key, value in section.items() if key != "matches"},
+            "matches_count": len(section.get("matches", []))
+        }
+    return detail
+
+
+def driver_matches(entry, index, section=None):
+    """
+    {section: matches} of one driver, with the driver's overall list under "driver" (only the
+    given section if named); None if there is no such driver or section
+    """
+    drivers = (entry.get("validation_report") or {}).get("drivers", [])
+    if not 0 <= index < len(drivers):
+        return None
+    driver_report = drivers[index]
+    matches = {"driver": driver_report.get("matches", [])}
+    matches.update((name, driver_report[name].get("matches", [])) for name in _sections(driver_report))
+    if section is not None:
+        if section not in matches:
+            return None
+        return {section: matches[section]}
+    return matches
+
+
+def documents_page(entry, kind, offset=0, limit=DOCUMENT_PAGE_LIMIT):
+    """A page of the extracted documents of one kind ("quotes", "mvrs" or "dashes")"""
+    documents = (entry.get("extracted") or {}).get(kind, [])
+    offset = max(offset, 0)
+    limit = min(max(limit, 1), DOCUMENT_PAGE_LIMIT)
+    return {
+        "kind": kind,
+        "total": len(documents),
+        "offset": offset,
+        "limit": limit,
+        "documents": documents[offset:offset + limit]
+    }
@@ -0,0 +1,132 @@
+import copy
+from extractors.mvr_extractor import extract_mvr_data
+from extractors.dash_extractor import extract_dash_data
+from extractors.quote_extractor import extract_quote_data, merge_mvr_convictions
+from validator.compare_engine import ValidationEngine
+
+# Field holding the licence number in each re-uploadable document type
+LICENCE_FIELDS = {
+    "mvr": "licence_number",
+    "dash": "dln"
+}
+
+
+class RevalidationService:
+    """
+    Revalidate a stored submission after one MVR, DASH or Quote document is re-uploaded.
+    Only the changed document is re-extracted; for MVR and DASH only the drivers
+    matched to it by licence, and only the rules reading that document, are re-run.
+    """
+
+    def __init__(self):
+        self.validation_engine = ValidationEngine()
+
+    def revalidate(self, previous, doc_type, path, replace_index=None):
+        """
+        previous: stored result entry with "extracted", "validation_report", "no_dash_report", "categories"
+        doc_type: "mvr", "dash" or "quote"
+        replace_index: optional index of the document to replace; MVR/DASH default to the one with the same licence
+        """
+        if doc_type not in ("mvr", "dash", "quote"):
+            raise ValueError(f"Unsupported document type: {doc_type}")
+
+        extracted = copy.deepcopy(previous["extracted"])
+        previous_report = previous["validation_report"]
+        no_dash_report = previous.get("no_dash_report", False)
+        categories = previous.get("categories")
+
+        if doc_type == "quote":
+            quote_data = extract_quote_data(path, extracted["mvrs"])
+            self._replace_document(extracted["quotes"], quote_data, replace_index, None)
+
+            # Every driver reads the quote, so this is a full validation
+            report = self.validation_engine.validate_quote(extracted, no_dash_report=no_dash_report, categories=categories)
+            revalidated = [
+                {"driver_name": d.get("driver_name"), "driver_license": d.get("driver_license"), "rules": "all"}
+                for d in report.get("drivers", [])
+            ]
+        else:
+            if doc_type == "mvr":
+                new_document = extract_mvr_data(path)
+                documents = extracted["mvrs"]
+            else:
+                new_document = extract_dash_data(path)
+                documents = extracted["dashes"]
+
+            licence_field = LICENCE_FIELDS[doc_type]
+            old_document = self._replace_document(documents, new_document, replace_index, licence_field)
+
+            licences = {
+                self.validation_engine._normalize_licence(document.get(licence_field))
+                for document in (old_document, new_document) if document
+            }
+            licences.discard("")
+
+            shared_categories = ()
+            if doc_type == "mvr" and self._refresh_mvr_convictions(extracted["quotes"], documents):
+                # MVR convictions are merged into the shared quote conviction list
+                shared_categories = ("convictions",)
+
+            report, revalidated = self.validation_engine.revalidate(
+                extracted, previous_report, doc_type, licences,
+                no_dash_report=no_dash_report, categories=categories, shared_categories=shared_categories
+            )
+
+        return {
+            "extracted": extracted,
+            "validation_report": report,
+            "status_changes": self.validation_engine.compare_reports(previous_report, report),
+            "revalidated_drivers": revalidated,
+            "no_dash_report": no_dash_report,
+            "categories": categories
+        }
+
+    def _replace_document(self, documents, new_document, replace_index, licence_field):
+        """Swap new_document into documents in place and return the document it replaced, if any"""
+        if replace_index is not None:
+            if not 0 <= replace_index < len(documents):
+                raise ValueError(f"replaceIndex {replace_index} is out of range for {len(documents)} document(s)")
+            old_document = documents[replace_index]
+            documents[replace_index] = new_document
+            return old_document
+
+        if licence_field:
+            new_licence = self.validation_engine._normalize_licence(new_document.get(licence_field))
+            for index, document in enumerate(documents):
+                if new_licence and self.validation_engine._normalize_licence(document.get(licence_field)) == new_licence:
+                    documents[index] = new_document
+                    return document
+        elif len(documents) == 1:
+            old_document = documents[0]
+            documents[0] = new_document
+            return old_document
+        elif documents:
+            raise ValueError("replaceIndex is required when the submission has more than one quote")
+
+        documents.append(new_document)
+        return None
+
+    def _refresh_mvr_convictions(self, quotes, mvrs):
+        """
+        Rebuild every quote's conviction list from its own convictions and the current MVRs, the
+        same way a full extraction merges them (see merge_mvr_convictions).
+        Returns True when any quote's conviction list changed.
+        """
+        changed = False
+        for quote in quotes:
+            convictions = quote.get("convictions", [])
+            own = [conviction for conviction in convictions if conviction.get("source") != "MVR"]
+            merged = merge_mvr_convictions({"convictions": own}, mvrs)["convictions"]
+            if merged != convictions:
+                quote["convictions"] = merged
+                changed = True
+
+        return changed
+
+
+def revalidate_submission(previous, doc_type, path, replace_index=None):
+    """
+    Convenience function to revalidate a stored submission with one replaced document
+    """
+    service = RevalidationService()
+    return service.revalidate(previous, doc_type, path, replace_index)
@@ -0,0 +1,77 @@
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import Future
+
+# A finished submission is answered from the result store when the same one comes in again within this window
+SUBMISSION_REUSE_SECONDS = int(os.environ.get("SUBMISSION_REUSE_SECONDS", 10 * 60))
+
+
+def submission_fingerprint(endpoint, documents, **options):
+    """
+    Hash identifying a submission: the endpoint, each upload's form field and content digest
+    (in upload order) and the options that change its result (noDashReport and the like)
+    """
+    fingerprint = {
+        "endpoint": endpoint,
+        "documents": [[doc_type, getattr(upload, "digest", None) or str(upload)] for doc_type, upload in documents],
+        "options": options
+    }
+    return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class SubmissionTracker:
+    """
+    Runs each distinct submission (by fingerprint) once. A submission identical to one still
+    running waits for that one and gets its response; one identical to a submission finished
+    within reuse_seconds gets the stored result (see ResultStore.find_by_fingerprint) without
+    extracting or validating anything. Double clicks and client retries thus cost one run.
+    """
+
+    def __init__(self, result_store, reuse_seconds=SUBMISSION_REUSE_SECONDS):
+        self.result_store = result_store
+        self.reuse_seconds = reuse_seconds
+        self._running = {}
+        self._lock = threading.Lock()
+
+    def run(self, fingerprint, work, replay):
+        """
+        (body, status) of the submission: work() runs it, replay(result_id, entry) rebuilds the
+        response of a stored result. Bodies not from this call's own run are marked
+        "duplicate_submission"
+        """
+        with self._lock:
+            future = self._running.get(fingerprint)
+
+        leader = False
+        if future is None:
+            # The store lookup runs outside the lock so other submissions are not held up by it
+            stored = self.result_store.find_by_fingerprint(fingerprint, self.reuse_seconds)
+            if stored is not None:
+                print(f"Identical submission finished recently, returning result {stored[0]}")
+                body, status = replay(*stored)
+                return {**body, "duplicate_submission": True}, status
+            with self._lock:
+                # An identical submission may have started during the lookup
+                future = self._running.get(fingerprint)
+                if future is None:
+                    future = Future()
+                    self._running[fingerprint] = future
+                    leader = True
+
+        if not leader:
+            print("Identical submission in progress, waiting for its result")
+            body, status = future.result()
+            return {**body, "duplicate_submission": True}, status
+
+        try:
+            response = work()
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._running[fingerprint]
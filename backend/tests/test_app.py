@@ -0,0 +1,73 @@
+import os
+import threading
+import time
+
+import pytest
+
+import extraction_service
+from extraction_service import ExtractionService
+from result_store import ResultStore
+
+
+def _slow_extract(path):
+    time.sleep(0.5)
+    return {"policies": [path]}
+
+
+@pytest.fixture(scope="module")
+def app_module(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("app")
+    with pytest.MonkeyPatch.context() as patch:
+        # app creates its upload folder and stores relative to the working directory
+        patch.chdir(directory)
+        import app
+        patch.setattr(app, "result_store", ResultStore(path=os.path.join(directory, "results.db")))
+        yield app
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+def test_portfolio_validate_rejects_malformed_as_of(client):
+    response = client.post("/api/portfolio-validate", json={"as_of": "garbage", "submissions": [{"mvrs": []}]})
+    assert response.status_code == 400
+    assert "as_of" in response.get_json()["error"]
+
+
+def test_portfolio_validate_accepts_as_of_date(client):
+    response = client.post("/api/portfolio-validate", json={"as_of": "2026-01-31", "submissions": [{"mvrs": []}]})
+    assert response.status_code == 200
+    assert response.get_json()["summary"]["as_of"] == "2026-01-31"
+
+
+def test_result_search_rejects_unparseable_effective_date(client):
+    response = client.get("/api/results?effectiveFrom=garbage")
+    assert response.status_code == 400
+    assert "effectiveFrom" in response.get_json()["error"]
+
+
+def test_pattern_order_update_lets_running_submission_finish(app_module, client, monkeypatch):
+    monkeypatch.setitem(extraction_service.EXTRACTORS, "dash", _slow_extract)
+    # One worker, so the later documents are still queued when the pool is restarted
+    service = ExtractionService(max_workers=1, cache_size=0)
+    monkeypatch.setattr(app_module, "extraction_service", service)
+    results = {}
+
+    paths = [f"{n}.pdf" for n in range(5)]
+
+    def submit():
+        results["running"] = service.extract_submission([("dash", path) for path in paths])
+
+    running = threading.Thread(target=submit)
+    running.start()
+    time.sleep(0.25)
+    pool = service._pool
+    response = client.post("/api/pattern-order", json={})
+    running.join(10)
+
+    assert response.status_code == 200
+    assert results["running"]["dashes"] == [{"policies": [path]} for path in paths]
+    assert service._pool is not pool
+    service.close()
@@ -0,0 +1,19 @@
+from datetime import date
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from validator.batch_engine import add_years
+
+
+def test_add_years_matches_relativedelta():
+    days = [date(2016, 2, 29), date(2020, 1, 31), date(1999, 12, 31), date(2004, 6, 15)]
+    for years in (1, 4, 9, -9):
+        shifted = add_years(np.array(days, dtype="datetime64[D]"), years)
+        assert [value.astype(date) for value in shifted] == [day + relativedelta(years=years) for day in days]
+
+
+def test_add_years_keeps_missing_dates():
+    shifted = add_years(np.array(["2020-02-29", "NaT"], dtype="datetime64[D]"), 1)
+    assert shifted[0] == np.datetime64("2021-02-28")
+    assert np.isnat(shifted[1])
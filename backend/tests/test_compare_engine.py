@@ -0,0 +1,57 @@
+from validator.compare_engine import ValidationEngine
+
+
+def submission():
+    return {
+        "quotes": [{
+            "quote_effective_date": "10/15/2026",
+            "drivers": [{"full_name": "Jane Doe", "licence_number": "D1234-56789-01234", "birth_date": "07/20/1990"}],
+            "vehicles": []
+        }],
+        "mvrs": [{"licence_number": "D1234-56789-01234", "name": "DOE,JANE", "birth_date": "20/07/1990"}],
+        "dashes": []
+    }
+
+
+def test_compact_report_counts_unrequested_sections_as_not_run():
+    report = ValidationEngine().generate_compact_report(submission(), categories=["mvr"])
+    categories = report["validation_categories"]
+
+    for category in ("DASH Validation", "License Progression", "Convictions", "Driver Training", "Report Age"):
+        assert categories[category]["fail"] == 0
+        assert categories[category]["not_run"] == 1
+    assert categories["MVR Validation"]["not_run"] == 0
+    assert report["charts"]["category_radar_chart"]["not_run_data"] == [0, 1, 1, 1, 1, 1]
+
+
+def test_compact_report_counts_skipped_dash_as_not_run():
+    report = ValidationEngine().generate_compact_report(submission(), no_dash_report=True)
+    assert report["validation_categories"]["DASH Validation"] == {"pass": 0, "warning": 0, "fail": 0, "not_run": 1}
+
+
+def dash_with_policies(*terms):
+    return {"policies": [{"start_date": start, "end_date": end, "company": "Aviva", "status": "Expired"}
+                         for start, end in terms]}
+
+
+def coverage_messages(dash, effective_date):
+    matches = ValidationEngine()._validate_policies(dash, {"quote_effective_date": effective_date})["matches"]
+    return [match for match in matches if "continuous" in match.lower()]
+
+
+def test_continuous_coverage_reaching_the_quote_date_is_current():
+    dash = dash_with_policies(("2020-01-01", "2021-01-01"), ("2021-01-01", "2027-01-01"))
+    assert coverage_messages(dash, "10/15/2026") == ["Continuously insured since 2020-01-01 (2557 days)"]
+
+
+def test_continuous_coverage_that_ended_before_the_quote_date_is_reported_as_ended():
+    dash = dash_with_policies(("2015-01-01", "2016-01-01"), ("2016-01-01", "2018-01-01"))
+    assert coverage_messages(dash, "10/15/2026") == [
+        "Most recent continuous coverage (2015-01-01 to 2018-01-01, 1096 days) ended before the quote "
+        "effective date 10/15/2026"
+    ]
+
+
+def test_continuous_coverage_without_a_quote_date_shows_its_end():
+    dash = dash_with_policies(("2015-01-01", "2016-01-01"))
+    assert coverage_messages(dash, "") == ["Continuously insured from 2015-01-01 to 2016-01-01 (365 days)"]
@@ -0,0 +1,55 @@
+import fitz
+import pytest
+
+from extractors.dash_extractor import read_dash_report
+
+INQUIRY_PAGES = 10
+
+
+@pytest.fixture
+def dash_pdf(tmp_path):
+    """Summary and detail pages followed by pages of Previous Inquiries boilerplate"""
+    summary = [
+        "DRIVER REPORT", "Jane Doe", "DLN: D1234-56789-01234 Ontario", "Date of Birth: 1990-07-20",
+        "Report Date: 2026-09-25 10:11:12 EDT", "Address: 5 King St Toronto ON M5V1A1 Number of Vehicles: 1",
+        "Gender: Female", "Marital Status: Married Years Licensed: 10", "Policies"
+    ]
+    details = []
+    for number in range(1, 6):
+        summary += [f"#{number} {2000 + number}-01-01 to {2001 + number}-01-01", f"Company {number}", "Expired"]
+        details += [
+            f"Policy #{number} {2000 + number}-01-01 to {2001 + number}-01-01 Company {number} Expired",
+            f"Policy #: P{number}", "Policyholder Name: Jane Doe",
+            "Number of Private Passenger Vehicles: 1", "Number of Reported Operators: 1"
+        ]
+    summary.append("Claims")
+    for number in range(1, 4):
+        summary += [f"#{number}", f"Date of Loss 201{number}-05-05", "Aviva", "At-Fault : 0%"]
+        details += [
+            f"Claim #{number} Date of Loss 201{number}-05-05 Aviva At-Fault : 0%",
+            "First Party Driver: Jane Doe", "First Party Driver At-Fault: 0%", "Total Loss: $1,234.00", "Claim Status: Closed"
+        ]
+    summary += ["Previous Inquiries", "2024-01-01 Some Broker"]
+
+    pages = ["\n".join(summary), "Page 2\n" + "\n".join(details)]
+    pages += ["Page %d\nPrevious Inquiries\n" % (index + 3) + "\n".join(
+        f"2020-01-{day:02d} Broker inquiry reference {index}-{day} for automobile quote" for day in range(1, 29)
+    ) for index in range(INQUIRY_PAGES)]
+
+    document = fitz.open()
+    for page_text in pages:
+        document.new_page().insert_text((36, 36), page_text, fontsize=8)
+    path = str(tmp_path / "dash.pdf")
+    document.save(path)
+    document.close()
+    return path
+
+
+def test_streaming_matches_full_read_and_stops_early(dash_pdf):
+    full, full_text = read_dash_report(dash_pdf, stream=False)
+    streamed, streamed_text = read_dash_report(dash_pdf, stream=True)
+
+    assert streamed == full
+    assert len(streamed_text) < len(full_text)
+    assert len(streamed["policies"]) == 5
+    assert len(streamed["claims"]) == 3
@@ -0,0 +1,47 @@
+import signal
+import threading
+import time
+
+import extraction_service
+from extraction_service import ExtractionService
+
+
+def _uninterruptible_extract(path):
+    """Stands in for an extractor stuck where the time budget cannot interrupt it (e.g. PyMuPDF)"""
+    signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})
+    time.sleep(30 if path == "stuck.pdf" else 1.5)
+    return {"policies": [path]}
+
+
+def test_stuck_document_does_not_abort_other_submissions(monkeypatch):
+    monkeypatch.setitem(extraction_service.EXTRACTORS, "dash", _uninterruptible_extract)
+    monkeypatch.setattr(extraction_service, "WORKER_GRACE_SECONDS", 2)
+    service = ExtractionService(max_workers=2, time_budget=0.5, cache_size=0)
+    results = {}
+
+    def submit(name, path):
+        results[name] = service.extract_submission([("dash", path)])
+
+    stuck = threading.Thread(target=submit, args=("stuck", "stuck.pdf"))
+    stuck.start()
+    time.sleep(0.5)
+    pool = service._pool
+    # Still running when the stuck submission gives up on its deadline
+    time.sleep(1.0)
+    other = threading.Thread(target=submit, args=("other", "other.pdf"))
+    other.start()
+    time.sleep(0.5)
+    workers = list(pool._processes.values())
+    stuck.join(10)
+    other.join(10)
+
+    assert results["stuck"]["dashes"][0]["timed_out"] is True
+    assert results["other"]["dashes"] == [{"policies": ["other.pdf"]}]
+
+    # The retired pool, stuck worker included, is stopped once the other document is done
+    for worker in workers:
+        worker.join(5)
+    assert not any(worker.is_alive() for worker in workers)
+    assert service._pool is not pool
+    assert service._inflight == {} and service._abandoned == {}
+    service.close()
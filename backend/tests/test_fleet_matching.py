@@ -0,0 +1,61 @@
+import random
+
+from validator.compare_engine import ValidationEngine
+from validator.fleet_matching import assign_by_score, solve_assignment
+
+
+def test_solve_assignment_maximizes_total():
+    assert solve_assignment([[1, 9], [9, 1]]) == [(0, 1), (1, 0)]
+
+
+def test_solve_assignment_rectangular():
+    pairs = solve_assignment([[5, 1, 0], [0, 1, 6]])
+    assert pairs == [(0, 0), (1, 2)]
+
+
+def test_assign_by_score_keeps_qualifying_pair_over_larger_total():
+    # Raw totals favour (0,1)+(1,0) = 60, but neither pair reaches the threshold
+    assert assign_by_score([[50, 30], [30, 0]], 50) == {0: (0, 50.0)}
+
+
+def test_assign_by_score_drops_pairs_below_threshold():
+    assert assign_by_score([[10, 0], [0, 20]], 50) == {}
+
+
+def fleet_submission(driver_count=20):
+    """Quote drivers with shuffled MVRs and DASH reports; every tenth MVR has a mistyped licence"""
+    rng = random.Random(42)
+    drivers, mvrs, dashes = [], [], []
+    for index in range(driver_count):
+        licence = f"S{index:04d}-{rng.randint(10000, 99999)}-{rng.randint(10000, 99999)}"
+        day, month, year = rng.randint(1, 28), rng.randint(1, 12), rng.randint(1950, 2000)
+        first, last = f"First{index}", f"Last{index}"
+        drivers.append({
+            "full_name": f"{first} {last}",
+            "licence_number": licence.replace("-", ""),
+            "birth_date": f"{month:02d}/{day:02d}/{year}",
+        })
+        mvrs.append({
+            "licence_number": licence if index % 10 else licence[:-1] + "X",
+            "name": f"{last.upper()},{first.upper()}",
+            "birth_date": f"{day:02d}/{month:02d}/{year}",
+        })
+        dashes.append({"dln": licence, "name": f"{first} {last}", "date_of_birth": f"{year}-{month:02d}-{day:02d}"})
+    rng.shuffle(mvrs)
+    rng.shuffle(dashes)
+    return {"drivers": drivers, "vehicles": [], "quote_effective_date": "01/01/2025"}, mvrs, dashes
+
+
+def test_fleet_assignment_recovers_mistyped_licences():
+    engine = ValidationEngine()
+    quote, mvrs, dashes = fleet_submission()
+
+    greedy = [engine._find_matching_mvr(engine._normalize_licence(d["licence_number"]), mvrs) for d in quote["drivers"]]
+    fleet = engine._assign_fleet_records(quote, mvrs, dashes)
+
+    assert sum(1 for mvr in greedy if mvr) == 18
+    assert len(fleet) == 20
+    for driver, (mvr, dash) in zip(quote["drivers"], fleet):
+        last = driver["full_name"].split()[1]
+        assert mvr["name"].startswith(last.upper())
+        assert dash["name"] == driver["full_name"]
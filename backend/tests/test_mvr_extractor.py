@@ -0,0 +1,95 @@
+import fitz
+import pytest
+
+from extractors.mvr_extractor import (TEXT_MODES, _meaningful, _safe_page_text, extract_mvr_fields_improved,
+                                      extract_text_robust)
+
+HEADERS = {
+    "standard": (
+        "LICENCE NUMBER: M1234-56789-01234 EXPIRY DATE: 15/03/2028\n"
+        "NAME: SMITH,JOHN,PAUL\n"
+        "BIRTH DATE: 15/03/1985 GENDER: M HEIGHT: 180 CM\n"
+        "ADDRESS: 12 MAIN ST\nTORONTO ON M6N1T3\nREFERENCE: ABC\n"
+        "CLASS: G\nSTATUS: LICENCED\nISSUE DATE: 02/05/2003\n"
+        "CONDITIONS: NONE\nRELEASE DATE: 01/10/2026\n"
+    ),
+    # Later label variants, which the cascade only reaches after missing the first ones
+    "variant_labels": (
+        "DRIVER LICENSE: M1234-56789-01234 EXPDT: 15/03/2028\n"
+        "NAME: SMITH,JOHN,PAUL\n"
+        "BIRTHDATE: 15/03/1985 SEX: M HEIGHT: 180 CM\n"
+        "MAILING ADDRESS: 12 MAIN ST\nTORONTO ON M6N1T3\nREFERENCE: ABC\n"
+        "CLASS: G\nDRIVER STATUS: LICENCED\nDRIVER LICENSE DATE: 02/05/2003\n"
+        "CONDITIONS: NONE\nREPORT GENERATED: 01-10-2026\n"
+    ),
+    # No driving record labels; every field falls back to the summary table row
+    "summary_table_only": "",
+    # No issue date label; the issue date is inferred from the dates in the abstract
+    "no_issue_label": (
+        "LICENCE NUMBER: M1234-56789-01234 EXPIRY DATE: 15/03/2028\n"
+        "NAME: SMITH,JOHN,PAUL\n"
+        "BIRTH DATE: 15/03/1985 GENDER: M HEIGHT: 180 CM\n"
+        "CLASS: G\nSTATUS: LICENCED\nRELEASE DATE: 01/10/2026\n"
+    ),
+}
+
+CONVICTION_PAGE = "".join(
+    f"{day:02d}/0{1 + day % 9}/20{10 + day % 15} SPEEDING {60 + day} KM/H IN 50 KM/H ZONE\n"
+    f"OFFENCE DATE 20{10 + day % 15}/0{1 + day % 9}/{day:02d}\n"
+    "DEMERIT POINTS - 3 POINTS\n"
+    for day in range(1, 29)
+) + "PAGE BREAK - CONTINUED\n"
+
+
+def abstract_text(header, pages=3):
+    return (
+        "ONTARIO DRIVER ABSTRACT\nSEARCH REQUESTED ON M1234-56789-01234 05-10-2026\n"
+        "ONTARIO DRIVING RECORD\n" + header +
+        "DATE CONVICTIONS, DISCHARGES AND OTHER ACTIONS\n" + CONVICTION_PAGE * pages +
+        "SEARCH SUCCESSFUL\nON M1234-56789-01234 SMITH,JOHN,PAUL 15/03/1985 15/03/2028\nEND OF REPORT\n"
+    )
+
+
+def empty_result():
+    return {"licence_number": None, "name": None, "birth_date": None, "gender": None, "address": None,
+            "convictions": [], "expiry_date": None, "issue_date": None, "status": None, "release_date": None}
+
+
+@pytest.mark.parametrize("scenario", sorted(HEADERS))
+def test_label_index_matches_cascade(scenario):
+    text = abstract_text(HEADERS[scenario])
+    cascade, indexed = empty_result(), empty_result()
+
+    extract_mvr_fields_improved(text, cascade, use_index=False)
+    extract_mvr_fields_improved(text, indexed, use_index=True)
+
+    assert indexed == cascade
+    assert indexed["licence_number"] == "M1234-56789-01234"
+    assert indexed["birth_date"]
+
+
+def cascade_text(pdf_document):
+    """Try every text mode on each page until one gives meaningful text"""
+    text = ""
+    for page in pdf_document:
+        for mode in TEXT_MODES:
+            candidate = _safe_page_text(page, mode)
+            if _meaningful(candidate):
+                text += candidate
+                break
+    return text
+
+
+@pytest.mark.parametrize("later_pages", [
+    pytest.param(["PAGE CONTINUED - SEE NEXT PAGE"] * 5, id="short_pages"),
+    pytest.param([""] * 5, id="blank_pages"),
+])
+def test_planned_text_extraction_matches_cascade(later_pages):
+    full_page = "\n".join(f"{day:02d}/03/2020 SPEEDING {60 + day} KM/H IN 50 KM/H ZONE" for day in range(1, 29))
+    pdf_document = fitz.open()
+    for page_text in [full_page] + later_pages:
+        pdf_document.new_page().insert_text((36, 36), page_text, fontsize=8)
+    try:
+        assert extract_text_robust(pdf_document) == cascade_text(pdf_document)
+    finally:
+        pdf_document.close()
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from extractors.dash_extractor import CLAIM_AT_FAULT_ENHANCED_PATTERNS
+from extractors.pattern_packs import _stats_lock
+
+# The only at-fault value is on the heading line, which the last fallback pattern reads
+CLAIM_BLOCK = (
+    "Claim #2 Date of Loss 2019-05-05 Aviva At-Fault : 100%\n"
+    "First Party Driver: Jane Doe\nFirst Party Driver Listed on Policy: Yes\n"
+    "Total Loss: $4,500.00\nClaim Status: Closed\n"
+)
+
+
+@pytest.fixture
+def pack():
+    pack = CLAIM_AT_FAULT_ENHANCED_PATTERNS
+    saved = (pack.order, pack.tries, pack.hits, pack.seconds, pack.profiled, pack.disagreements)
+    yield pack
+    pack.order, pack.tries, pack.hits, pack.seconds, pack.profiled, pack.disagreements = saved
+
+
+def plain_loop(patterns, text):
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+def test_declared_and_learned_orders_find_the_plain_loop_value(pack):
+    expected = plain_loop(pack.patterns, CLAIM_BLOCK).group(1)
+
+    pack.order = list(range(len(pack.patterns)))
+    declared = pack.search(CLAIM_BLOCK).group(1)
+
+    pack.reset_stats()
+    for _ in pack._profiled_matches(CLAIM_BLOCK, 0, len(CLAIM_BLOCK)):
+        pass
+    pack.order = pack.learned_order()
+    learned = pack.search(CLAIM_BLOCK).group(1)
+
+    assert declared == learned == expected == "100%"
+    # The pattern that hit is tried first once the order is learned
+    assert pack.order[0] != 0
+
+
+def test_record_waits_while_stats_are_drained(pack):
+    pack.reset_stats()
+    recorder = threading.Thread(target=pack.record, args=(0, True, 0.0))
+    with _stats_lock:
+        # A drain in progress: the try must not land in counters that are being swapped out
+        recorder.start()
+        recorder.join(0.2)
+        assert recorder.is_alive()
+        assert pack.tries[0] == 0
+    recorder.join(5)
+    assert pack.tries[0] == pack.hits[0] == 1
@@ -0,0 +1,53 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+from extraction_service import start_resource_tracker
+from extractors.pdf_source import PdfUpload, SharedPdf, open_pdf, share_pdf
+
+
+def make_pdf(pages):
+    document = fitz.open()
+    for number in range(pages):
+        document.new_page().insert_text((36, 36), f"Page {number + 1}")
+    data = document.tobytes()
+    document.close()
+    return data
+
+
+def page_count(path):
+    try:
+        document = open_pdf(path)
+        pages = len(document)
+        document.close()
+        return pages
+    finally:
+        if isinstance(path, SharedPdf):
+            path.detach()
+
+
+def test_upload_opens_from_memory():
+    assert page_count(PdfUpload("application.pdf", data=make_pdf(2))) == 2
+
+
+def test_shared_and_pickled_uploads_read_the_same_pages_in_workers():
+    uploads = [PdfUpload(f"document_{pages}.pdf", data=make_pdf(pages)) for pages in (1, 2, 3)]
+    start_resource_tracker()
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        pickled = [pool.submit(page_count, upload).result() for upload in uploads]
+        shared = []
+        for upload in uploads:
+            handle = share_pdf(upload, min_bytes=0)
+            try:
+                shared.append(pool.submit(page_count, handle).result())
+            finally:
+                handle.release()
+
+    assert pickled == shared == [1, 2, 3]
+
+
+def test_small_uploads_and_paths_are_not_shared(tmp_path):
+    path = tmp_path / "application.pdf"
+    path.write_bytes(make_pdf(1))
+    assert share_pdf(str(path)) is None
+    assert share_pdf(PdfUpload("small.pdf", data=make_pdf(1))) is None
@@ -0,0 +1,68 @@
+import random
+from datetime import datetime, timedelta
+
+from validator.policy_intervals import PolicyIntervals, analyze_policy_history
+
+
+def pairwise_gaps(policies):
+    """The strptime loop over consecutive policies that PolicyIntervals.gaps replaced"""
+    gaps = []
+    sorted_policies = sorted(policies, key=lambda x: x.get("start_date", ""))
+    for current_policy, next_policy in zip(sorted_policies, sorted_policies[1:]):
+        current_end = current_policy.get("end_date")
+        next_start = next_policy.get("start_date")
+        if current_end and next_start:
+            try:
+                end_date = datetime.strptime(current_end, "%Y-%m-%d")
+                start_date = datetime.strptime(next_start, "%Y-%m-%d")
+            except ValueError:
+                continue
+            gap_days = (start_date - end_date).days
+            if gap_days > 1:
+                gaps.append({
+                    "gap_days": gap_days,
+                    "previous_policy_end": current_end,
+                    "next_policy_start": next_start,
+                    "previous_policy_company": current_policy.get("company"),
+                    "next_policy_company": next_policy.get("company"),
+                    "cancellation_reason": current_policy.get("cancellation_reason")
+                })
+    return gaps
+
+
+def policy_history(count=40, seed=7):
+    """Shuffled consecutive terms with gaps and overlaps"""
+    rng = random.Random(seed)
+    policies = []
+    start = datetime(1985, 1, 1)
+    for index in range(count):
+        end = start + timedelta(days=rng.choice([182, 365, 365, 730]))
+        policies.append({
+            "policy_number": str(index + 1),
+            "start_date": start.strftime("%Y-%m-%d"),
+            "end_date": end.strftime("%Y-%m-%d"),
+            "company": f"Company {index % 7}",
+            "cancellation_reason": None
+        })
+        start = end + timedelta(days=rng.choice([-30, 0, 1, 1, 1, 45]))
+    rng.shuffle(policies)
+    return policies
+
+
+def test_vectorized_gaps_match_pairwise_loop():
+    policies = policy_history()
+    gaps = PolicyIntervals(policies).gaps()
+    assert gaps == pairwise_gaps(policies)
+    assert gaps
+
+
+def test_unparseable_dates_are_skipped_like_the_pairwise_loop():
+    policies = policy_history(count=6, seed=3)
+    policies[2]["end_date"] = "unknown"
+    assert PolicyIntervals(policies).gaps() == pairwise_gaps(policies)
+
+
+def test_history_reports_overlaps():
+    history = analyze_policy_history(policy_history())
+    assert history["policy_overlaps"]
+    assert set(history) == {"policy_gaps", "policy_overlaps", "insurance_coverage"}
@@ -0,0 +1,66 @@
+from quote_comparison_service import QuoteComparisonService
+
+
+def test_fleet_driver_matches_agree_with_match_score():
+    service = QuoteComparisonService()
+    quote_drivers = [
+        {"full_name": "Jane  Doe", "licence_number": "", "birth_date": "01/02/1980"},
+        {"full_name": "John Roe", "licence_number": "R1234-56789", "birth_date": "03/04/1975"},
+    ]
+    pdf_drivers = [
+        {"full_name": "john roe", "licence_number": "R123456789", "birth_date": "03/04/1975"},
+        {"full_name": "jane doe", "licence_number": "", "birth_date": "01/02/1980"},
+    ]
+    weights = {"name": 40, "license": 40, "birth_date": 20}
+
+    comparisons = service._compare_drivers_fleet(quote_drivers, pdf_drivers)
+
+    assert [c["pdf_matches"][0]["pdf_driver"] for c in comparisons] == [pdf_drivers[1], pdf_drivers[0]]
+    for comparison in comparisons:
+        match = comparison["pdf_matches"][0]
+        reported = sum(weights[field] for field, status in match["matches"].items() if status == "MATCH")
+        assert reported == match["match_score"]
+    # Empty licences on both sides are not a licence match
+    assert comparisons[0]["pdf_matches"][0]["matches"]["license"] == "MISMATCH"
+    assert comparisons[0]["confidence"] == 60
+    assert comparisons[1]["confidence"] == 100
+
+
+def test_fleet_vehicles_keep_a_qualifying_pair_over_two_weaker_ones():
+    service = QuoteComparisonService()
+    quote_vehicles = [
+        {"vin": "A", "vehicle_type": "PP", "fuel_type": "Gas"},
+        {"vin": "B", "vehicle_type": "COM", "fuel_type": "Diesel"},
+    ]
+    pdf_vehicles = [
+        {"vin": "A", "vehicle_type": "COM", "fuel_type": "Diesel"},
+        {"vin": "C", "vehicle_type": "PP", "fuel_type": "Gas"},
+    ]
+
+    fleet = service._compare_vehicles_fleet(quote_vehicles, pdf_vehicles)
+    pairwise = [service._compare_vehicle(vehicle, pdf_vehicles) for vehicle in quote_vehicles]
+
+    assert [c["status"] for c in fleet] == [c["status"] for c in pairwise] == ["MATCH", "NO_MATCH"]
+    assert fleet[0]["pdf_matches"][0]["pdf_vehicle"] == pdf_vehicles[0]
+    assert fleet[0]["confidence"] == 60
+    assert fleet[1]["pdf_matches"] == []
+
+
+def test_fleet_drivers_keep_a_qualifying_pair_over_two_weaker_ones():
+    service = QuoteComparisonService()
+    quote_drivers = [
+        {"full_name": "Jane Doe", "licence_number": "J1", "birth_date": "01/01/1980"},
+        {"full_name": "John Roe", "licence_number": "R1", "birth_date": "02/02/1970"},
+    ]
+    pdf_drivers = [
+        # Jane by name and birth date (60), John by licence (40)
+        {"full_name": "jane doe", "licence_number": "R1", "birth_date": "01/01/1980"},
+        # Jane by licence (40), not John; raw totals favour pairing across (80 over 60)
+        {"full_name": "Pat Poe", "licence_number": "J1", "birth_date": "03/03/1990"},
+    ]
+
+    fleet = service._compare_drivers_fleet(quote_drivers, pdf_drivers)
+
+    assert fleet[0]["status"] == "MATCH"
+    assert fleet[0]["pdf_matches"][0]["pdf_driver"] == pdf_drivers[0]
+    assert fleet[1]["status"] == "NO_MATCH"
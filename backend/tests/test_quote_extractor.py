@@ -0,0 +1,40 @@
+import re
+
+import pytest
+
+from extractors.quote_extractor import QuoteSectionIndex, _extract_driver_details
+
+DRIVER_COUNT = 12
+
+
+@pytest.fixture
+def quote_text():
+    lines = ["Quote Summary Prepared for you by Alice Broker Effective Date: 10/15/2026", "12 Main St, Toronto"]
+    for number in range(1, DRIVER_COUNT + 1):
+        # Names are letters only: "Pat Bc" for driver 12
+        surname = "".join(chr(ord("a") + int(digit)) for digit in str(number)).capitalize()
+        lines += [
+            f"Driver {number} of {DRIVER_COUNT} | Pat {surname}",
+            "03/15/1985", "Birth Date", "Married", "Marital Status", "Male", "Gender", "G", "Licence Class",
+            "05/02/2007", "Date G", "05/02/2004", "Date G2", "05/02/2003", "Date G1",
+            f"M{number:04d}5678901234", "Licence Number", "ON", "Licence Province", "Intact Insurance", "Current Carrier"
+        ]
+    for number in range(1, DRIVER_COUNT + 1):
+        lines += [f"Vehicle {number} of {DRIVER_COUNT} | 2019 Honda Civic", "2HGFC2F59KH123456", "Gasoline", "Fuel Type"]
+    lines += ["Coverages", "Bodily Injury $1,000,000"]
+    return "\n".join(lines) + "\n"
+
+
+def test_section_index_matches_lookup_by_name(quote_text, tmp_path, monkeypatch):
+    # _extract_driver_details writes its debug file to the working directory
+    monkeypatch.chdir(tmp_path)
+    names = [name.strip() for name in re.findall(r"Driver \d+ of \d+ \| ([A-Za-z\s\-]+)", quote_text)]
+
+    by_name = [_extract_driver_details(quote_text, name) for name in names]
+    indexed = [_extract_driver_details(quote_text, name, section=section)
+               for name, section in QuoteSectionIndex(quote_text).driver_sections()]
+
+    assert indexed == by_name
+    assert len(indexed) == DRIVER_COUNT
+    assert indexed[11]["full_name"] == "Pat Bc"
+    assert indexed[11]["licence_number"] == "M00125678901234"
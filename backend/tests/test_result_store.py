@@ -0,0 +1,34 @@
+import pytest
+
+from result_store import ResultStore, normalize_effective_date
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResultStore(path=str(tmp_path / "results.db"))
+
+
+def entry(effective_date):
+    return {"extracted": {"quotes": [{"quote_effective_date": effective_date,
+                                      "drivers": [{"full_name": "Jane Doe", "licence_number": "D1234-56789-01234"}]}]}}
+
+
+def test_search_by_effective_date_range_in_any_known_format(store):
+    march = store.save(entry("03/15/2026"))
+    store.save(entry("2026-06-01"))
+
+    found = store.search(effective_from="March 1, 2026", effective_to="2026/03/31")
+
+    assert [result["result_id"] for result in found] == [march]
+    assert store.get(march)["extracted"]["quotes"][0]["quote_effective_date"] == "03/15/2026"
+
+
+def test_search_rejects_unparseable_effective_date(store):
+    store.save(entry("03/15/2026"))
+    with pytest.raises(ValueError):
+        store.search(effective_from="sometime in spring")
+
+
+def test_unknown_effective_date_formats_are_stored_as_given():
+    assert normalize_effective_date("sometime in spring") == "sometime in spring"
+    assert normalize_effective_date("03/15/2026") == "2026-03-15"
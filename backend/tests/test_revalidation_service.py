@@ -0,0 +1,43 @@
+import copy
+
+import revalidation_service
+from extractors.quote_extractor import merge_mvr_convictions
+from revalidation_service import RevalidationService
+from validator.compare_engine import ValidationEngine
+
+LICENCE = "D1234-56789-01234"
+
+
+def mvr(*convictions):
+    return {
+        "licence_number": LICENCE, "name": "DOE,JANE", "birth_date": "20/07/1990",
+        "convictions": [{"offence_date": date, "description": description} for date, description in convictions]
+    }
+
+
+def quote():
+    return {
+        "quote_effective_date": "10/15/2026",
+        "drivers": [{"full_name": "Jane Doe", "licence_number": LICENCE, "birth_date": "07/20/1990"}],
+        "vehicles": [],
+        # Declared in the quote's Convictions section; an MVR listing it too replaces it
+        "convictions": [{"description": "Speeding", "date": "03/05/2024", "source": "Quote"}]
+    }
+
+
+def extracted(mvr_data):
+    return {"quotes": [merge_mvr_convictions(quote(), [mvr_data])], "mvrs": [mvr_data], "dashes": []}
+
+
+def test_mvr_revalidation_matches_full_validation(monkeypatch):
+    engine = ValidationEngine()
+    before = extracted(mvr())
+    previous = {"extracted": before, "validation_report": engine.validate_quote(copy.deepcopy(before))}
+    new_mvr = mvr(("05/03/2024", "Speeding"), ("01/02/2025", "Fail to stop"))
+    monkeypatch.setattr(revalidation_service, "extract_mvr_data", lambda path: copy.deepcopy(new_mvr))
+
+    result = RevalidationService().revalidate(previous, "mvr", "new_mvr.pdf")
+    after = extracted(new_mvr)
+
+    assert result["extracted"] == after
+    assert result["validation_report"] == engine.validate_quote(after)
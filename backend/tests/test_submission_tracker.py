@@ -0,0 +1,64 @@
+import threading
+
+from submission_tracker import SubmissionTracker
+
+
+class BlockingStore:
+    """A result store whose lookup for one fingerprint blocks until released"""
+
+    def __init__(self, slow_fingerprint):
+        self.slow_fingerprint = slow_fingerprint
+        self.looking_up = threading.Event()
+        self.release = threading.Event()
+
+    def find_by_fingerprint(self, fingerprint, reuse_seconds):
+        if fingerprint == self.slow_fingerprint:
+            self.looking_up.set()
+            self.release.wait(5)
+        return None
+
+
+def test_store_lookup_does_not_hold_up_other_submissions():
+    store = BlockingStore("slow")
+    tracker = SubmissionTracker(store)
+    slow = threading.Thread(target=tracker.run, args=("slow", lambda: ({}, 200), None))
+    slow.start()
+    try:
+        assert store.looking_up.wait(5)
+        finished = []
+        other = threading.Thread(target=lambda: finished.append(tracker.run("other", lambda: ({"ok": True}, 200), None)))
+        other.start()
+        other.join(2)
+        assert finished == [({"ok": True}, 200)]
+    finally:
+        store.release.set()
+        slow.join(5)
+
+
+def test_identical_running_submission_waits_for_the_first():
+    store = BlockingStore(None)
+    tracker = SubmissionTracker(store)
+    started, proceed = threading.Event(), threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        started.set()
+        proceed.wait(5)
+        return {"result_id": "r1"}, 200
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(tracker.run("same", work, None)))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=lambda: results.append(tracker.run("same", work, None)))
+    second.start()
+    proceed.set()
+    first.join(5)
+    second.join(5)
+
+    assert len(runs) == 1
+    assert sorted(results, key=lambda result: "duplicate_submission" in result[0]) == [
+        ({"result_id": "r1"}, 200),
+        ({"result_id": "r1", "duplicate_submission": True}, 200)
+    ]
@@ -0,0 +1,46 @@
+import fitz
+import pytest
+
+from extractors.table_extractor import read_tables
+from quote_comparison_service import QuoteComparisonService
+
+DRIVERS = 10
+DRIVER_COLUMNS = (36, 60, 220, 330, 370, 395, 420, 440)
+VEHICLE_COLUMNS = (36, 80, 170, 260, 320, 420)
+
+
+@pytest.fixture
+def application_pdf(tmp_path):
+    """An application with a driver table and a vehicle table laid out in columns"""
+    document = fitz.open()
+    page = None
+    y = 0
+    for number in range(1, DRIVERS + 1):
+        for columns, values in (
+            (DRIVER_COLUMNS, (str(number), f"Driver Name{chr(65 + number % 26)}", f"D{number:04d}-12345-67890",
+                              "1980", str(number % 12 + 1), str(number % 28 + 1), "MF"[number % 2], "SM"[number % 2])),
+            (VEHICLE_COLUMNS, ("2019", "HONDA", "CIVIC", "LX", "FOUR DOOR SEDAN", f"2HGFC2F5{number:09d}"))
+        ):
+            if page is None or y > 780:
+                page = document.new_page()
+                y = 50
+            for x, value in zip(columns, values):
+                page.insert_text((x, y), value, fontsize=9)
+            y += 14
+    path = str(tmp_path / "application.pdf")
+    document.save(path)
+    document.close()
+    return path
+
+
+def test_table_rows_read_every_driver_and_vehicle(application_pdf):
+    service = QuoteComparisonService.__new__(QuoteComparisonService)
+
+    text = service.extract_pdf_text(application_pdf)
+    from_text = service.extract_pdf_fields(text)
+    rows = []
+    text = service.extract_pdf_text(application_pdf, rows)
+    from_tables = service.extract_pdf_fields(text, read_tables(rows))
+
+    assert len(from_tables["drivers"]) == len(from_text["drivers"]) == DRIVERS
+    assert sum(1 for vehicle in from_tables["vehicles"] if vehicle.get("make")) == DRIVERS
@@ -0,0 +1,69 @@
+import fitz
+import pytest
+
+from extractors.mvr_extractor import extract_mvr_data
+from extractors.quote_extractor import extract_quote_data
+from extractors.time_budget import run_with_budget, track_partial
+
+ADVERSARIAL_SIZE = 8000
+BUDGET_SECONDS = 2.0
+
+
+@pytest.fixture(autouse=True)
+def working_directory(tmp_path, monkeypatch):
+    # The extractors write their debug files to the working directory
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def write_pdf(directory, name, text):
+    lines = text.split("\n")
+    document = fitz.open()
+    for start in range(0, len(lines), 60):
+        document.new_page().insert_text((36, 36), "\n".join(lines[start:start + 60]), fontsize=6)
+    path = str(directory / f"{name}.pdf")
+    document.save(path)
+    document.close()
+    return path
+
+
+def test_run_with_budget_returns_result_within_budget():
+    assert run_with_budget(lambda path: {"path": path}, "doc.pdf", BUDGET_SECONDS) == {"path": "doc.pdf"}
+
+
+def test_run_with_budget_returns_tracked_partial_on_timeout():
+    def runaway(path):
+        track_partial({"name": "JANE DOE", "claims": []})
+        while True:
+            pass
+
+    result = run_with_budget(runaway, "doc.pdf", 0.2)
+    assert result["timed_out"] is True
+    assert result["time_budget_seconds"] == 0.2
+    assert result["name"] == "JANE DOE"
+
+
+def test_mvr_address_block_is_cut_short_with_partial_fields(working_directory):
+    # Colon-free upper-case lines make the address patterns backtrack
+    path = write_pdf(working_directory, "mvr_address_block", (
+        "ONTARIO DRIVER ABSTRACT\nLICENCE NUMBER: M1234-56789-01234\nADDRESS: 12 MAIN ST\n" +
+        "TORONTO ON SOME LONG UPPER CASE LINE WITHOUT A COLON\n" * ADVERSARIAL_SIZE
+    ))
+
+    result = run_with_budget(extract_mvr_data, path, BUDGET_SECONDS)
+
+    assert result["timed_out"] is True
+    assert result["licence_number"]
+    assert result["name"]
+
+
+def test_quote_conviction_run_is_cut_short_with_partial_fields(working_directory):
+    # The conviction patterns rescan the text from every "Conviction"
+    path = write_pdf(working_directory, "quote_conviction_run",
+                     "Driver 1 of 1 | Jane Doe\n" + "Conviction Conviction\n" * (ADVERSARIAL_SIZE // 2))
+
+    result = run_with_budget(extract_quote_data, path, BUDGET_SECONDS)
+
+    assert result["timed_out"] is True
+    assert result["drivers"]
+    assert result["applicant"]
@@ -0,0 +1,361 @@
+from datetime import datetime
+import numpy as np
+from validator.compare_engine import ValidationEngine
+
+APRIL_1_1994 = np.datetime64("1994-04-01")
+DASH_REPORT_MAX_DAYS = 45
+MVR_REPORT_MAX_DAYS = 30
+CLAIM_WINDOW_YEARS = 9.0
+NAT = np.datetime64("NaT", "D")
+
+
+def add_years(dates, years):
+    """
+    Vectorized relativedelta(years=n) for a datetime64[D] array: keeps month and day,
+    clamps Feb 29 to Feb 28 in non-leap years, and leaves NaT as NaT
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    result = np.full(dates.shape, NAT)
+    valid = ~np.isnat(dates)
+    if not valid.any():
+        return result
+
+    valid_dates = dates[valid]
+    months = valid_dates.astype("datetime64[M]")
+    day_offset = (valid_dates - months.astype("datetime64[D]")).astype(np.int64)
+
+    shifted = months + np.timedelta64(12 * years, "M")
+    month_start = shifted.astype("datetime64[D]")
+    month_length = ((shifted + np.timedelta64(1, "M")).astype("datetime64[D]") - month_start).astype(np.int64)
+
+    result[valid] = month_start + np.minimum(day_offset, month_length - 1)
+    return result
+
+
+def parse_as_of(as_of):
+    """
+    Reference date for the claim window as datetime64[D]: today when as_of is None, otherwise a
+    datetime, date or "YYYY-MM-DD" string. Raises ValueError for anything else
+    """
+    if as_of is None:
+        return np.datetime64("today", "D")
+    text = str(as_of)[:10]
+    datetime.strptime(text, "%Y-%m-%d")
+    return np.datetime64(text, "D")
+
+
+def _day_of_month(dates):
+    return (dates - dates.astype("datetime64[M]").astype("datetime64[D]")).astype(np.int64)
+
+
+def _month_of_year(dates):
+    return dates.astype("datetime64[M]").astype(np.int64) % 12
+
+
+class BatchValidationEngine:
+    """
+    Portfolio-scale re-validation of the date-based rules over many stored submissions.
+    Extracted records are loaded once into columnar datetime64 arrays and the rules from
+    ValidationEngine._validate_report_age, _is_claim_less_than_9_years_old and the G1/G2/G
+    progression (_calculate_license_dates_from_mvr) are evaluated as array operations.
+    Name, address and conviction checks stay with the per-driver ValidationEngine.
+    """
+
+    def __init__(self):
+        # Reuse the single-driver engine's date parsing and name matching so both modes agree
+        self.engine = ValidationEngine()
+        self._parse_cache = {}
+
+    def validate_portfolio(self, submissions, as_of=None):
+        """
+        submissions: list of extracted submissions ({"mvrs", "dashes", "quotes"} or the "extracted" wrapper)
+        as_of: reference date (datetime, date or "YYYY-MM-DD") for the 9-year claim window, defaults to today
+        Returns a summary of flag counts and the list of flagged drivers
+        """
+        as_of_date = parse_as_of(as_of)
+
+        drivers, claims = self._load_columns(submissions)
+        flags = [[] for _ in range(len(drivers["driver_name"]))]
+
+        counts = {}
+        counts.update(self._check_report_age(drivers, flags))
+        counts.update(self._check_claim_window(drivers, claims, as_of_date, flags))
+        counts.update(self._check_license_progression(drivers, flags))
+
+        flagged_drivers = []
+        for index, driver_flags in enumerate(flags):
+            if not driver_flags:
+                continue
+            flagged_drivers.append({
+                "submission_index": int(drivers["submission"][index]),
+                "driver_name": drivers["driver_name"][index],
+                "driver_license": drivers["driver_license"][index],
+                "status": "FAIL" if any(flag["severity"] == "critical" for flag in driver_flags) else "WARNING",
+                "flags": driver_flags
+            })
+
+        return {
+            "summary": {
+                "total_submissions": len(submissions),
+                "total_drivers": len(flags),
+                "flagged_drivers": len(flagged_drivers),
+                "as_of": str(as_of_date),
+                "flag_counts": counts
+            },
+            "flagged_drivers": flagged_drivers
+        }
+
+    def _parse_dates(self, values, source_type):
+        """Parse a column of date strings into datetime64[D]; unparsable or missing values become NaT"""
+        parsed = []
+        for value in values:
+            if not value:
+                parsed.append("NaT")
+                continue
+            key = (value, source_type)
+            iso = self._parse_cache.get(key)
+            if iso is None:
+                if source_type == "dash_report":
+                    dt = self.engine._parse_date_dash_format(value)
+                else:
+                    dt = self.engine._parse_date(value, source_type)
+                iso = dt.strftime("%Y-%m-%d") if dt else "NaT"
+                self._parse_cache[key] = iso
+            parsed.append(iso)
+        return np.array(parsed, dtype="datetime64[D]")
+
+    def _load_columns(self, submissions):
+        """Flatten every quote driver (and the claims of its matched DASH) into column lists, then arrays"""
+        engine = self.engine
+        raw = {
+            "submission": [], "quote": [], "driver_name": [], "driver_license": [],
+            "quote_effective": [], "quote_g1": [], "quote_g2": [], "quote_g": [],
+            "has_mvr": [], "has_dash": [], "has_issue_raw": [],
+            "mvr_birth": [], "mvr_expiry": [], "mvr_issue": [], "mvr_release": [], "dash_report": []
+        }
+        raw_claims = {"driver": [], "quote": [], "date": [], "claim_number": [], "at_fault": [], "attributed": []}
+        raw_quote_claims = {"quote": [], "date": []}
+
+        quote_id = 0
+        for submission_index, submission in enumerate(submissions):
+            quotes, mvrs, dashes = engine._unpack_documents(submission)
+
+            # First record per licence wins, as in _find_matching_mvr/_find_matching_dash
+            mvr_by_licence = {}
+            for mvr in mvrs:
+                if mvr.get("licence_number") is not None:
+                    mvr_by_licence.setdefault(engine._normalize_licence(mvr["licence_number"]), mvr)
+            dash_by_licence = {}
+            for dash in dashes:
+                if dash.get("dln") is not None:
+                    dash_by_licence.setdefault(engine._normalize_licence(dash["dln"]), dash)
+
+            for quote in quotes:
+                for quote_claim in quote.get("claims", []):
+                    raw_quote_claims["quote"].append(quote_id)
+                    raw_quote_claims["date"].append(quote_claim.get("date", ""))
+
+                policyholder_name = ""
+                if quote.get("drivers"):
+                    policyholder_name = quote["drivers"][0].get("full_name", "")
+                policyholder_parts = engine._name_parts(policyholder_name)
+
+                for driver in quote.get("drivers", []):
+                    driver_index = len(raw["driver_name"])
+                    licence = engine._normalize_licence(driver.get("licence_number", ""))
+                    mvr = mvr_by_licence.get(licence) or {}
+                    dash = dash_by_licence.get(licence) or {}
+
+                    raw["submission"].append(submission_index)
+                    raw["quote"].append(quote_id)
+                    raw["driver_name"].append(driver.get("full_name"))
+                    raw["driver_license"].append(driver.get("licence_number"))
+                    raw["quote_effective"].append(quote.get("quote_effective_date", ""))
+                    raw["quote_g1"].append(driver.get("date_g1", ""))
+                    raw["quote_g2"].append(driver.get("date_g2", ""))
+                    raw["quote_g"].append(driver.get("date_g", ""))
+                    raw["has_mvr"].append(bool(mvr))
+                    raw["has_dash"].append(bool(dash))
+                    raw["has_issue_raw"].append(bool(mvr.get("issue_date")))
+                    raw["mvr_birth"].append(mvr.get("birth_date", ""))
+                    raw["mvr_expiry"].append(mvr.get("expiry_date", ""))
+                    raw["mvr_issue"].append(mvr.get("issue_date", ""))
+                    raw["mvr_release"].append(mvr.get("release_date", ""))
+                    raw["dash_report"].append(dash.get("report_date", ""))
+
+                    for claim in dash.get("claims", []):
+                        first_party_driver = claim.get("first_party_driver", "")
+                        # Same attribution as _validate_claims: no first-party driver means the policyholder
+                        attributed = not first_party_driver or bool(policyholder_name and (
+                            engine._name_parts_match(engine._name_parts(first_party_driver), policyholder_parts) or
+                            engine._similar(first_party_driver, policyholder_name)
+                        ))
+                        raw_claims["driver"].append(driver_index)
+                        raw_claims["quote"].append(quote_id)
+                        raw_claims["date"].append(claim.get("date", ""))
+                        raw_claims["claim_number"].append(claim.get("claim_number", "Unknown"))
+                        raw_claims["at_fault"].append(claim.get("at_fault_percentage", 0))
+                        raw_claims["attributed"].append(attributed)
+
+                quote_id += 1
+
+        drivers = {
+            "submission": np.array(raw["submission"], dtype=np.int64),
+            "quote": np.array(raw["quote"], dtype=np.int64),
+            "driver_name": raw["driver_name"],
+            "driver_license": raw["driver_license"],
+            "quote_effective": self._parse_dates(raw["quote_effective"], "quote"),
+            "quote_g1": self._parse_dates(raw["quote_g1"], "quote"),
+            "quote_g2": self._parse_dates(raw["quote_g2"], "quote"),
+            "quote_g": self._parse_dates(raw["quote_g"], "quote"),
+            "quote_g1_raw": raw["quote_g1"],
+            "quote_g2_raw": raw["quote_g2"],
+            "quote_g_raw": raw["quote_g"],
+            "has_mvr": np.array(raw["has_mvr"], dtype=bool),
+            "has_dash": np.array(raw["has_dash"], dtype=bool),
+            "mvr_birth": self._parse_dates(raw["mvr_birth"], "mvr"),
+            "mvr_expiry": self._parse_dates(raw["mvr_expiry"], "mvr"),
+            "mvr_release": self._parse_dates(raw["mvr_release"], "mvr"),
+            "dash_report": self._parse_dates(raw["dash_report"], "dash_report"),
+        }
+
+        # Issue date, falling back to the earliest known MVR date as in _infer_license_issue_date
+        explicit_issue = self._parse_dates(raw["mvr_issue"], "mvr")
+        inferred_issue = np.fmin(np.fmin(drivers["mvr_expiry"], drivers["mvr_birth"]), drivers["mvr_release"])
+        drivers["mvr_issue"] = np.where(np.array(raw["has_issue_raw"], dtype=bool), explicit_issue, inferred_issue)
+
+        claims = {
+            "driver": np.array(raw_claims["driver"], dtype=np.int64),
+            "quote": np.array(raw_claims["quote"], dtype=np.int64),
+            "date": self._parse_dates(raw_claims["date"], "dash"),
+            "date_raw": raw_claims["date"],
+            "claim_number": raw_claims["claim_number"],
+            "at_fault": raw_claims["at_fault"],
+            "attributed": np.array(raw_claims["attributed"], dtype=bool),
+        }
+        claims["quote_claim_quote"] = np.array(raw_quote_claims["quote"], dtype=np.int64)
+        claims["quote_claim_date"] = self._parse_dates(raw_quote_claims["date"], "quote")
+
+        return drivers, claims
+
+    def _flag(self, flags, index, rule, severity, message):
+        flags[index].append({"rule": rule, "severity": severity, "message": message})
+
+    def _check_report_age(self, drivers, flags):
+        """DASH report within 45 days and MVR release within 30 days of the quote effective date"""
+        effective = drivers["quote_effective"]
+
+        dash_age = (effective - drivers["dash_report"]).astype("timedelta64[D]").astype(np.int64)
+        dash_known = drivers["has_dash"] & ~np.isnat(effective) & ~np.isnat(drivers["dash_report"])
+        dash_too_old = dash_known & (dash_age > DASH_REPORT_MAX_DAYS)
+
+        mvr_age = (effective - drivers["mvr_release"]).astype("timedelta64[D]").astype(np.int64)
+        mvr_known = drivers["has_mvr"] & ~np.isnat(effective) & ~np.isnat(drivers["mvr_release"])
+        mvr_too_old = mvr_known & (mvr_age > MVR_REPORT_MAX_DAYS)
+
+        for index in np.flatnonzero(dash_too_old):
+            self._flag(flags, index, "report_age", "critical",
+                       f"DASH report is too old: {dash_age[index]} days since generation (>{DASH_REPORT_MAX_DAYS} days limit)")
+        for index in np.flatnonzero(mvr_too_old):
+            self._flag(flags, index, "report_age", "critical",
+                       f"MVR report is too old: {mvr_age[index]} days since release (>{MVR_REPORT_MAX_DAYS} days limit)")
+
+        return {"dash_report_too_old": int(dash_too_old.sum()), "mvr_report_too_old": int(mvr_too_old.sum())}
+
+    def _check_claim_window(self, drivers, claims, as_of_date, flags):
+        """DASH claims under 9 years old that are attributed to the policyholder must be declared in the quote"""
+        if not len(claims["driver"]):
+            return {"undeclared_recent_claims": 0}
+
+        claim_dates = claims["date"]
+        age_years = (as_of_date - claim_dates).astype("timedelta64[D]").astype(np.int64) / 365.25
+        recent = ~np.isnat(claim_dates) & (age_years < CLAIM_WINDOW_YEARS)
+
+        # A claim is declared when its quote has a claim on the same date
+        day_numbers = claim_dates.astype(np.int64)
+        quote_day_numbers = claims["quote_claim_date"].astype(np.int64)
+        known_quote_claims = ~np.isnat(claims["quote_claim_date"])
+        declared = np.isin(
+            claims["quote"] * 1_000_000 + day_numbers,
+            claims["quote_claim_quote"][known_quote_claims] * 1_000_000 + quote_day_numbers[known_quote_claims]
+        )
+
+        undeclared = recent & claims["attributed"] & ~declared
+        for claim_index in np.flatnonzero(undeclared):
+            self._flag(flags, claims["driver"][claim_index], "claims", "critical",
+                       f"Claim {claims['claim_number'][claim_index]} ({claims['at_fault'][claim_index]}% at-fault) "
+                       f"on {claims['date_raw'][claim_index]} not declared in quote "
+                       f"(claim age: {age_years[claim_index]:.1f} years)")
+
+        return {"undeclared_recent_claims": int(undeclared.sum())}
+
+    def _check_license_progression(self, drivers, flags):
+        """
+        Expected G1/G2/G dates from MVR dates:
+        - issue date before April 1, 1994: issue date is the G date, G1/G2 not required
+        - DD/MM of expiry and birth match: G1 = issue date, otherwise G1 = expiry - 5 years
+        - G2 = G1 + 1 year, G = G2 + 1 year
+        """
+        has_mvr = drivers["has_mvr"]
+        expiry, birth, issue = drivers["mvr_expiry"], drivers["mvr_birth"], drivers["mvr_issue"]
+        quote_g1, quote_g2, quote_g = drivers["quote_g1"], drivers["quote_g2"], drivers["quote_g"]
+
+        pre_1994 = has_mvr & ~np.isnat(issue) & (issue < APRIL_1_1994)
+        calculable = has_mvr & ~pre_1994 & ~np.isnat(expiry) & ~np.isnat(birth) & ~np.isnat(issue)
+        not_calculable = has_mvr & ~pre_1994 & ~calculable
+
+        same_day_month = (_day_of_month(expiry) == _day_of_month(birth)) & (_month_of_year(expiry) == _month_of_year(birth))
+        expected_g1 = np.where(same_day_month, issue, add_years(expiry, -5))
+        expected_g2 = add_years(expected_g1, 1)
+        expected_g = add_years(expected_g2, 1)
+        expected_g = np.where(pre_1994, issue, expected_g)
+
+        counts = {"license_progression_mismatches": 0, "license_progression_incomplete": int(not_calculable.sum())}
+
+        checks = [
+            ("G1", quote_g1, expected_g1, drivers["quote_g1_raw"], calculable),
+            ("G2", quote_g2, expected_g2, drivers["quote_g2_raw"], calculable),
+            ("G", quote_g, expected_g, drivers["quote_g_raw"], calculable | pre_1994),
+        ]
+        for label, quote_dates, expected, quote_raw, applies in checks:
+            present = np.array([bool(value) for value in quote_raw], dtype=bool)
+            missing = applies & ~present
+            mismatch = applies & present & (np.isnat(quote_dates) | (quote_dates != expected))
+            counts["license_progression_mismatches"] += int(missing.sum() + mismatch.sum())
+
+            for index in np.flatnonzero(missing):
+                self._flag(flags, index, "license_progression", "critical",
+                           f"Quote missing {label} date, expected: '{self._quote_format(expected[index])}'")
+            for index in np.flatnonzero(mismatch):
+                self._flag(flags, index, "license_progression", "critical",
+                           f"{label} date mismatch: Expected '{self._quote_format(expected[index])}' vs Quote '{quote_raw[index]}'")
+
+        for index in np.flatnonzero(not_calculable):
+            self._flag(flags, index, "license_progression", "critical",
+                       "Could not calculate expected license dates from MVR data")
+
+        # Progression order, only for post-April 1, 1994 licences
+        order_checks = [("G1", quote_g1, "G2", quote_g2), ("G2", quote_g2, "G", quote_g)]
+        for first_label, first, second_label, second in order_checks:
+            out_of_order = has_mvr & ~pre_1994 & ~np.isnat(first) & ~np.isnat(second) & (first >= second)
+            counts["license_progression_mismatches"] += int(out_of_order.sum())
+            for index in np.flatnonzero(out_of_order):
+                self._flag(flags, index, "license_progression", "critical",
+                           f"{first_label} date should be before {second_label} date")
+
+        return counts
+
+    def _quote_format(self, date):
+        """datetime64 to the quote's MM/DD/YYYY format"""
+        if np.isnat(date):
+            return ""
+        year, month, day = str(date).split("-")
+        return f"{month}/{day}/{year}"
+
+
+def validate_portfolio(submissions, as_of=None):
+    """
+    Convenience function for batch re-validation of stored submissions
+    """
+    engine = BatchValidationEngine()
+    return engine.validate_portfolio(submissions, as_of=as_of)
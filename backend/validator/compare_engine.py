@@ -2,6 +2,135 @@ from difflib import SequenceMatcher
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import re
+from validator.policy_intervals import PolicyIntervals
+
+
+class DriverFacts:
+    """
+    Per-driver fact sheet built once before the validation rules run.
+    Every rule reads parsed dates, normalized licences and name parts from here
+    instead of re-deriving them from the raw Quote, MVR and DASH dicts.
+    """
+    __slots__ = (
+        "now",
+        "quote_effective_raw", "quote_effective_date",
+        "quote_name", "quote_name_parts",
+        "quote_license_raw", "quote_license",
+        "licence_class",
+        "policyholder_name", "policyholder_name_parts",
+        "mvr_license_raw", "mvr_license",
+        "mvr_name", "mvr_name_parts",
+        "mvr_birth_raw", "mvr_birth_date",
+        "mvr_expiry_raw", "mvr_expiry_date",
+        "mvr_issue_raw", "mvr_issue_date", "mvr_issue_inferred",
+        "mvr_release_raw", "mvr_release_date",
+        "dash_name", "dash_name_parts",
+        "dash_license_raw",
+        "dash_report_raw", "dash_report_date",
+    )
+
+    now: datetime
+    quote_effective_raw: str
+    quote_effective_date: datetime
+    quote_name: str
+    quote_name_parts: list
+    quote_license_raw: str
+    quote_license: str
+    licence_class: str
+    policyholder_name: str
+    policyholder_name_parts: list
+    mvr_license_raw: str
+    mvr_license: str
+    mvr_name: str
+    mvr_name_parts: list
+    mvr_birth_raw: str
+    mvr_birth_date: datetime
+    mvr_expiry_raw: str
+    mvr_expiry_date: datetime
+    mvr_issue_raw: str
+    mvr_issue_date: datetime
+    mvr_issue_inferred: bool
+    mvr_release_raw: str
+    mvr_release_date: datetime
+    dash_name: str
+    dash_name_parts: list
+    dash_license_raw: str
+    dash_report_raw: str
+    dash_report_date: datetime
+
+
+class ValidationRule:
+    """
+    One registered validation check: the driver report section it fills, the
+    category callers select it by, and the documents it needs.
+    `requires` must all be matched for the rule to run; `uses` are read when present.
+    """
+    __slots__ = ("report_key", "category", "requires", "uses", "run")
+
+    def __init__(self, report_key, category, run, requires=(), uses=()):
+        self.report_key = report_key
+        self.category = category
+        self.run = run
+        self.requires = tuple(requires)
+        self.uses = tuple(set(requires) | set(uses))
+
+
+class ValidationPlan:
+    """Rules selected for one validate_quote call and the documents they need"""
+    __slots__ = ("categories", "rules", "skipped_rules", "uses_mvr", "uses_dash", "requires_mvr", "requires_dash")
+
+    def __init__(self, categories, rules, skipped_rules, no_dash_report=False):
+        self.categories = categories
+        self.rules = rules
+        self.skipped_rules = skipped_rules
+        self.uses_mvr = any("mvr" in rule.uses for rule in rules)
+        # With noDashReport set, DASH records are never matched, even for rules that only read them
+        self.uses_dash = not no_dash_report and any("dash" in rule.uses for rule in rules)
+        self.requires_mvr = any("mvr" in rule.requires for rule in rules)
+        self.requires_dash = any("dash" in rule.requires for rule in rules)
+
+
+# Registered checks in report order. Each run callable receives
+# (engine, driver, quote, mvr, dash, facts) and returns a section dict.
+VALIDATION_RULES = (
+    ValidationRule(
+        "mvr_validation", "mvr",
+        lambda engine, driver, quote, mvr, dash, facts: engine._validate_mvr_data_enhanced(driver, mvr, quote, facts),
+        requires=("mvr",)
+    ),
+    ValidationRule(
+        "license_progression_validation", "license_progression",
+        lambda engine, driver, quote, mvr, dash, facts: engine._validate_license_progression_enhanced(driver, mvr, facts),
+        requires=("mvr",)
+    ),
+    ValidationRule(
+        "convictions_validation", "convictions",
+        lambda engine, driver, quote, mvr, dash, facts: engine._validate_convictions_enhanced(driver, mvr, quote),
+        requires=("mvr",)
+    ),
+    ValidationRule(
+        "dash_validation", "dash",
+        lambda engine, driver, quote, mvr, dash, facts: engine._validate_dash_data(driver, dash, quote, facts),
+        requires=("dash",)
+    ),
+    ValidationRule(
+        "driver_training_validation", "driver_training",
+        lambda engine, driver, quote, mvr, dash, facts: engine._validate_driver_training(driver, quote),
+        requires=("mvr",)
+    ),
+    ValidationRule(
+        "report_age_validation", "report_age",
+        lambda engine, driver, quote, mvr, dash, facts: engine._validate_report_age(dash, mvr, quote, facts),
+        uses=("mvr", "dash")
+    ),
+)
+
+VALIDATION_CATEGORIES = tuple(rule.category for rule in VALIDATION_RULES)
+
+# Days an MVR or DASH report stays valid before the quote effective date
+MVR_MAX_AGE_DAYS = 30
+DASH_MAX_AGE_DAYS = 45
+
 
 class ValidationEngine:
     """
@@ -20,21 +149,44 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             "drivers": []
         }
     
-    def validate_quote(self, data, no_dash_report=False):
+    def compile_plan(self, categories=None, no_dash_report=False):
+        """
+        Select the registered rules to run for a request.
+        categories: iterable of names from VALIDATION_CATEGORIES, or None for every rule.
+        DASH rules are moved to skipped_rules when no_dash_report is set.
+        """
+        if categories is None:
+            selected = set(VALIDATION_CATEGORIES)
+        else:
+            selected = set(categories)
+            unknown = selected - set(VALIDATION_CATEGORIES)
+            if unknown:
+                raise ValueError(f"Unknown validation categories: {', '.join(sorted(unknown))}")
+        
+        rules = []
+        skipped_rules = []
+        for rule in VALIDATION_RULES:
+            if rule.category not in selected:
+                continue
+            if no_dash_report and "dash" in rule.requires:
+                skipped_rules.append(rule)
+            else:
+                rules.append(rule)
+        
+        return ValidationPlan(selected, rules, skipped_rules, no_dash_report)
+
+    def validate_quote(self, data, no_dash_report=False, categories=None, fleet=False, on_driver=None):
         """
         Main validation function that compares MVR, DASH, and Quote data
+        categories: optional subset of VALIDATION_CATEGORIES to run (e.g. ["report_age"] for a pre-screen)
+        fleet: match drivers to MVR/DASH records one-to-one by assignment over licence, name and
+               birth date scores (for commercial quotes with many drivers) instead of first licence match
+        on_driver: optional callback, called with each driver's report as soon as it is validated
         """
+        plan = self.compile_plan(categories, no_dash_report)
+        
         try:
-            # Handle the new data structure with "extracted" wrapper
-            if "extracted" in data:
-                quotes = data["extracted"].get("quotes", [])
-                mvrs = data["extracted"].get("mvrs", [])
-                dashes = data["extracted"].get("dashes", [])
-            else:
-                # Legacy structure
-                quotes = data.get("quotes", [])
-                mvrs = data.get("mvrs", [])
-                dashes = data.get("dashes", [])
+            quotes, mvrs, dashes = self._unpack_documents(data)
             
             # Validate input data
             if not quotes:
@@ -50,7 +202,8 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                     "error": "No quote data found"
                 }
             
-            print(f"Validating {len(quotes)} quotes with {len(mvrs)} MVRs and {len(dashes)} DASH reports")
+            print(f"Validating {len(quotes)} quotes with {len(mvrs)} MVRs and {len(dashes)} DASH reports "
+                  f"({len(plan.rules)} of {len(VALIDATION_RULES)} rules)")
         except Exception as e:
             print(f"Error in validate_quote: {e}")
             return {
@@ -77,32 +230,187 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             "drivers": []
         }
 
+        # One reference timestamp per request so every driver's age checks agree
+        now = datetime.now()
+
         for quote in quotes:
+            assignments = self._assign_fleet_records(quote, mvrs, dashes, plan) if fleet else None
+            
             # Process each driver in the quote
+            for index, driver in enumerate(quote.get("drivers", [])):
+                assigned = assignments[index] if assignments else None
+                driver_report = self._validate_driver(driver, quote, mvrs, dashes, no_dash_report, now=now, plan=plan,
+                                                      assigned=assigned)
+                self.report["drivers"].append(driver_report)
+                self._add_to_summary(self.report["summary"], driver_report)
+                if on_driver:
+                    on_driver(driver_report)
+
+        return self.report
+
+    def revalidate(self, data, previous_report, changed_input, licences, no_dash_report=False,
+                   categories=None, shared_categories=()):
+        """
+        Re-run only the rules affected by one replaced document and merge them into a previous report.
+        changed_input: "mvr" or "dash" - rules that read this input are re-run
+        licences: normalized licence numbers of the replaced and replacement documents;
+                  only drivers with one of these licences are revalidated
+        shared_categories: categories re-run for every driver (e.g. convictions when the
+                  MVR convictions merged into the quote changed)
+        Returns (report, revalidated) where revalidated lists the drivers and sections re-run.
+        """
+        plan = self.compile_plan(categories, no_dash_report)
+        quotes, mvrs, dashes = self._unpack_documents(data)
+        previous_drivers = previous_report.get("drivers", [])
+        now = datetime.now()
+        
+        report = {
+            "summary": {
+                "total_drivers": 0,
+                "validated_drivers": 0,
+                "issues_found": 0,
+                "critical_errors": 0,
+                "warnings": 0
+            },
+            "drivers": []
+        }
+        revalidated = []
+        
+        index = 0
+        for quote in quotes:
             for driver in quote.get("drivers", []):
-                self.report["summary"]["total_drivers"] += 1
+                previous_driver = previous_drivers[index] if index < len(previous_drivers) else None
+                index += 1
                 
-                driver_report = self._validate_driver(driver, quote, mvrs, dashes, no_dash_report)
-                self.report["drivers"].append(driver_report)
+                driver_licence = self._normalize_licence(driver.get("licence_number", ""))
+                rules = [
+                    rule for rule in plan.rules
+                    if (changed_input in rule.uses and driver_licence in licences)
+                    or rule.category in shared_categories
+                ]
                 
-                if driver_report["validation_status"] == "PASS":
-                    self.report["summary"]["validated_drivers"] += 1
-                elif driver_report["validation_status"] == "WARNING":
-                    # Count warnings as partial validation
-                    self.report["summary"]["validated_drivers"] += 0.5
-                    self.report["summary"]["warnings"] += len(driver_report.get("warnings", []))
+                if previous_driver is None or self._has_error_sections(previous_driver):
+                    # Nothing reliable to merge into - validate the driver from scratch
+                    rules = plan.rules
+                    driver_report = self._validate_driver(driver, quote, mvrs, dashes, no_dash_report, now=now, plan=plan)
+                elif not rules:
+                    driver_report = previous_driver
                 else:
-                    self.report["summary"]["issues_found"] += 1
-                    self.report["summary"]["critical_errors"] += len(driver_report.get("critical_errors", []))
+                    partial_plan = ValidationPlan(plan.categories, rules, [], no_dash_report)
+                    partial = self._validate_driver(driver, quote, mvrs, dashes, no_dash_report, now=now, plan=partial_plan)
+                    if self._has_error_sections(partial):
+                        driver_report = partial
+                    else:
+                        driver_report = self._merge_driver_report(previous_driver, partial, rules, plan)
+                
+                if rules:
+                    revalidated.append({
+                        "driver_name": driver_report.get("driver_name"),
+                        "driver_license": driver_report.get("driver_license"),
+                        "rules": [rule.report_key for rule in rules]
+                    })
+                
+                report["drivers"].append(driver_report)
+                self._add_to_summary(report["summary"], driver_report)
+        
+        self.report = report
+        return report, revalidated
 
-        return self.report
+    def compare_reports(self, previous_report, new_report):
+        """
+        List drivers whose overall or per-section status differs between two reports.
+        Drivers are paired by position, which is stable for the same quote.
+        """
+        changes = []
+        previous_drivers = previous_report.get("drivers", [])
+        
+        for index, new_driver in enumerate(new_report.get("drivers", [])):
+            previous_driver = previous_drivers[index] if index < len(previous_drivers) else {}
+            
+            section_changes = {}
+            for key in list(previous_driver.keys()) + list(new_driver.keys()):
+                if not key.endswith("_validation") or key in section_changes:
+                    continue
+                previous_status = previous_driver.get(key, {}).get("status")
+                new_status = new_driver.get(key, {}).get("status")
+                if previous_status != new_status:
+                    section_changes[key] = {"previous": previous_status, "new": new_status}
+            
+            previous_status = previous_driver.get("validation_status")
+            new_status = new_driver.get("validation_status")
+            if previous_status != new_status or section_changes:
+                changes.append({
+                    "driver_name": new_driver.get("driver_name"),
+                    "driver_license": new_driver.get("driver_license"),
+                    "previous_status": previous_status,
+                    "new_status": new_status,
+                    "sections": section_changes
+                })
+        
+        return changes
 
-    def generate_compact_report(self, data, no_dash_report=False):
+    def _unpack_documents(self, data):
+        """Return (quotes, mvrs, dashes) from either the "extracted" wrapper or the legacy structure"""
+        if "extracted" in data:
+            extracted = data["extracted"]
+            return extracted.get("quotes", []), extracted.get("mvrs", []), extracted.get("dashes", [])
+        return data.get("quotes", []), data.get("mvrs", []), data.get("dashes", [])
+
+    def _add_to_summary(self, summary, driver_report):
+        """Count one driver report into the report summary"""
+        summary["total_drivers"] += 1
+        
+        if driver_report["validation_status"] == "PASS":
+            summary["validated_drivers"] += 1
+        elif driver_report["validation_status"] == "WARNING":
+            # Count warnings as partial validation
+            summary["validated_drivers"] += 0.5
+            summary["warnings"] += len(driver_report.get("warnings", []))
+        else:
+            summary["issues_found"] += 1
+            summary["critical_errors"] += len(driver_report.get("critical_errors", []))
+
+    def _has_error_sections(self, driver_report):
+        """True when a driver report came from the exception path of _validate_driver"""
+        return any(
+            isinstance(value, dict) and value.get("status") == "ERROR"
+            for key, value in driver_report.items()
+            if key.endswith("_validation")
+        )
+
+    def _merge_driver_report(self, previous_driver, partial, rules, plan):
+        """
+        Replace the sections of re-run rules in a previous driver report and rebuild
+        the driver-level lists and status from the sections, in rule order
+        """
+        merged = dict(previous_driver)
+        for rule in rules:
+            if rule.report_key in partial:
+                merged[rule.report_key] = partial[rule.report_key]
+            else:
+                merged.pop(rule.report_key, None)
+        
+        merged["critical_errors"] = []
+        merged["warnings"] = []
+        merged["matches"] = []
+        for rule in plan.rules:
+            section = merged.get(rule.report_key)
+            if not section:
+                continue
+            merged["critical_errors"].extend(section.get("critical_errors", []))
+            merged["warnings"].extend(section.get("warnings", []))
+            merged["matches"].extend(section.get("matches", []))
+        
+        merged["validation_status"] = self._determine_overall_status_enhanced(merged)
+        return merged
+
+    def generate_compact_report(self, data, no_dash_report=False, categories=None, fleet=False, on_driver=None):
         """
         Generate a compact, one-page professional validation report with charts and analytics
         """
         # First get the full validation report
-        full_report = self.validate_quote(data, no_dash_report=no_dash_report)
+        full_report = self.validate_quote(data, no_dash_report=no_dash_report, categories=categories, fleet=fleet,
+                                          on_driver=on_driver)
         
         # Extract summary statistics
         summary = full_report.get("summary", {})
@@ -125,70 +433,31 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             status = driver.get("validation_status", "FAIL")
             status_counts[status] += 1
         
-        # Analyze validation categories
+        # Analyze validation categories; sections that were not requested or were skipped
+        # (noDashReport) are counted as not run rather than as failures
+        category_sections = {
+            "MVR Validation": "mvr_validation",
+            "DASH Validation": "dash_validation",
+            "License Progression": "license_progression_validation",
+            "Convictions": "convictions_validation",
+            "Driver Training": "driver_training_validation",
+            "Report Age": "report_age_validation"
+        }
         validation_categories = {
-            "MVR Validation": {"pass": 0, "warning": 0, "fail": 0},
-            "DASH Validation": {"pass": 0, "warning": 0, "fail": 0},
-            "License Progression": {"pass": 0, "warning": 0, "fail": 0},
-            "Convictions": {"pass": 0, "warning": 0, "fail": 0},
-            "Driver Training": {"pass": 0, "warning": 0, "fail": 0},
-            "Report Age": {"pass": 0, "warning": 0, "fail": 0}
+            category: {"pass": 0, "warning": 0, "fail": 0, "not_run": 0} for category in category_sections
         }
         
         for driver in drivers:
-            # MVR Validation
-            mvr_status = driver.get("mvr_validation", {}).get("status", "FAIL")
-            if mvr_status == "PASS":
-                validation_categories["MVR Validation"]["pass"] += 1
-            elif mvr_status == "WARNING":
-                validation_categories["MVR Validation"]["warning"] += 1
-            else:
-                validation_categories["MVR Validation"]["fail"] += 1
-            
-            # DASH Validation
-            dash_status = driver.get("dash_validation", {}).get("status", "FAIL")
-            if dash_status == "PASS":
-                validation_categories["DASH Validation"]["pass"] += 1
-            elif dash_status == "WARNING":
-                validation_categories["DASH Validation"]["warning"] += 1
-            else:
-                validation_categories["DASH Validation"]["fail"] += 1
-            
-            # License Progression
-            license_status = driver.get("license_progression_validation", {}).get("status", "FAIL")
-            if license_status == "PASS":
-                validation_categories["License Progression"]["pass"] += 1
-            elif license_status == "WARNING":
-                validation_categories["License Progression"]["warning"] += 1
-            else:
-                validation_categories["License Progression"]["fail"] += 1
-            
-            # Convictions
-            convictions_status = driver.get("convictions_validation", {}).get("status", "FAIL")
-            if convictions_status == "PASS":
-                validation_categories["Convictions"]["pass"] += 1
-            elif convictions_status == "WARNING":
-                validation_categories["Convictions"]["warning"] += 1
-            else:
-                validation_categories["Convictions"]["fail"] += 1
-            
-            # Driver Training
-            training_status = driver.get("driver_training_validation", {}).get("status", "FAIL")
-            if training_status == "PASS":
-                validation_categories["Driver Training"]["pass"] += 1
-            elif training_status == "WARNING":
-                validation_categories["Driver Training"]["warning"] += 1
-            else:
-                validation_categories["Driver Training"]["fail"] += 1
-            
-            # Report Age
-            report_age_status = driver.get("report_age_validation", {}).get("status", "FAIL")
-            if report_age_status == "PASS":
-                validation_categories["Report Age"]["pass"] += 1
-            elif report_age_status == "WARNING":
-                validation_categories["Report Age"]["warning"] += 1
-            else:
-                validation_categories["Report Age"]["fail"] += 1
+            for category, report_key in category_sections.items():
+                section_status = driver.get(report_key, {}).get("status", "FAIL")
+                if section_status == "PASS":
+                    validation_categories[category]["pass"] += 1
+                elif section_status == "WARNING":
+                    validation_categories[category]["warning"] += 1
+                elif section_status in ("NOT_REQUESTED", "SKIPPED"):
+                    validation_categories[category]["not_run"] += 1
+                else:
+                    validation_categories[category]["fail"] += 1
         
         # Generate compact driver summaries
         driver_summaries = []
@@ -233,7 +502,8 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                     "labels": list(validation_categories.keys()),
                     "pass_data": [validation_categories[cat]["pass"] for cat in validation_categories],
                     "warning_data": [validation_categories[cat]["warning"] for cat in validation_categories],
-                    "fail_data": [validation_categories[cat]["fail"] for cat in validation_categories]
+                    "fail_data": [validation_categories[cat]["fail"] for cat in validation_categories],
+                    "not_run_data": [validation_categories[cat]["not_run"] for cat in validation_categories]
                 },
                 "validation_bar_chart": {
                     "labels": ["Validation Rate", "Error Rate", "Warning Rate"],
@@ -325,10 +595,14 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         return recommendations
 
-    def _validate_driver(self, driver, quote, mvrs, dashes, no_dash_report=False):
+    def _validate_driver(self, driver, quote, mvrs, dashes, no_dash_report=False, now=None, plan=None, assigned=None):
         """
-        Validate a single driver against MVR and DASH data with enhanced rules
+        Validate a single driver against MVR and DASH data by running the rules in the plan
+        assigned: optional (mvr, dash) pair already chosen by fleet assignment
         """
+        if plan is None:
+            plan = self.compile_plan(None, no_dash_report)
+        
         try:
             # Validate input parameters
             if not driver:
@@ -385,69 +659,50 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                 }
             }
 
+            # Sections for categories the caller did not ask for are marked as such
+            for rule in VALIDATION_RULES:
+                if rule.category not in plan.categories:
+                    driver_report[rule.report_key] = {
+                        "status": "NOT_REQUESTED",
+                        "critical_errors": [],
+                        "warnings": [],
+                        "matches": []
+                    }
+
             # Normalize license numbers for comparison
-            quote_license_raw = driver.get("licence_number", "")
-            quote_license = quote_license_raw.replace("-", "") if quote_license_raw else ""
-            
-            # Find matching MVR and DASH records
-            matched_mvr = self._find_matching_mvr(quote_license, mvrs)
-            matched_dash = self._find_matching_dash(quote_license, dashes) if not no_dash_report else None
-            
-            # Enhanced MVR validation with new rules
-            if matched_mvr:
-                mvr_validation = self._validate_mvr_data_enhanced(driver, matched_mvr, quote)
-                driver_report["mvr_validation"] = mvr_validation
-                driver_report["critical_errors"].extend(mvr_validation["critical_errors"])
-                driver_report["warnings"].extend(mvr_validation["warnings"])
-                driver_report["matches"].extend(mvr_validation["matches"])
-                
-            # Enhanced license progression validation
-            if matched_mvr:
-                license_validation = self._validate_license_progression_enhanced(driver, matched_mvr)
-                driver_report["license_progression_validation"] = license_validation
-                driver_report["critical_errors"].extend(license_validation["critical_errors"])
-                driver_report["warnings"].extend(license_validation["warnings"])
-                driver_report["matches"].extend(license_validation["matches"])
-                
-            # Enhanced convictions validation
-            if matched_mvr:
-                convictions_validation = self._validate_convictions_enhanced(driver, matched_mvr, quote)
-                driver_report["convictions_validation"] = convictions_validation
-                driver_report["critical_errors"].extend(convictions_validation["critical_errors"])
-                driver_report["warnings"].extend(convictions_validation["warnings"])
-                driver_report["matches"].extend(convictions_validation["matches"])
+            quote_license = self._normalize_licence(driver.get("licence_number", ""))
+            
+            # Find matching MVR and DASH records, only when a planned rule reads them
+            if assigned is not None:
+                matched_mvr, matched_dash = assigned
+            else:
+                matched_mvr = self._find_matching_mvr(quote_license, mvrs) if plan.uses_mvr else None
+                matched_dash = self._find_matching_dash(quote_license, dashes) if plan.uses_dash else None
+            
+            # Parse dates, licences and names once; every rule below reads from this
+            facts = self._build_driver_facts(driver, quote, matched_mvr, matched_dash, now)
+            matched = {"mvr": matched_mvr, "dash": matched_dash}
+            
+            for rule in plan.rules:
+                # Rules whose required documents were not matched keep their NOT_FOUND section
+                if any(matched[name] is None for name in rule.requires):
+                    continue
                 
-            # Validate DASH data only if noDashReport is false
-            if not no_dash_report and matched_dash:
-                dash_validation = self._validate_dash_data(driver, matched_dash, quote)
-                driver_report["dash_validation"] = dash_validation
-                driver_report["critical_errors"].extend(dash_validation.get("critical_errors", []))
-                driver_report["warnings"].extend(dash_validation.get("warnings", []))
-                driver_report["matches"].extend(dash_validation.get("matches", []))
-            elif no_dash_report:
-                # Set DASH validation status to indicate it was skipped
-                driver_report["dash_validation"] = {
+                rule_validation = rule.run(self, driver, quote, matched_mvr, matched_dash, facts)
+                driver_report[rule.report_key] = rule_validation
+                driver_report["critical_errors"].extend(rule_validation.get("critical_errors", []))
+                driver_report["warnings"].extend(rule_validation.get("warnings", []))
+                driver_report["matches"].extend(rule_validation.get("matches", []))
+            
+            # Requested rules disabled by noDashReport are reported as skipped
+            for rule in plan.skipped_rules:
+                driver_report[rule.report_key] = {
                     "status": "SKIPPED",
                     "critical_errors": [],
                     "warnings": ["DASH validation skipped - no DASH report available"],
                     "matches": []
                 }
             
-            # Validate driver training
-            if matched_mvr:
-                driver_training_validation = self._validate_driver_training(driver, quote)
-                driver_report["driver_training_validation"] = driver_training_validation
-                driver_report["critical_errors"].extend(driver_training_validation["critical_errors"])
-                driver_report["warnings"].extend(driver_training_validation["warnings"])
-                driver_report["matches"].extend(driver_training_validation["matches"])
-            
-            # Validate report age (DASH and MVR report dates)
-            report_age_validation = self._validate_report_age(matched_dash, matched_mvr, quote)
-            driver_report["report_age_validation"] = report_age_validation
-            driver_report["critical_errors"].extend(report_age_validation["critical_errors"])
-            driver_report["warnings"].extend(report_age_validation["warnings"])
-            driver_report["matches"].extend(report_age_validation["matches"])
-            
             # Determine overall validation status
             driver_report["validation_status"] = self._determine_overall_status_enhanced(driver_report)
             
@@ -469,6 +724,93 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                 "report_age_validation": {"status": "ERROR", "critical_errors": [f"Validation error: {str(e)}"], "warnings": [], "matches": []}
             }
 
+    def _normalize_licence(self, licence_raw):
+        """Strip dashes from a licence number so Quote, MVR and DASH formats compare equal"""
+        return licence_raw.replace("-", "") if licence_raw else ""
+
+    def _build_driver_facts(self, driver, quote, mvr=None, dash=None, now=None):
+        """
+        Build the fact sheet for one driver: parsed MVR dates (with the inferred
+        issue date when the MVR has none), normalized licences, name parts,
+        the quote effective date and the reference timestamp
+        """
+        facts = DriverFacts()
+        facts.now = now or datetime.now()
+        
+        # Quote side
+        facts.quote_effective_raw = quote.get("quote_effective_date", "")
+        facts.quote_effective_date = self._parse_date(facts.quote_effective_raw, "quote")
+        facts.quote_name = driver.get("full_name", "")
+        facts.quote_name_parts = self._name_parts(facts.quote_name)
+        facts.quote_license_raw = driver.get("licence_number", "")
+        facts.quote_license = self._normalize_licence(facts.quote_license_raw)
+        facts.licence_class = driver.get("licence_class", "")
+        
+        policyholder_name = ""
+        if quote.get("drivers"):
+            policyholder_name = quote["drivers"][0].get("full_name", "")
+        facts.policyholder_name = policyholder_name
+        facts.policyholder_name_parts = self._name_parts(policyholder_name)
+        
+        # MVR side
+        mvr = mvr or {}
+        facts.mvr_license_raw = mvr.get("licence_number", "")
+        facts.mvr_license = self._normalize_licence(facts.mvr_license_raw)
+        facts.mvr_name = mvr.get("name", "")
+        facts.mvr_name_parts = self._name_parts(facts.mvr_name)
+        facts.mvr_birth_raw = mvr.get("birth_date", "")
+        facts.mvr_birth_date = self._parse_date(facts.mvr_birth_raw, "mvr")
+        facts.mvr_expiry_raw = mvr.get("expiry_date", "")
+        facts.mvr_expiry_date = self._parse_date(facts.mvr_expiry_raw, "mvr")
+        facts.mvr_release_raw = mvr.get("release_date")
+        facts.mvr_release_date = self._parse_date(facts.mvr_release_raw, "mvr")
+        
+        # If no issue date found, try to infer it from available dates
+        issue_raw = mvr.get("issue_date", "")
+        facts.mvr_issue_inferred = False
+        if not issue_raw and mvr:
+            issue_raw = self._infer_license_issue_date(mvr)
+            facts.mvr_issue_inferred = bool(issue_raw)
+        facts.mvr_issue_raw = issue_raw
+        facts.mvr_issue_date = self._parse_date(issue_raw, "mvr")
+        
+        # DASH side
+        dash = dash or {}
+        facts.dash_name = dash.get("name", "")
+        facts.dash_name_parts = self._name_parts(facts.dash_name)
+        facts.dash_license_raw = dash.get("dln", "")
+        facts.dash_report_raw = dash.get("report_date")
+        facts.dash_report_date = self._parse_date_dash_format(facts.dash_report_raw)
+        
+        return facts
+
+    def _assign_fleet_records(self, quote, mvrs, dashes, plan=None):
+        """
+        Match every quote driver to at most one MVR and one DASH record, each record used once.
+        Builds a driver x record score matrix (licence, name signature, birth date) and solves
+        the assignment, instead of taking the first licence match per driver.
+        Returns a list of (mvr, dash) pairs aligned with quote["drivers"].
+        """
+        from validator.fleet_matching import record_match_scores, assign_by_score, RECORD_MATCH_THRESHOLD
+        
+        if plan is None:
+            plan = self.compile_plan()
+        drivers = quote.get("drivers", [])
+        assigned_mvrs = [None] * len(drivers)
+        assigned_dashes = [None] * len(drivers)
+        
+        if plan.uses_mvr and drivers and mvrs:
+            scores = record_match_scores(self, drivers, mvrs, "licence_number", "birth_date", "mvr")
+            for row, (column, score) in assign_by_score(scores, RECORD_MATCH_THRESHOLD).items():
+                assigned_mvrs[row] = mvrs[column]
+        
+        if plan.uses_dash and drivers and dashes:
+            scores = record_match_scores(self, drivers, dashes, "dln", "date_of_birth", "dash")
+            for row, (column, score) in assign_by_score(scores, RECORD_MATCH_THRESHOLD).items():
+                assigned_dashes[row] = dashes[column]
+        
+        return list(zip(assigned_mvrs, assigned_dashes))
+
     def _find_matching_mvr(self, quote_license, mvrs):
         """Find matching MVR record by license number"""
         for mvr in mvrs:
@@ -516,7 +858,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         return validation
 
-    def _validate_report_age(self, matched_dash, matched_mvr, quote):
+    def _validate_report_age(self, matched_dash, matched_mvr, quote, facts=None):
         """
         Validate that DASH and MVR reports are generated within acceptable timeframes:
         - DASH report should be generated within 45 days of quote_effective_date
@@ -529,28 +871,27 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             "matches": []
         }
         
+        if facts is None:
+            facts = self._build_driver_facts({}, quote, matched_mvr, matched_dash)
+        
         # Get quote effective date
-        quote_effective_date = quote.get("quote_effective_date", "")
+        quote_effective_date = facts.quote_effective_raw
         if not quote_effective_date:
             validation["warnings"].append("Quote effective date not available for report age validation")
             return validation
         
-        # Parse quote effective date (MM/DD/YYYY format)
-        try:
-            quote_date = self._parse_date(quote_effective_date, "quote")
-            if not quote_date:
-                validation["warnings"].append(f"Could not parse quote effective date: {quote_effective_date}")
-                return validation
-        except Exception as e:
-            validation["warnings"].append(f"Error parsing quote effective date: {quote_effective_date}")
+        # Quote effective date is parsed once (MM/DD/YYYY format) in the fact sheet
+        quote_date = facts.quote_effective_date
+        if not quote_date:
+            validation["warnings"].append(f"Could not parse quote effective date: {quote_effective_date}")
             return validation
         
         # Validate DASH report age
-        if matched_dash and matched_dash.get("report_date"):
-            dash_report_date = matched_dash.get("report_date")
+        if matched_dash and facts.dash_report_raw:
+            dash_report_date = facts.dash_report_raw
             try:
-                # Parse DASH report date (YYYY-MM-DD HH:MM:SS format)
-                dash_date = self._parse_date_dash_format(dash_report_date)
+                # DASH report date (YYYY-MM-DD HH:MM:SS format)
+                dash_date = facts.dash_report_date
                 if dash_date:
                     # Calculate days difference
                     days_diff = (quote_date - dash_date).days
@@ -558,13 +899,13 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                     if days_diff < 0:
                         # DASH report is in the future relative to quote effective date
                         validation["matches"].append(f"DASH report date {dash_report_date} is after quote effective date {quote_effective_date}")
-                    elif days_diff <= 45:
+                    elif days_diff <= DASH_MAX_AGE_DAYS:
                         # DASH report is within acceptable timeframe
-                        validation["matches"].append(f"DASH report age is acceptable: {days_diff} days (≤45 days limit)")
+                        validation["matches"].append(f"DASH report age is acceptable: {days_diff} days (≤{DASH_MAX_AGE_DAYS} days limit)")
                     else:
                         # DASH report is too old
                         validation["critical_errors"].append(
-                            f"DASH report is too old: {days_diff} days since generation (>{45} days limit). "
+                            f"DASH report is too old: {days_diff} days since generation (>{DASH_MAX_AGE_DAYS} days limit). "
                             f"Report date: {dash_report_date}, Quote effective: {quote_effective_date}"
                         )
                         validation["status"] = "FAIL"
@@ -576,11 +917,11 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             validation["warnings"].append("DASH report date not available for age validation")
         
         # Validate MVR report age
-        if matched_mvr and matched_mvr.get("release_date"):
-            mvr_release_date = matched_mvr.get("release_date")
+        if matched_mvr and facts.mvr_release_raw:
+            mvr_release_date = facts.mvr_release_raw
             try:
-                # Parse MVR release date (DD/MM/YYYY format)
-                mvr_date = self._parse_date(mvr_release_date, "mvr")
+                # MVR release date (DD/MM/YYYY format)
+                mvr_date = facts.mvr_release_date
                 if mvr_date:
                     # Calculate days difference
                     days_diff = (quote_date - mvr_date).days
@@ -588,13 +929,13 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                     if days_diff < 0:
                         # MVR report is in the future relative to quote effective date
                         validation["matches"].append(f"MVR release date {mvr_release_date} is after quote effective date {quote_effective_date}")
-                    elif days_diff <= 30:
+                    elif days_diff <= MVR_MAX_AGE_DAYS:
                         # MVR report is within acceptable timeframe
-                        validation["matches"].append(f"MVR report age is acceptable: {days_diff} days (≤30 days limit)")
+                        validation["matches"].append(f"MVR report age is acceptable: {days_diff} days (≤{MVR_MAX_AGE_DAYS} days limit)")
                     else:
                         # MVR report is too old
                         validation["critical_errors"].append(
-                            f"MVR report is too old: {days_diff} days since release (>{30} days limit). "
+                            f"MVR report is too old: {days_diff} days since release (>{MVR_MAX_AGE_DAYS} days limit). "
                             f"Release date: {mvr_release_date}, Quote effective: {quote_effective_date}"
                         )
                         validation["status"] = "FAIL"
@@ -607,6 +948,20 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         return validation
 
+    def report_is_current(self, quote, mvr=None, dash=None):
+        """
+        Whether an MVR (or DASH) report has a readable date within its validity window for the
+        quote effective date, the way _validate_report_age accepts it
+        """
+        facts = self._build_driver_facts({}, quote, mvr, dash)
+        if not facts.quote_effective_date:
+            return False
+        if mvr is not None:
+            report_date, max_age_days = facts.mvr_release_date, MVR_MAX_AGE_DAYS
+        else:
+            report_date, max_age_days = facts.dash_report_date, DASH_MAX_AGE_DAYS
+        return report_date is not None and (facts.quote_effective_date - report_date).days <= max_age_days
+
     def _parse_date_dash_format(self, date_str):
         """
         Parse DASH report date which is in format: "YYYY-MM-DD HH:MM:SS EDT"
@@ -627,7 +982,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             print(f"DEBUG: Error parsing DASH date '{date_str}': {e}")
             return None
 
-    def _validate_mvr_data_enhanced(self, driver, mvr, quote):
+    def _validate_mvr_data_enhanced(self, driver, mvr, quote, facts=None):
         """
         Enhanced MVR validation with critical field comparisons
         """
@@ -638,11 +993,14 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             "matches": []
         }
         
+        if facts is None:
+            facts = self._build_driver_facts(driver, quote, mvr)
+        
         # Critical field comparisons: license_number, name, address
-        quote_license_raw = driver.get("licence_number", "")
-        quote_license = quote_license_raw.replace("-", "") if quote_license_raw else ""
-        mvr_license_raw = mvr.get("licence_number", "")
-        mvr_license = mvr_license_raw.replace("-", "") if mvr_license_raw else ""
+        quote_license_raw = facts.quote_license_raw
+        quote_license = facts.quote_license
+        mvr_license_raw = facts.mvr_license_raw
+        mvr_license = facts.mvr_license
         
         if quote_license and mvr_license:
             if quote_license == mvr_license:
@@ -652,8 +1010,8 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                 validation["status"] = "FAIL"
         
         # Name validation (fuzzy match) - More lenient matching
-        quote_name = driver.get("full_name", "")
-        mvr_name = mvr.get("name", "")
+        quote_name = facts.quote_name
+        mvr_name = facts.mvr_name
         
         # First validate name order
         is_valid_order, order_error = self._validate_name_order(quote_name, mvr_name)
@@ -661,8 +1019,9 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             validation["critical_errors"].append(f"Name order error: {order_error}")
             validation["status"] = "FAIL"
         
-        # Then check if names match (existing logic)
-        if self._similar(quote_name, mvr_name) or self._names_contain_same_parts(quote_name, mvr_name):
+        # Then check if names match (pre-split name parts first, fuzzy match second)
+        if (self._name_parts_match(facts.quote_name_parts, facts.mvr_name_parts) or
+                self._similar(quote_name, mvr_name)):
             validation["matches"].append(f"Name matches: Quote '{quote_name}' vs MVR '{mvr_name}'")
         else:
             # More lenient name matching - treat as warning instead of critical error
@@ -749,7 +1108,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         return validation
 
-    def _validate_license_progression_enhanced(self, driver, mvr):
+    def _validate_license_progression_enhanced(self, driver, mvr, facts=None):
         """
         Enhanced license progression validation with G1/G2/G date logic
         Implements the business rules:
@@ -764,22 +1123,25 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             "matches": []
         }
         
+        if facts is None:
+            facts = self._build_driver_facts(driver, {}, mvr)
+        
         # Extract dates from Quote driver
         quote_g1_date = driver.get("date_g1", "")
         quote_g2_date = driver.get("date_g2", "")
         quote_g_date = driver.get("date_g", "")
-        license_class = driver.get("licence_class", "")
+        license_class = facts.licence_class
         
-        # Extract dates from MVR
-        mvr_expiry_date = mvr.get("expiry_date", "")
-        mvr_birth_date = mvr.get("birth_date", "")
-        mvr_issue_date = mvr.get("issue_date", "")
+        # MVR dates come pre-parsed from the fact sheet (issue date may be inferred)
+        mvr_expiry_date = facts.mvr_expiry_raw
+        mvr_birth_date = facts.mvr_birth_raw
+        mvr_issue_date = facts.mvr_issue_raw
+        parsed_expiry = facts.mvr_expiry_date
+        parsed_birth = facts.mvr_birth_date
+        parsed_issue = facts.mvr_issue_date
         
-        # If no issue date found, try to infer it from available dates
-        if not mvr_issue_date:
-            mvr_issue_date = self._infer_license_issue_date(mvr)
-            if mvr_issue_date:
-                print(f"DEBUG: Using inferred issue date: {mvr_issue_date}")
+        if facts.mvr_issue_inferred:
+            print(f"DEBUG: Using inferred issue date: {mvr_issue_date}")
         
         # Debug: Print the comparison details
         print(f"DEBUG: License progression validation:")
@@ -793,15 +1155,12 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         # Additional debugging for date parsing
         if mvr_expiry_date:
-            parsed_expiry = self._parse_date(mvr_expiry_date, "mvr")
             print(f"  Parsed expiry: {parsed_expiry}")
         
         if mvr_birth_date:
-            parsed_birth = self._parse_date(mvr_birth_date, "mvr")
             print(f"  Parsed birth: {parsed_birth}")
         
         if mvr_issue_date:
-            parsed_issue = self._parse_date(mvr_issue_date, "mvr")
             print(f"  Parsed issue: {parsed_issue}")
             if parsed_issue:
                 april_1994 = datetime(1994, 4, 1)
@@ -818,7 +1177,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         april_1994 = datetime(1994, 4, 1)
         
         if mvr_issue_date:
-            issue_date_parsed = self._parse_date(mvr_issue_date, "mvr")
+            issue_date_parsed = parsed_issue
             
             if issue_date_parsed and issue_date_parsed < april_1994:
                 print(f"DEBUG: MVR issue date {mvr_issue_date} is before April 1, 1994 - applying special rules")
@@ -856,20 +1215,16 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             # Try to use the earliest available date as a potential issue date
             available_dates = []
             if mvr_expiry_date:
-                available_dates.append(("expiry", mvr_expiry_date))
+                available_dates.append(("expiry", mvr_expiry_date, parsed_expiry))
             if mvr_birth_date:
-                available_dates.append(("birth", mvr_birth_date))
+                available_dates.append(("birth", mvr_birth_date, parsed_birth))
             
             if available_dates:
-                # Parse all available dates and find the earliest
+                # Keep the dates that parsed and find the earliest
                 parsed_dates = []
-                for date_type, date_str in available_dates:
-                    try:
-                        parsed_date = self._parse_date(date_str, "mvr")
-                        if parsed_date:
-                            parsed_dates.append((parsed_date, date_str, date_type))
-                    except:
-                        continue
+                for date_type, date_str, parsed_date in available_dates:
+                    if parsed_date:
+                        parsed_dates.append((parsed_date, date_str, date_type))
                 
                 if parsed_dates:
                     # Sort by date and take the earliest
@@ -916,7 +1271,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         # Standard logic for post-April 1, 1994 licenses
         # Calculate expected G1/G2/G dates from MVR data using business rules
-        calculated_dates = self._calculate_license_dates_from_mvr(mvr_expiry_date, mvr_birth_date, mvr_issue_date)
+        calculated_dates = self._calculate_license_dates_from_parsed(parsed_expiry, parsed_birth, parsed_issue)
         
         if calculated_dates:
             calculated_g1, calculated_g2, calculated_g = calculated_dates
@@ -928,7 +1283,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             # This can happen when someone got their G license before the graduated system was fully enforced
             if quote_g_date and mvr_issue_date:
                 quote_g_parsed = self._parse_date(quote_g_date, "quote")
-                issue_parsed = self._parse_date(mvr_issue_date, "mvr")
+                issue_parsed = parsed_issue
                 
                 # Only apply special case if the issue date is before April 1, 1994
                 if quote_g_parsed and issue_parsed and issue_parsed < april_1994:
@@ -1122,15 +1477,22 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         if not expiry_date or not birth_date or not issue_date:
             return None
         
+        # Parse dates with correct source types (MVR format: DD/MM/YYYY)
+        return self._calculate_license_dates_from_parsed(
+            self._parse_date(expiry_date, "mvr"),
+            self._parse_date(birth_date, "mvr"),
+            self._parse_date(issue_date, "mvr")
+        )
+
+    def _calculate_license_dates_from_parsed(self, expiry, birth, issue):
+        """
+        Same business rules as _calculate_license_dates_from_mvr, for dates that
+        are already parsed (the driver fact sheet parses MVR dates once)
+        """
+        if not all([expiry, birth, issue]):
+            return None
+        
         try:
-            # Parse dates with correct source types (MVR format: DD/MM/YYYY)
-            expiry = self._parse_date(expiry_date, "mvr")
-            birth = self._parse_date(birth_date, "mvr")
-            issue = self._parse_date(issue_date, "mvr")
-            
-            if not all([expiry, birth, issue]):
-                return None
-            
             # Check if DD/MM of expiry_date and birth_date match
             expiry_dd_mm = (expiry.day, expiry.month)
             birth_dd_mm = (birth.day, birth.month)
@@ -1255,7 +1617,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         return validation
 
-    def _validate_dash_data(self, driver, dash, quote):
+    def _validate_dash_data(self, driver, dash, quote, facts=None):
         """
         Validate DASH data against quote data according to business rules
         """
@@ -1266,14 +1628,17 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             "matches": []
         }
         
+        if facts is None:
+            facts = self._build_driver_facts(driver, quote, dash=dash)
+        
         # Use the driver parameter that was passed in (correct driver for this validation)
-        quote_name = driver.get("full_name", "")
-        quote_license = driver.get("licence_number", "")
+        quote_name = facts.quote_name
+        quote_license = facts.quote_license_raw
         quote_dob = driver.get("birth_date", "")
         
         # Get DASH info
-        dash_name = dash.get("name", "")
-        dash_license = dash.get("dln", "")
+        dash_name = facts.dash_name
+        dash_license = facts.dash_license_raw
         dash_dob = dash.get("date_of_birth", "")
         
         # Name comparison - More lenient matching
@@ -1284,8 +1649,9 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                 validation["critical_errors"].append(f"Name order error: {order_error}")
                 validation["status"] = "FAIL"
             
-            # Then check if names match (existing logic)
-            if self._similar(quote_name, dash_name) or self._names_contain_same_parts(quote_name, dash_name):
+            # Then check if names match (pre-split name parts first, fuzzy match second)
+            if (self._name_parts_match(facts.quote_name_parts, facts.dash_name_parts) or
+                    self._similar(quote_name, dash_name)):
                 validation["matches"].append(f"Name matches: Quote '{quote_name}' vs DASH '{dash_name}'")
             else:
                 # More lenient name matching - treat as warning instead of critical error
@@ -1323,7 +1689,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         # Validate policies and claims
         policies_validation = self._validate_policies(dash, quote)
-        claims_validation = self._validate_claims(dash, quote)
+        claims_validation = self._validate_claims(dash, quote, facts)
         
         # Combine results
         validation["matches"].extend(policies_validation["matches"])
@@ -1359,16 +1725,41 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             return validation
         
         # Business rule: Find first insurance policy ever held (not just active)
-        # Sort by start_date to get the oldest policy
-        sorted_policies = sorted(policies, key=lambda x: x.get("start_date", ""))
-        first_policy = sorted_policies[0]
+        # Policies are ordered by start_date once for the first policy, gaps and coverage
+        intervals = PolicyIntervals(policies)
+        first_policy = intervals.policies[0]
         first_policy_start = first_policy.get("start_date", "")
         
         validation["matches"].append(f"Found {len(policies)} total policies in DASH")
         validation["matches"].append(f"First policy ever held: {first_policy_start} ({first_policy.get('company', 'Unknown')})")
         
+        # DASH results extracted before the run's end was recorded are re-analysed
+        coverage = dash.get("insurance_coverage")
+        if not coverage or "continuous_until" not in coverage:
+            coverage = intervals.coverage()
+        if coverage["continuous_since"]:
+            # The most recent run only counts as current coverage if it reaches the quote effective date
+            quote_date = self._parse_date(quote.get("quote_effective_date", ""), "quote")
+            run_end = datetime.strptime(coverage["continuous_until"], "%Y-%m-%d")
+            if quote_date and run_end >= quote_date:
+                validation["matches"].append(
+                    f"Continuously insured since {coverage['continuous_since']} ({coverage['continuous_days']} days)"
+                )
+            elif quote_date:
+                validation["matches"].append(
+                    f"Most recent continuous coverage ({coverage['continuous_since']} to {coverage['continuous_until']}, "
+                    f"{coverage['continuous_days']} days) ended before the quote effective date "
+                    f"{quote.get('quote_effective_date')}"
+                )
+            else:
+                validation["matches"].append(
+                    f"Continuously insured from {coverage['continuous_since']} to {coverage['continuous_until']} "
+                    f"({coverage['continuous_days']} days)"
+                )
+        
         # Business rule: Check for gaps between policy end and next policy start
-        policy_gaps = dash.get("policy_gaps", [])
+        # (computed here for DASH results extracted before gaps were recorded)
+        policy_gaps = dash["policy_gaps"] if "policy_gaps" in dash else intervals.gaps()
         if policy_gaps:
             for gap in policy_gaps:
                 gap_days = gap.get("gap_days", 0)
@@ -1400,7 +1791,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         
         return validation
 
-    def _validate_claims(self, dash, quote):
+    def _validate_claims(self, dash, quote, facts=None):
         """
         Validate claims information between DASH and quote according to business rules
         """
@@ -1410,13 +1801,14 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             "matches": []
         }
         
+        if facts is None:
+            facts = self._build_driver_facts({}, quote, dash=dash)
+        
         dash_claims = dash.get("claims", [])
         quote_claims = quote.get("claims", [])
         
         # Get policyholder name from quote
-        policyholder_name = ""
-        if quote.get("drivers"):
-            policyholder_name = quote["drivers"][0].get("full_name", "")
+        policyholder_name = facts.policyholder_name
         
         # If no claims in DASH, this is a pass condition
         if not dash_claims:
@@ -1432,7 +1824,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             first_party_driver = dash_claim.get("first_party_driver", "")
             
             # NEW BUSINESS RULE: Check if claim is less than 9 years old
-            claim_age_check = self._is_claim_less_than_9_years_old(dash_claim_date)
+            claim_age_check = self._is_claim_less_than_9_years_old(dash_claim_date, facts.now)
             if not claim_age_check["is_recent"]:
                 validation["matches"].append(
                     f"Claim {claim_number} skipped (age: {claim_age_check['age_years']:.1f} years, older than 9 years)"
@@ -1445,8 +1837,8 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             
             # Check if first_party_driver equals policyholder name (exact match)
             if first_party_driver and policyholder_name:
-                if (self._similar(first_party_driver, policyholder_name) or 
-                    self._names_contain_same_parts(first_party_driver, policyholder_name)):
+                if (self._name_parts_match(self._name_parts(first_party_driver), facts.policyholder_name_parts) or
+                        self._similar(first_party_driver, policyholder_name)):
                     driver_matches = True
             
             # If no first_party_driver info, assume it's the policyholder (common case)
@@ -1615,13 +2007,24 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         if not name1 or not name2:
             return False
         
-        # Clean and normalize names
-        name1_clean = name1.replace(",", " ").replace("  ", " ").strip()
-        name2_clean = name2.replace(",", " ").replace("  ", " ").strip()
+        return self._name_parts_match(self._name_parts(name1), self._name_parts(name2))
+
+    def _name_parts(self, name):
+        """Split a name into lowercase parts (commas treated as separators); None when the name is empty"""
+        if not name:
+            return None
         
-        # Split names into parts and normalize
-        parts1 = name1_clean.lower().split()
-        parts2 = name2_clean.lower().split()
+        # Clean and normalize names
+        name_clean = name.replace(",", " ").replace("  ", " ").strip()
+        return name_clean.lower().split()
+
+    def _name_parts_match(self, parts1, parts2):
+        """
+        Core of _names_contain_same_parts, working on parts from _name_parts
+        so callers holding a driver fact sheet do not re-split the same names
+        """
+        if parts1 is None or parts2 is None:
+            return False
         
         # Convert to sets for comparison
         set1 = set(parts1)
@@ -1849,12 +2252,13 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
             
         return None
 
-    def _is_claim_less_than_9_years_old(self, claim_date_str):
+    def _is_claim_less_than_9_years_old(self, claim_date_str, current_date=None):
         """
         Check if a claim is less than 9 years old from the current date
         
         Args:
             claim_date_str (str): Claim date string in various formats
+            current_date (datetime): Reference date, defaults to now
             
         Returns:
             dict: {
@@ -1864,12 +2268,15 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                 "current_date": datetime # Current date used for comparison
             }
         """
+        if current_date is None:
+            current_date = datetime.now()
+        
         if not claim_date_str:
             return {
                 "is_recent": False,
                 "age_years": float('inf'),
                 "claim_date": None,
-                "current_date": datetime.now()
+                "current_date": current_date
             }
         
         try:
@@ -1880,12 +2287,9 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                     "is_recent": False,
                     "age_years": float('inf'),
                     "claim_date": None,
-                    "current_date": datetime.now()
+                    "current_date": current_date
                 }
             
-            # Get current date
-            current_date = datetime.now()
-            
             # Calculate age in years
             age_delta = current_date - claim_date
             age_years = age_delta.days / 365.25  # Account for leap years
@@ -1906,7 +2310,7 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
                 "is_recent": False,
                 "age_years": float('inf'),
                 "claim_date": None,
-                "current_date": datetime.now()
+                "current_date": current_date
             }
 
     def _similar(self, a, b):
@@ -2181,10 +2585,11 @@ Comprehensive validation engine for comparing MVR, DASH, and Quote data with enh
         return "FAIL"
 
 # Legacy function for backward compatibility
-def validate_quote(data, no_dash_report=False):
+def validate_quote(data, no_dash_report=False, categories=None, fleet=False, on_driver=None):
     """
     Legacy validation function - now uses the new ValidationEngine
     """
     engine = ValidationEngine()
-    return engine.validate_quote(data, no_dash_report=no_dash_report)
+    return engine.validate_quote(data, no_dash_report=no_dash_report, categories=categories, fleet=fleet,
+                                 on_driver=on_driver)
         
\ No newline at end of file
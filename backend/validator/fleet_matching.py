@@ -0,0 +1,124 @@
+import numpy as np
+
+# Fleet-mode weights for matching a quote driver to an MVR or DASH record.
+# A licence match alone, or name signature plus birth date, reaches the threshold.
+LICENCE_WEIGHT = 50
+NAME_WEIGHT = 30
+BIRTH_DATE_WEIGHT = 20
+RECORD_MATCH_THRESHOLD = 50
+
+
+def solve_assignment(scores):
+    """
+    One-to-one assignment maximizing the total score (Hungarian algorithm, O(n^3)).
+    scores: 2-D array, rows and columns may differ in length
+    Returns a list of (row, column) pairs, one per row or column (whichever is fewer)
+    """
+    scores = np.asarray(scores, dtype=float)
+    if scores.ndim != 2 or not scores.size:
+        return []
+
+    transposed = scores.shape[0] > scores.shape[1]
+    if transposed:
+        scores = scores.T
+    rows, columns = scores.shape
+
+    # Minimize cost = best score - score; index 0 is the algorithm's virtual column
+    cost = scores.max() - scores
+    row_potential = np.zeros(rows + 1)
+    column_potential = np.zeros(columns + 1)
+    column_owner = np.zeros(columns + 1, dtype=np.int64)
+    previous_column = np.zeros(columns + 1, dtype=np.int64)
+
+    for row in range(1, rows + 1):
+        column_owner[0] = row
+        current_column = 0
+        min_slack = np.full(columns + 1, np.inf)
+        visited = np.zeros(columns + 1, dtype=bool)
+
+        while True:
+            visited[current_column] = True
+            owner = column_owner[current_column]
+            free = ~visited[1:]
+
+            slack = cost[owner - 1] - row_potential[owner] - column_potential[1:]
+            improved = free & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            previous_column[1:][improved] = current_column
+
+            candidates = np.where(free, min_slack[1:], np.inf)
+            next_column = int(np.argmin(candidates)) + 1
+            delta = candidates[next_column - 1]
+
+            visited_columns = np.flatnonzero(visited)
+            row_potential[column_owner[visited_columns]] += delta
+            column_potential[visited_columns] -= delta
+            min_slack[1:][free] -= delta
+
+            current_column = next_column
+            if column_owner[current_column] == 0:
+                break
+
+        # Flip the augmenting path
+        while current_column:
+            prior = previous_column[current_column]
+            column_owner[current_column] = column_owner[prior]
+            current_column = prior
+
+    pairs = [(int(column_owner[column]) - 1, column - 1) for column in range(1, columns + 1) if column_owner[column]]
+    if transposed:
+        pairs = [(column, row) for row, column in pairs]
+    return sorted(pairs)
+
+
+def assign_by_score(scores, threshold):
+    """
+    Solve the assignment over pairs scoring at least threshold and drop the rest.
+    Cells below threshold are zeroed first so the solver never trades a qualifying
+    pair for several non-qualifying ones with a larger total.
+    Returns {row: (column, score)}
+    """
+    scores = np.asarray(scores, dtype=float)
+    qualifying = np.where(scores >= threshold, scores, 0.0)
+    assigned = {}
+    for row, column in solve_assignment(qualifying):
+        score = scores[row, column]
+        if score >= threshold:
+            assigned[row] = (column, float(score))
+    return assigned
+
+
+def equal_outer(left, right):
+    """Pairwise equality of two lists of keys; empty keys never match"""
+    left = np.array(left, dtype=object)
+    right = np.array(right, dtype=object)
+    equal = np.equal.outer(left, right).astype(bool)
+    present = np.outer(left != "", right != "")
+    return equal & present
+
+
+def record_match_scores(engine, drivers, records, licence_field, birth_field, birth_source):
+    """
+    Pairwise score matrix between quote drivers (rows) and MVR or DASH records (columns)
+    from licence number, name signature and birth date. Each key is normalized once per record.
+    """
+    def signature(name):
+        parts = engine._name_parts(name)
+        return " ".join(sorted(set(parts))) if parts else ""
+
+    def birth_key(value, source_type):
+        return (engine._normalize_date(value, source_type) or "") if value else ""
+
+    driver_licences = [engine._normalize_licence(driver.get("licence_number", "")) for driver in drivers]
+    driver_names = [signature(driver.get("full_name", "")) for driver in drivers]
+    driver_births = [birth_key(driver.get("birth_date", ""), "quote") for driver in drivers]
+
+    record_licences = [engine._normalize_licence(record.get(licence_field, "")) for record in records]
+    record_names = [signature(record.get("name", "")) for record in records]
+    record_births = [birth_key(record.get(birth_field, ""), birth_source) for record in records]
+
+    return (
+        LICENCE_WEIGHT * equal_outer(driver_licences, record_licences) +
+        NAME_WEIGHT * equal_outer(driver_names, record_names) +
+        BIRTH_DATE_WEIGHT * equal_outer(driver_births, record_births)
+    )
@@ -0,0 +1,139 @@
+import re
+import numpy as np
+
+NAT = np.datetime64("NaT", "D")
+ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+
+# Terms more than a day apart leave a gap in coverage (the DASH policy gap rule)
+MAX_CONTINUOUS_GAP_DAYS = 1
+
+
+def parse_iso_dates(values):
+    """DASH "YYYY-MM-DD" strings to a datetime64[D] array; missing or invalid dates become NaT"""
+    values = [_zero_padded(value) for value in values]
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except ValueError:
+        # An impossible date such as 2020-02-30 fails the whole array, so fall back to one at a time
+        dates = np.full(len(values), NAT)
+        for index, value in enumerate(values):
+            try:
+                dates[index] = np.datetime64(value, "D")
+            except ValueError:
+                pass
+        return dates
+
+
+def _zero_padded(value):
+    """Zero-pad a date such as 2020-1-5 the way strptime("%Y-%m-%d") reads it; anything else becomes "" (NaT)"""
+    match = ISO_DATE.fullmatch(value) if isinstance(value, str) else None
+    if not match:
+        return ""
+    year, month, day = match.groups()
+    return f"{year}-{month:0>2}-{day:0>2}"
+
+
+class PolicyIntervals:
+    """
+    Start and end dates of a DASH policy history, parsed once into datetime64 arrays
+    ordered by start date. Gaps and overlaps compare each term with the next one;
+    coverage() merges all terms into continuous runs of insurance.
+    """
+
+    def __init__(self, policies):
+        self.policies = sorted(policies, key=lambda policy: policy.get("start_date") or "")
+        self.starts = parse_iso_dates([policy.get("start_date") for policy in self.policies])
+        self.ends = parse_iso_dates([policy.get("end_date") for policy in self.policies])
+
+    def gaps(self):
+        """Gaps of more than a day between a term's end and the next term's start"""
+        days = self._next_start_minus_end()
+        gaps = []
+        for index in np.flatnonzero(days > MAX_CONTINUOUS_GAP_DAYS):
+            current_policy, next_policy = self.policies[index], self.policies[index + 1]
+            gaps.append({
+                "gap_days": int(days[index]),
+                "previous_policy_end": current_policy.get("end_date"),
+                "next_policy_start": next_policy.get("start_date"),
+                "previous_policy_company": current_policy.get("company"),
+                "next_policy_company": next_policy.get("company"),
+                "cancellation_reason": current_policy.get("cancellation_reason")
+            })
+        return gaps
+
+    def overlaps(self):
+        """Terms that start before the previous term has ended"""
+        days = self._next_start_minus_end()
+        overlaps = []
+        for index in np.flatnonzero(days < 0):
+            current_policy, next_policy = self.policies[index], self.policies[index + 1]
+            overlaps.append({
+                "overlap_days": int(-days[index]),
+                "previous_policy_end": current_policy.get("end_date"),
+                "next_policy_start": next_policy.get("start_date"),
+                "previous_policy_company": current_policy.get("company"),
+                "next_policy_company": next_policy.get("company")
+            })
+        return overlaps
+
+    def coverage(self):
+        """
+        Merge the terms into continuous runs of insurance.
+        Returns the first start date, total insured days, the start, end and length of the
+        most recent continuous run, and the lapse before it (None if there was none)
+        """
+        coverage = {
+            "first_policy_start": None,
+            "insured_days": 0,
+            "continuous_since": None,
+            "continuous_until": None,
+            "continuous_days": 0,
+            "most_recent_lapse": None
+        }
+        valid = ~np.isnat(self.starts) & ~np.isnat(self.ends) & (self.ends >= self.starts)
+        if not valid.any():
+            return coverage
+
+        starts = self.starts[valid].astype(np.int64)
+        ends = self.ends[valid].astype(np.int64)
+
+        # A new run starts when a term begins after every earlier term has ended (plus the allowed day)
+        latest_end = np.maximum.accumulate(ends)
+        run_starts = np.flatnonzero(np.r_[True, starts[1:] - latest_end[:-1] > MAX_CONTINUOUS_GAP_DAYS])
+        run_begin = starts[run_starts]
+        run_end = np.maximum.reduceat(ends, run_starts)
+
+        coverage["first_policy_start"] = self._iso(run_begin[0])
+        coverage["insured_days"] = int((run_end - run_begin).sum())
+        coverage["continuous_since"] = self._iso(run_begin[-1])
+        coverage["continuous_until"] = self._iso(run_end[-1])
+        coverage["continuous_days"] = int(run_end[-1] - run_begin[-1])
+        if len(run_starts) > 1:
+            coverage["most_recent_lapse"] = {
+                "lapse_days": int(run_begin[-1] - run_end[-2]),
+                "coverage_ended": self._iso(run_end[-2]),
+                "coverage_resumed": self._iso(run_begin[-1])
+            }
+        return coverage
+
+    def _next_start_minus_end(self):
+        """Days from each term's end to the next term's start; NaN where either date is missing"""
+        if len(self.policies) < 2:
+            return np.empty(0)
+        days = (self.starts[1:] - self.ends[:-1]).astype(float)
+        days[np.isnat(self.starts[1:]) | np.isnat(self.ends[:-1])] = np.nan
+        return days
+
+    @staticmethod
+    def _iso(days):
+        return str(np.datetime64(int(days), "D"))
+
+
+def analyze_policy_history(policies):
+    """Gaps, overlaps and continuous coverage of a DASH policy list"""
+    intervals = PolicyIntervals(policies)
+    return {
+        "policy_gaps": intervals.gaps(),
+        "policy_overlaps": intervals.overlaps(),
+        "insurance_coverage": intervals.coverage()
+    }
@@ -20,6 +20,7 @@ import ValidationReport from './components/ValidationReport';
 import CompactValidationReport from './components/CompactValidationReport';
 import ApplicationQC from './components/ApplicationQC';
 import { API_ENDPOINTS } from './config';
+import useValidationProgress from './hooks/useValidationProgress';
 import './styles/salesforce-design-system.css';
 
 function App() {
@@ -27,9 +28,11 @@ function App() {
   const [compactValidationData, setCompactValidationData] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
   const [activeTab, setActiveTab] = useState('dashboard');
+  const progress = useValidationProgress();
 
   const handleFileUpload = async (formData) => {
     setIsLoading(true);
+    formData.set('progressId', progress.start());
     try {
       const response = await fetch(API_ENDPOINTS.validate, {
         method: 'POST',
@@ -48,12 +51,14 @@ function App() {
       console.error('Error uploading files:', error);
       alert('Error uploading files. Please try again.');
     } finally {
+      progress.stop();
       setIsLoading(false);
     }
   };
 
   const handleCompactValidation = async (formData) => {
     setIsLoading(true);
+    formData.set('progressId', progress.start());
     try {
       const response = await fetch(API_ENDPOINTS.validateCompact, {
         method: 'POST',
@@ -76,6 +81,7 @@ function App() {
       console.error('Error uploading files for compact validation:', error);
       alert('Error uploading files for compact validation. Please try again.');
     } finally {
+      progress.stop();
       setIsLoading(false);
     }
   };
@@ -130,6 +136,7 @@ function App() {
                   onFileUpload={handleFileUpload}
                   onCompactValidation={handleCompactValidation}
                   isLoading={isLoading}
+                  progressMessage={isLoading ? progress.message : null}
                 />
               </div>
             </div>
@@ -1,11 +1,13 @@
 import React, { useState } from 'react';
 import { Upload, FileText, Download, CheckCircle, AlertCircle, Loader, X, ExternalLink, AlertTriangle, ChevronDown, ChevronUp, Code } from 'lucide-react';
 import { API_ENDPOINTS } from '../config';
+import useValidationProgress from '../hooks/useValidationProgress';
 import jsPDF from 'jspdf';
 import 'jspdf-autotable';
 
 function ApplicationQC() {
   const [applicationFile, setApplicationFile] = useState(null);
+  const progress = useValidationProgress();
   const [quoteFile, setQuoteFile] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
   const [result, setResult] = useState(null);
@@ -76,6 +78,7 @@ function ApplicationQC() {
       if (quoteFile) {
         formData.append('quote', quoteFile);
       }
+      formData.append('progressId', progress.start());
 
       const response = await fetch(API_ENDPOINTS.applicationQC, {
         method: 'POST',
@@ -108,6 +111,7 @@ function ApplicationQC() {
       console.error('Error processing application QC:', error);
       setError(`Error processing files: ${error.message}`);
     } finally {
+      progress.stop();
       setIsLoading(false);
     }
   };
@@ -1005,7 +1009,7 @@ function ApplicationQC() {
               {isLoading ? (
                 <div className="flex items-center justify-center">
                   <Loader className="w-5 h-5 mr-2 animate-spin" />
-              Running QC Analysis...
+              {progress.message || 'Running QC Analysis...'}
             </div>
           ) : (
             'Run Application QC'
@@ -274,6 +274,12 @@ const CompactValidationReport = ({ reportData }) => {
                   <span className="text-red-600">Fail:</span>
                   <span className="font-semibold">{results.fail}</span>
                 </div>
+                {results.not_run > 0 && (
+                  <div className="flex justify-between">
+                    <span className="text-gray-500">Not run:</span>
+                    <span className="font-semibold">{results.not_run}</span>
+                  </div>
+                )}
               </div>
             </div>
           ))}
@@ -11,7 +11,7 @@ import {
   Info
 } from 'lucide-react';
 
-function FileUpload({ onFileUpload, onCompactValidation, isLoading }) {
+function FileUpload({ onFileUpload, onCompactValidation, isLoading, progressMessage }) {
   const [files, setFiles] = useState({ quote: null, mvr: [], dash: [] });
   const [errors, setErrors] = useState({ quote: '', mvr: '', dash: '' });
   const [dragActive, setDragActive] = useState(false);
@@ -393,7 +393,7 @@ function FileUpload({ onFileUpload, onCompactValidation, isLoading }) {
               {isLoading ? (
                 <>
                   <Loader2 className="w-5 h-5 animate-spin" />
-                  <span>Processing...</span>
+                  <span>{progressMessage || 'Processing...'}</span>
                 </>
               ) : (
                 <>
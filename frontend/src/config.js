@@ -8,6 +8,7 @@ export const API_ENDPOINTS = {
   validateCompact: `${API_BASE_URL}/validate-compact`,
   applicationQC: `${API_BASE_URL}/application-qc`,
   health: `${API_BASE_URL}/health`,
+  progress: (progressId) => `${API_BASE_URL}/progress/${progressId}`,
 };
 
 export default API_BASE_URL; 
\ No newline at end of file
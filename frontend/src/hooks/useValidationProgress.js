@@ -0,0 +1,102 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { API_ENDPOINTS } from '../config';
+
+const DOCUMENT_LABELS = {
+  quote: 'Quote',
+  mvr: 'MVR',
+  dash: 'DASH',
+  application: 'Application',
+};
+
+const newProgressId = () => {
+  if (window.crypto && window.crypto.randomUUID) {
+    return window.crypto.randomUUID();
+  }
+  return `${Date.now().toString(16)}-${Math.random().toString(16).slice(2, 14)}`;
+};
+
+// One line of text for a progress event, for showing while the request runs
+export const describeProgressEvent = (event) => {
+  const documentLabel = DOCUMENT_LABELS[event.doc_type] || event.doc_type;
+  switch (event.stage) {
+    case 'uploaded':
+      return `Uploaded ${event.document}`;
+    case 'classified':
+      return `${event.document} is ${documentLabel === 'MVR' ? 'an' : 'a'} ${documentLabel}`;
+    case 'extracted':
+      if (!event.ok) {
+        return `Could not read ${event.document}`;
+      }
+      return event.doc_type === 'quote'
+        ? `Read ${event.document} (${event.drivers} driver${event.drivers === 1 ? '' : 's'})`
+        : `Read ${event.document}`;
+    case 'validated':
+      return `Validated ${event.driver}: ${event.status}`;
+    case 'gemini_sent':
+      return `Sent ${event.pages} pages to Gemini`;
+    case 'gemini_received':
+      return 'Gemini analysis received';
+    case 'done':
+      return 'Done';
+    case 'error':
+      return event.error || 'Failed';
+    default:
+      return event.stage;
+  }
+};
+
+// Progress of a validation or Application QC request, streamed by the backend as Server-Sent Events.
+// Call start() right before posting and send the ID it returns as the progressId form field.
+// Events arrive while the request runs: uploaded, classified, extracted, validated (one per
+// driver, with its report), gemini_sent, gemini_received, then done or error.
+function useValidationProgress() {
+  const [events, setEvents] = useState([]);
+  const [drivers, setDrivers] = useState([]);
+  const sourceRef = useRef(null);
+
+  const stop = useCallback(() => {
+    if (sourceRef.current) {
+      sourceRef.current.close();
+      sourceRef.current = null;
+    }
+  }, []);
+
+  const start = useCallback(() => {
+    stop();
+    setEvents([]);
+    setDrivers([]);
+
+    const progressId = newProgressId();
+    const source = new EventSource(API_ENDPOINTS.progress(progressId));
+    source.onmessage = (message) => {
+      const event = JSON.parse(message.data);
+      setEvents((previous) => [...previous, event]);
+      if (event.stage === 'validated' && event.driver_report) {
+        setDrivers((previous) => [...previous, event.driver_report]);
+      }
+      if (event.stage === 'done' || event.stage === 'error') {
+        source.close();
+        if (sourceRef.current === source) {
+          sourceRef.current = null;
+        }
+      }
+    };
+    sourceRef.current = source;
+    return progressId;
+  }, [stop]);
+
+  // Close the stream when the component goes away
+  useEffect(() => stop, [stop]);
+
+  const latest = events.length > 0 ? events[events.length - 1] : null;
+  return {
+    events,
+    drivers,
+    latest,
+    message: latest ? describeProgressEvent(latest) : null,
+    start,
+    stop,
+  };
+}
+
+export default useValidationProgress;